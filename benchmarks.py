@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmarks
+Timing checks for the curriculum pipeline's hot paths. Each benchmark prints
+its measurements and exits non-zero if its check fails.
+
+    python benchmarks.py competencies
+    python benchmarks.py imports
+    python benchmarks.py store
+    python benchmarks.py gradebook
+    python benchmarks.py codec
+    python benchmarks.py search
+    python benchmarks.py bundle
+    python benchmarks.py roster
+    python benchmarks.py outline
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+def _best_time(func, *args, repeat: int = 3) -> float:
+    """Best wall time of several runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def make_competency_document(competency_count: int) -> str:
+    """Synthetic program text with competency IDs, names, objectives and filler"""
+    lines = []
+    for n in range(competency_count):
+        lines.extend([
+            f"HCE-{n // 100 + 1}-{n % 100 + 1}",
+            f"Characterizes a period in the history of Quebec and Canada ({n})",
+            "",
+            "Learning objectives",
+            f"1. Establishes the chronology of the period under study {n}",
+            f"2. Considers geographic aspects of the territory occupied {n}",
+            f"- Identifies the main actors and their roles in society {n}",
+            "Key features of the competency are presented on the next page",
+            "QUEBEC EDUCATION PROGRAM",
+        ])
+    return '\n'.join(lines)
+
+def bench_competencies() -> bool:
+    """extract_competencies cost per competency ID must stay flat as documents grow"""
+    from extract_pfeq_data import extract_competencies
+
+    sizes = [500, 1000, 2000, 4000, 8000]
+    per_id = []
+    print(f"{'IDs':>8} {'lines':>8} {'time (ms)':>10} {'us / ID':>8}")
+    for size in sizes:
+        text = make_competency_document(size)
+        elapsed = _best_time(extract_competencies, text)
+        found = len(extract_competencies(text))
+        if found != size:
+            print(f"Expected {size} competencies, found {found}")
+            return False
+        per_id.append(elapsed / size)
+        print(f"{size:>8} {text.count(chr(10)) + 1:>8} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>8.2f}")
+
+    # Linear means the per-ID cost at 16x the input is about the same as at 1x
+    growth = per_id[-1] / per_id[0]
+    print(f"Per-ID cost growth from {sizes[0]} to {sizes[-1]} IDs: {growth:.2f}x (linear ~ 1x)")
+    return growth < 2.0
+
+# Entry points that must not pay for the PDF/web stack just to start
+IMPORT_ENTRY_POINTS = ['generate_curriculum_js', 'extract_pfeq_data', 'extraction_watchdog',
+                       'pdf_outline', 'text_corpus', 'scrape_quebec_education']
+HEAVY_MODULES = ['pdfplumber', 'pypdf', 'requests', 'bs4']
+IMPORT_BUDGET_SHARE = 0.25      # entry point import time as a share of importing the heavy modules
+
+def _import_times(statement: str) -> dict:
+    """Cumulative import time in microseconds of every module imported by statement (python -X importtime)"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(Path(__file__).parent), env.get('PYTHONPATH')]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, env=env, cwd=Path(__file__).parent)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def _best_import_times(statement: str, repeat: int = 3) -> dict:
+    """Best of several _import_times runs, per module"""
+    runs = [_import_times(statement) for _ in range(repeat)]
+    return {name: min(run[name] for run in runs if name in run) for name in runs[0]}
+
+def bench_imports() -> bool:
+    """Generator and query entry points must start without importing pdfplumber, pypdf, requests or bs4"""
+    installed = []
+    for module in HEAVY_MODULES:
+        try:
+            _import_times(f"import {module}")
+            installed.append(module)
+        except RuntimeError:
+            pass
+    heavy = _best_import_times(f"import {', '.join(installed)}") if installed else {}
+    heavy_total = sum(heavy.get(module, 0) for module in installed)
+    if installed:
+        print(f"Importing {', '.join(installed)}: {heavy_total / 1000:.1f} ms")
+    else:
+        print("None of the heavy modules are installed; checking only that they are not imported")
+
+    ok = True
+    print(f"{'entry point':<26} {'import (ms)':>11} {'share':>7}  heavy modules pulled in")
+    for entry in IMPORT_ENTRY_POINTS:
+        times = _best_import_times(f"import {entry}")
+        pulled = [module for module in HEAVY_MODULES if module in times]
+        share = times[entry] / heavy_total if heavy_total else 0.0
+        print(f"{entry:<26} {times[entry] / 1000:>11.1f} {share:>7.0%}  {', '.join(pulled) or '-'}")
+        if pulled or (heavy_total and share > IMPORT_BUDGET_SHARE):
+            ok = False
+    return ok
+
+def bench_store() -> bool:
+    """Saving one student or grade sheet must not slow down as the roster and gradebook grow"""
+    import json
+    import tempfile
+    from builder_store import BuilderStore
+
+    sizes = [1000, 4000, 16000]
+    per_save = []
+    print(f"{'students':>9} {'save (ms)':>10} {'lookup (ms)':>12} {'whole JSON (ms)':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            with BuilderStore(Path(tmp) / f'state-{size}.sqlite3') as store:
+                students = [{'id': str(n), 'name': f'Student {n}', 'classSections': [f'Group {n % 40}']}
+                            for n in range(size)]
+                store.replace_collection('students', students)
+                store.replace_collection('grades', {str(n): {f'{s}_0': '2' for s in range(30)}
+                                                    for n in range(size // 10)})
+
+                def save_one():
+                    for n in range(50):
+                        store.put_item('students', str(n * 7), students[n * 7])
+                        store.put_item('grades', str(n), {f'{s}_0': '3' for s in range(30)})
+
+                elapsed = _best_time(save_one) / 100
+                lookup = _best_time(store.find, 'students', 'classSections', 'Group 7')
+                # What localStorage costs per save: re-serializing the whole collection
+                whole = _best_time(lambda: json.dumps(students))
+                per_save.append(elapsed)
+                print(f"{size:>9} {elapsed * 1000:>10.3f} {lookup * 1000:>12.2f} {whole * 1000:>16.2f}")
+
+    growth = per_save[-1] / per_save[0]
+    print(f"Per-save cost growth from {sizes[0]} to {sizes[-1]} students: {growth:.2f}x (flat ~ 1x)")
+    return growth < 2.0
+
+def make_gradebook(student_count: int, criteria: int = 4, levels: int = 4) -> dict:
+    """Synthetic school: 30-student sections, 20 assignments per section, every criterion graded"""
+    import random
+    rng = random.Random(student_count)
+    sections = max(student_count // 30, 1)
+    rubrics = [{'id': f'r{n}', 'title': f'Rubric {n}', 'numLevels': levels,
+                'levelNames': [f'Level {i + 1}' for i in range(levels)],
+                'criteria': [{'name': f'Criterion {c}'} for c in range(criteria)]} for n in range(10)]
+    students = [{'id': f's{n}', 'name': f'Student {n}', 'classSections': [f'Group {n % sections}']}
+                for n in range(student_count)]
+    assignments, grades = [], {}
+    for section in range(sections):
+        members = [s['id'] for s in students[section::sections]]
+        for n in range(20):
+            assignment_id = f'a{section}-{n}'
+            assignments.append({'id': assignment_id, 'rubricId': f'r{n % 10}', 'rubricTitle': f'Rubric {n % 10}',
+                                'dueDate': f'2025-{9 + n // 8:02d}-{1 + n % 8 * 3:02d}',
+                                'classPeriod': f'Group {section}', 'weight': 5 + n % 3 * 5})
+            grades[assignment_id] = {f'{sid}_{c}': str(rng.randrange(levels))
+                                     for sid in members for c in range(criteria)}
+    return {'students': students, 'assignments': assignments, 'grades': grades, 'savedRubrics': rubrics}
+
+def reference_student_averages(data: dict) -> dict:
+    """Per-student weighted averages computed the way the calendar's grade sheet does, one grade at a time"""
+    rubrics = {r['id']: r for r in data['savedRubrics']}
+    totals = {}
+    for assignment in data['assignments']:
+        rubric = rubrics[assignment['rubricId']]
+        sheet = data['grades'].get(assignment['id'], {})
+        for student in data['students']:
+            scores = [(int(sheet[f"{student['id']}_{c}"]) + 1) / rubric['numLevels'] * 100
+                      for c in range(len(rubric['criteria'])) if f"{student['id']}_{c}" in sheet]
+            if scores:
+                total = totals.setdefault(student['id'], [0.0, 0.0])
+                total[0] += assignment['weight'] * sum(scores) / len(scores)
+                total[1] += assignment['weight']
+    return {sid: score / weight for sid, (score, weight) in totals.items()}
+
+def bench_gradebook() -> bool:
+    """Gradebook aggregates must match the per-grade reference and cost the same per grade at school scale"""
+    from gradebook_analytics import Gradebook
+
+    data = make_gradebook(300)
+    gradebook = Gradebook.from_state(data)
+    averages, _ = gradebook.student_averages(gradebook.grade_mask())
+    expected = reference_student_averages(data)
+    if any(abs(averages[i] - expected[sid]) > 1e-9 for i, sid in enumerate(gradebook.student_ids)):
+        print("Student averages differ from the per-grade reference")
+        return False
+
+    sizes = [500, 2000, 8000]
+    per_grade = []
+    print(f"{'students':>9} {'grades':>10} {'load (ms)':>10} {'report (ms)':>12} {'us / grade':>11}")
+    for size in sizes:
+        data = make_gradebook(size)
+        load = _best_time(Gradebook.from_state, data, repeat=1)
+        gradebook = Gradebook.from_state(data)
+        report = _best_time(gradebook.report)
+        grades = len(gradebook.score)
+        per_grade.append((load + report) / grades)
+        print(f"{size:>9} {grades:>10,} {load * 1000:>10.1f} {report * 1000:>12.1f} "
+              f"{(load + report) / grades * 1e6:>11.2f}")
+
+    growth = per_grade[-1] / per_grade[0]
+    print(f"Per-grade cost growth from {sizes[0]} to {sizes[-1]} students: {growth:.2f}x (linear ~ 1x)")
+    return growth < 2.0
+
+def make_rubric_library(rubric_count: int) -> list:
+    """Saved rubrics as teachers build them: a few templates copied per section, curriculum criteria"""
+    import random
+    from curriculum_data import CURRICULUM_DATA
+
+    rng = random.Random(rubric_count)
+    competencies = [(subject, grade, comp['name'])
+                    for subject, grades in CURRICULUM_DATA.items()
+                    for grade, data in grades.items() for comp in data.get('competencies', [])]
+    level_sets = [['Beginning', 'Developing', 'Proficient', 'Extending'],
+                  ['Insufficient', 'Partial', 'Satisfactory', 'Excellent'],
+                  ['Débutant', 'En développement', 'Compétent', 'Avancé', 'Expert']]
+    qualifiers = ['Rarely', 'With support', 'Usually', 'Consistently and independently', 'Insightfully']
+    rubrics = []
+    for n in range(rubric_count):
+        levels = level_sets[n % len(level_sets)] if rng.random() < 0.9 else level_sets[0][:3]
+        chosen = rng.sample(competencies, 3)
+        criteria = [{
+            'name': name,
+            'descriptors': [f'{qualifiers[i]} {name[0].lower() + name[1:]}' + ('.' if rng.random() < 0.9 else
+                            f' ({rng.randrange(1000)}).') for i in range(len(levels))],
+            'topics': []
+        } for _, _, name in chosen]
+        rubrics.append({
+            'id': str(1730000000000 + n * 7919),
+            'title': f'Unit {n % 12 + 1} project - {chosen[0][0]}',
+            'taskDescription': f'Students complete the unit {n % 12 + 1} task for section {600 + n % 8}.',
+            'numLevels': len(levels),
+            'levelNames': levels,
+            'criteria': criteria,
+            'curriculum': {'subject': chosen[0][0], 'grade': chosen[0][1], 'topic': None},
+            'dateCreated': f'2025-{9 + n % 4:02d}-{1 + n % 28:02d}T14:{n % 60:02d}:00.000Z',
+            'dateModified': f'2025-{9 + n % 4:02d}-{1 + n % 28:02d}T15:{n % 60:02d}:00.000Z'
+        })
+    return rubrics
+
+CODEC_NODE_BENCH = """
+const fs = require('fs');
+eval(fs.readFileSync(process.argv[1], 'utf8'));
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+const best = fn => { let t = Infinity; for (let i = 0; i < 7; i++) { const s = process.hrtime.bigint(); fn();
+    t = Math.min(t, Number(process.hrtime.bigint() - s) / 1e6); } return t; };
+const decoded = parseRubricLibrary(input.encoded);
+console.log(JSON.stringify({
+    plain: best(() => JSON.parse(input.plain)),
+    encoded: best(() => parseRubricLibrary(input.encoded)),
+    roundTrip: JSON.stringify(decoded) === input.plain,
+    sameEncoding: stringifyRubricLibrary(JSON.parse(input.plain)) === input.encoded
+}));
+"""
+
+def bench_codec() -> bool:
+    """The encoded rubric library must be at most half the size and parse faster in the pages"""
+    import json
+    import shutil
+    from rubric_codec import encode_library, decode_library, add_rubrics, compact, library_stats
+
+    ok = True
+    print(f"{'rubrics':>8} {'JSON (KB)':>10} {'encoded (KB)':>13} {'ratio':>6} "
+          f"{'py loads (ms)':>14} {'py decode (ms)':>15} {'js parse (ms)':>14} {'js decode (ms)':>15}")
+    node = shutil.which('node')
+    sizes = [100, 500, 2000]
+    for size in sizes:
+        rubrics = make_rubric_library(size)
+        plain = json.dumps(rubrics, ensure_ascii=False, separators=(',', ':'))
+        encoded = json.dumps(encode_library(rubrics), ensure_ascii=False, separators=(',', ':'))
+        if decode_library(json.loads(encoded)) != rubrics:
+            print("Decoded library differs from the original")
+            return False
+        py_plain = _best_time(json.loads, plain)
+        py_encoded = _best_time(lambda: decode_library(json.loads(encoded)))
+        js = {}
+        if node:
+            result = subprocess.run([node, '-e', CODEC_NODE_BENCH, str(Path(__file__).parent / 'rubric_codec.js')],
+                                    input=json.dumps({'plain': plain, 'encoded': encoded}),
+                                    capture_output=True, text=True)
+            js = json.loads(result.stdout)
+            if not js['roundTrip'] or not js['sameEncoding']:
+                print("rubric_codec.js disagrees with rubric_codec.py")
+                return False
+            # Sub-millisecond at small sizes; judged on the largest library
+            if size == sizes[-1]:
+                ok = ok and js['encoded'] < js['plain']
+        ratio = len(encoded.encode('utf-8')) / len(plain.encode('utf-8'))
+        ok = ok and ratio <= 0.5
+        print(f"{size:>8} {len(plain.encode('utf-8')) / 1024:>10.1f} {len(encoded.encode('utf-8')) / 1024:>13.1f} "
+              f"{ratio:>6.0%} {py_plain * 1000:>14.2f} {py_encoded * 1000:>15.2f} "
+              f"{js.get('plain', float('nan')):>14.2f} {js.get('encoded', float('nan')):>15.2f}")
+    if not node:
+        print("node is not installed; page-side parse times were not measured")
+
+    # Incremental appends leave stale entries behind; compaction must remove them
+    library = encode_library(rubrics[:1000])
+    library['items'] = library['items'][:500]
+    library = add_rubrics(library, rubrics[1000:1100])
+    stale = library_stats(library)
+    compacted = compact(library)
+    print(f"Compaction: {stale['values']:,} -> {len(compacted['values']):,} values "
+          f"({stale['unused values']:,} unused dropped)")
+    ok = ok and library_stats(compacted)['unused values'] == 0 and \
+        decode_library(compacted) == rubrics[:500] + rubrics[1000:1100]
+    return ok
+
+SEARCH_WORDS = ('écrire lire comprendre résoudre problème situation mathématique géométrie fraction nombre '
+                'énergie cœur cellule photosynthèse écosystème territoire société citoyenneté histoire '
+                'argumenter communiquer oral texte science technologie matière vivant univers terre espace').split()
+
+def make_search_curriculum(subject_count: int, grade_count: int = 13) -> dict:
+    """Synthetic subject -> grade tree from preschool to Secondary 5 with accented French phrases"""
+    import random
+    rng = random.Random(subject_count)
+
+    def phrase(length: int) -> str:
+        return ' '.join(rng.choice(SEARCH_WORDS) for _ in range(length)).capitalize()
+
+    return {f"Subject {s}": {f"Grade {g:02d}": {
+        'competencies': [{'id': f'C{c + 1}', 'name': phrase(4), 'learningObjectives': [phrase(7) for _ in range(8)]}
+                         for c in range(3)],
+        'topics': [{'name': phrase(2), 'learningObjectives': [phrase(8) for _ in range(10)]} for _ in range(12)]
+    } for g in range(grade_count)} for s in range(subject_count)}
+
+def bench_search() -> bool:
+    """Index lookups must return the same ranked results as a full scan, in milliseconds at full scale"""
+    import json
+    from curriculum_bundle import build_bundle
+    from curriculum_search import CurriculumSearch, KINDS, bundle_search_index, fold, search_words
+
+    queries = ['ecri', 'Écrire texte', 'cœur', 'pho', 'géo frac', 'situation probleme mathem', 'zzz']
+    ok = True
+    print(f"{'subjects':>9} {'entries':>8} {'index (KB)':>11} {'scan (ms)':>10} {'lookup (ms)':>12}")
+    for subject_count in (2, 12):
+        curriculum = make_search_curriculum(subject_count)
+        bundle = build_bundle(curriculum)
+        index = bundle_search_index(bundle)
+        search = CurriculumSearch(bundle, index)
+        texts = []
+        for subject, grades in sorted(curriculum.items()):
+            for grade, data in sorted(grades.items()):
+                for topic in data['topics']:
+                    texts.append((0, subject, grade, topic['name']))
+                    texts.extend((2, subject, grade, obj) for obj in dict.fromkeys(topic['learningObjectives']))
+                for comp in data['competencies']:
+                    texts.append((1, subject, grade, comp['name']))
+                    texts.extend((3, subject, grade, obj) for obj in dict.fromkeys(comp['learningObjectives']))
+
+        def scan(query):
+            words, folded = search_words(query), fold(query).strip()
+            found = [(n, entry) for n, entry in enumerate(texts)
+                     if all(any(w.startswith(p) for w in search_words(entry[3])) for p in words)]
+            found.sort(key=lambda item: (not fold(item[1][3]).startswith(folded), item[1][0],
+                                         len(item[1][3]), item[1][1], item[1][2], item[0]))
+            return [(KINDS[kind], subject, grade, text) for _, (kind, subject, grade, text) in found[:10]]
+
+        def lookup(query):
+            return [(r['kind'], r['subject'], r['grade'], r['text']) for r in search.complete(query)]
+
+        for query in queries:
+            if lookup(query) != scan(query):
+                print(f"Lookup of '{query}' differs from the full scan")
+                return False
+        scan_ms = max(_best_time(scan, query, repeat=1) for query in queries) * 1000
+        lookup_ms = max(_best_time(lookup, query) for query in queries) * 1000
+        index_size = len(json.dumps(index, separators=(',', ':')))
+        print(f"{subject_count:>9} {len(texts):>8,} {index_size / 1024:>11.0f} {scan_ms:>10.1f} {lookup_ms:>12.2f}")
+        if subject_count == 12:
+            ok = ok and lookup_ms < 20 and lookup_ms * 10 < scan_ms
+    return ok
+
+def bench_bundle() -> bool:
+    """Every bundle format must carry exactly the same data as the curriculum it was built from,
+    and editing one objective must give a patch of a few KB"""
+    import copy
+    from curriculum_bundle import BUNDLE_FORMATS, build_bundle, format_bundle, format_json, verify_round_trip
+    from curriculum_delta import diff_bundles
+
+    curriculum = make_search_curriculum(12)
+    build_time = _best_time(build_bundle, curriculum, repeat=1)
+    bundle = build_bundle(curriculum)
+    print(f"build_bundle: {build_time * 1000:.0f} ms, canonical JSON {len(format_json(bundle).encode('utf-8')) / 1024:,.0f} KB")
+    for output_format in BUNDLE_FORMATS:
+        seconds = _best_time(format_bundle, bundle, output_format)
+        size = len(format_bundle(bundle, output_format).encode('utf-8'))
+        print(f"  {output_format:>6}: {size / 1024:>8,.0f} KB in {seconds * 1000:.0f} ms")
+    try:
+        verify_round_trip(bundle)
+    except ValueError as e:
+        print(e)
+        return False
+
+    edited = copy.deepcopy(curriculum)
+    edited['Subject 0']['Grade 00']['topics'][0]['learningObjectives'][0] = 'Écrire un texte descriptif'
+    patch_size = len(format_json(diff_bundles(bundle, build_bundle(edited), 'a', 'b')).encode('utf-8'))
+    print(f"  patch for one edited objective: {patch_size / 1024:,.1f} KB")
+    return patch_size < 10 * 1024
+
+def bench_roster() -> bool:
+    """Roster rows must stream in at tens of thousands per second, and merging must never lose or
+    double a student: same-name students stay apart, and an ID row finds its student by name"""
+    from roster_import import RosterImport
+
+    existing = [{'id': 'a', 'name': 'Ann Lee', 'studentId': ''},
+                {'id': 'b', 'name': 'John Smith', 'studentId': ''},
+                {'id': 'c', 'name': 'John  Smith', 'studentId': ''}]
+    result = RosterImport([dict(student) for student in existing])
+    result.start_file('roster.csv', {'name': 0, 'studentId': 1, 'classSections': 2})
+    result.add_row(2, ['Ann Lee', '123', '601'])
+    result.add_row(3, ['john smith', '', '602'])
+    ids = [student['id'] for student in result.students]
+    print(f"Duplicates: {len(result.students)} students {ids}, {result.rejected} rejected as ambiguous")
+    ok = ids == ['a', 'b', 'c'] and result.students[0]['studentId'] == '123' and \
+        result.students[0]['classSections'] == ['601'] and result.rejected == 1
+
+    rows = [[f"Student {n % 20000}", f"{n % 20000:07d}", f"{600 + n % 40}"] for n in range(100000)]
+
+    def run():
+        roster = RosterImport()
+        roster.start_file('roster.csv', {'name': 0, 'studentId': 1, 'classSections': 2})
+        for line, row in enumerate(rows, 2):
+            roster.add_row(line, row)
+        return roster
+
+    seconds = _best_time(run)
+    roster = run()
+    print(f"{len(rows):,} rows -> {len(roster.students):,} students in {seconds * 1000:.0f} ms "
+          f"({len(rows) / seconds:,.0f} rows/s)")
+    return ok and len(roster.students) == 20000 and roster.rejected == 0 and len(rows) / seconds > 20000
+
+# Bookmark titles from QEP/PFEQ program PDFs and the section each one starts
+OUTLINE_TITLES = [
+    ('Table of Contents', None),
+    ('Table des matières', None),
+    ('Contenu du programme – Introduction', None),
+    ('Introduction to the Science and Technology Program', None),
+    ('Competency 1 Seeks answers or solutions to scientific or technological problems', 'competencies'),
+    ('Compétence 2 Mettre à profit ses connaissances scientifiques et technologiques', 'competencies'),
+    ('Cross-Curricular Competencies', 'crossCurricular'),
+    ('Broad Areas of Learning', 'broadAreas'),
+    ('Program Content', 'topics'),
+    ('Contenu de formation', 'topics'),
+    ('Savoirs essentiels', 'topics'),
+    ('Progression of Learning in Secondary School', 'topics'),
+    ('Social Phenomena', 'themes'),
+    ('Bibliography', None),
+]
+
+def bench_outline() -> bool:
+    """Real bookmark titles must start the right sections, and planning a long outline stays fast"""
+    from pdf_outline import outline_sections, section_for_title
+
+    ok = True
+    for title, expected in OUTLINE_TITLES:
+        found = section_for_title(title)
+        if found != expected:
+            print(f"  '{title}': {found} (expected {expected})")
+            ok = False
+    print(f"{len(OUTLINE_TITLES)} real outline titles classified{'' if ok else ' - MISMATCHES above'}")
+
+    titles = [title for title, _ in OUTLINE_TITLES]
+    outline = [{'title': titles[n % len(titles)], 'page': n, 'depth': n % 3} for n in range(3000)]
+    info = {'pageCount': 3000, 'outline': outline}
+    seconds = _best_time(outline_sections, info)
+    print(f"outline_sections: {len(outline):,} bookmarks in {seconds * 1000:.1f} ms")
+    return ok and seconds < 0.5
+
+BENCHMARKS = {
+    'competencies': bench_competencies,
+    'imports': bench_imports,
+    'store': bench_store,
+    'gradebook': bench_gradebook,
+    'codec': bench_codec,
+    'search': bench_search,
+    'bundle': bench_bundle,
+    'roster': bench_roster,
+    'outline': bench_outline,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run pipeline benchmarks')
+    parser.add_argument('names', nargs='*', metavar='name',
+                        help=f"benchmarks to run: {', '.join(sorted(BENCHMARKS))} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    failed = []
+    for name in args.names or sorted(BENCHMARKS):
+        print(f"\n=== {name} ===")
+        if not BENCHMARKS[name]():
+            failed.append(name)
+            print(f"[FAILED] {name}")
+        else:
+            print(f"[OK] {name}")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Page Boilerplate Stripping
+PFEQ PDFs repeat running headers, footers, page numbers and the program title
+on every page. Lines near the top and bottom of each page are hashed by their
+position on the page (with a page number at either end folded, so "Page 12"
+and "Page 13" agree), and lines that recur in the same position on most pages
+are removed before the parsers see the text.
+"""
+
+import re
+import hashlib
+from collections import Counter
+from typing import List, Tuple
+
+EDGE_LINES = 3                  # lines examined at the top and at the bottom of each page
+BOILERPLATE_MIN_SHARE = 0.6     # share of pages a line must repeat on to be dropped
+BOILERPLATE_MIN_PAGES = 3       # shorter documents are left alone
+
+EDGE_NUMBER = re.compile(r'^\d+(?=\s|$)|(?<=\s)\d+$')
+SPACES = re.compile(r'\s+')
+
+def _line_key(position: int, line: str) -> str:
+    normalized = SPACES.sub(' ', EDGE_NUMBER.sub('#', line.strip().lower()))
+    return f"{position}:{hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()}"
+
+def _edge_positions(line_count: int) -> List[Tuple[int, int]]:
+    """(line number, position) for the top and bottom lines of a page; bottom positions are negative"""
+    positions = [(i, i) for i in range(min(EDGE_LINES, line_count))]
+    positions += [(line_count + p, p) for p in range(-min(EDGE_LINES, line_count), 0)
+                  if line_count + p >= EDGE_LINES]
+    return positions
+
+def strip_boilerplate(pages: List[str]) -> Tuple[List[str], int]:
+    """Remove lines repeated in the same page position across most pages
+
+    Returns the cleaned pages and the number of lines dropped. Headers that
+    alternate between odd and even pages are caught by also counting each
+    parity on its own. Empty (unextracted) pages are ignored.
+    """
+    page_lines = [page.split('\n') if page else [] for page in pages]
+    # Positions count non-blank lines only, so a stray blank line does not shift them
+    content = [[index for index, line in enumerate(lines) if line.strip()] for lines in page_lines]
+    text_pages = [i for i, indices in enumerate(content) if indices]
+    if len(text_pages) < BOILERPLATE_MIN_PAGES:
+        return pages, 0
+
+    page_keys = {}
+    counts = Counter()
+    parity_counts = [Counter(), Counter()]
+    parity_sizes = [0, 0]
+    for i in text_pages:
+        keys = {content[i][n]: _line_key(position, page_lines[i][content[i][n]])
+                for n, position in _edge_positions(len(content[i]))}
+        page_keys[i] = keys
+        unique = set(keys.values())
+        counts.update(unique)
+        parity_counts[i % 2].update(unique)
+        parity_sizes[i % 2] += 1
+
+    def repeated(key: str, parity: int) -> bool:
+        if counts[key] >= BOILERPLATE_MIN_SHARE * len(text_pages):
+            return True
+        size = parity_sizes[parity]
+        return size >= BOILERPLATE_MIN_PAGES and parity_counts[parity][key] >= BOILERPLATE_MIN_SHARE * size
+
+    cleaned = list(pages)
+    dropped = 0
+    for i in text_pages:
+        drop = {index for index, key in page_keys[i].items() if counts[key] > 1 and repeated(key, i % 2)}
+        if drop:
+            dropped += len(drop)
+            cleaned[i] = '\n'.join(line for index, line in enumerate(page_lines[i]) if index not in drop)
+    return cleaned, dropped
@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Static Asset Build
+Builds a deployable copy of the teacher tool pages in dist/. Inline <script>
+and <style> blocks are moved into external files and the linked
+calendar-grades.js/.css are picked up too; everything is minified, named by
+content hash (identical blocks in index.html and rubric-builder.html become
+one shared file) and precompressed. _headers gives the hashed assets a
+one-year immutable cache and makes the pages revalidate, so a repeat visit
+only re-checks the HTML and the curriculum version stamp. The pages also
+register an offline service worker (see offline_cache.py) that serves them
+from cache and refetches only the entries whose hash changed.
+
+    python build_static_assets.py
+    python build_static_assets.py --out public --no-precompress --no-offline
+"""
+
+import re
+import sys
+import json
+import shutil
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from curriculum_bundle import brotli, content_hash, hashed_name, write_compressed_siblings, write_if_changed
+from offline_cache import (
+    MANIFEST_NAME, SERVICE_WORKER_NAME, build_cache_manifest, format_registration, format_service_worker
+)
+
+SOURCE_DIR = Path(__file__).parent
+DIST_DIR = SOURCE_DIR / 'dist'
+ASSETS_DIR = 'assets'
+# rubric-builder.html first so the assets it shares with index.html are named after it
+PAGES = ('rubric-builder.html', 'index.html', 'calendar-grades.html')
+# Copied unhashed: the builder already fetches them with ?v=<content version>
+CURRICULUM_FILES = ('pfeq_curriculum_data.js', 'pfeq_curriculum_data.json', 'pfeq_curriculum_data.patch.json',
+                    'pfeq_curriculum_data.search.json')
+VERSION_STAMP = 'pfeq_curriculum_data.version.json'
+
+CACHE_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_VERSIONED = 'public, max-age=31536000'
+CACHE_REVALIDATE = 'no-cache'
+
+# ---------------------------------------------------------------------------
+# Minifiers
+# ---------------------------------------------------------------------------
+
+# After these words a "/" starts a regular expression rather than a division
+REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                  'throw', 'case', 'do', 'else', 'yield', 'await'}
+# A line break after these characters can never end a statement
+OPEN_CHARS = '{;,([:=&|?!'
+# ... nor before these
+CLOSE_CHARS = '})];,.'
+JS_SPACE = ' \t\r\n\f\v\u00a0\ufeff'
+
+def _word(char: str) -> bool:
+    return char.isalnum() or char in '_$' or ord(char) > 127
+
+def _scan_string(code: str, i: int) -> int:
+    """End of the quoted string starting at i"""
+    quote = code[i]
+    j = i + 1
+    while j < len(code):
+        if code[j] == '\\':
+            j += 2
+            continue
+        if code[j] == quote:
+            return j + 1
+        if code[j] == '\n':
+            break
+        j += 1
+    raise ValueError(f'unterminated string at offset {i}')
+
+def _scan_substitution(code: str, j: int) -> int:
+    """End of a ${...} substitution whose body starts at j"""
+    tokens = _js_tokens(code, j, substitution=True)
+    try:
+        while True:
+            next(tokens)
+    except StopIteration as stop:
+        if stop.value is None:
+            raise ValueError(f'unterminated template substitution at offset {j}')
+        return stop.value
+
+def _scan_template(code: str, i: int) -> int:
+    """End of the template literal starting at i (kept verbatim, substitutions included)"""
+    j = i + 1
+    while j < len(code):
+        char = code[j]
+        if char == '\\':
+            j += 2
+            continue
+        if char == '`':
+            return j + 1
+        if code.startswith('${', j):
+            j = _scan_substitution(code, j + 2)
+            continue
+        j += 1
+    raise ValueError(f'unterminated template literal at offset {i}')
+
+def _scan_regex(code: str, i: int) -> int:
+    """End of the regular expression literal (flags included) starting at i"""
+    j = i + 1
+    in_class = False
+    while j < len(code):
+        char = code[j]
+        if char == '\\':
+            j += 2
+            continue
+        if char == '\n':
+            break
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            j += 1
+            while j < len(code) and _word(code[j]):
+                j += 1
+            return j
+        j += 1
+    raise ValueError(f'unterminated regular expression at offset {i}')
+
+def _js_tokens(code: str, start: int = 0, substitution: bool = False):
+    """(kind, text, whitespace before) for each token; comments are dropped
+
+    Whitespace is '' (none), ' ' or '\\n' (the run held a line break, which
+    may matter for automatic semicolon insertion). With substitution=True
+    lexing stops at the "}" closing a template ${...} and the generator
+    returns the offset just past it.
+    """
+    i, n = start, len(code)
+    space = ''
+    depth = 0
+    prev_kind, prev_text = '', ''
+    while i < n:
+        char = code[i]
+        if char in JS_SPACE:
+            j = i
+            while j < n and code[j] in JS_SPACE:
+                j += 1
+            space = '\n' if '\n' in code[i:j] or space == '\n' else ' '
+            i = j
+            continue
+        if code.startswith('//', i):
+            end = code.find('\n', i)
+            i = n if end < 0 else end
+            continue
+        if code.startswith('/*', i):
+            end = code.find('*/', i + 2)
+            if end < 0:
+                raise ValueError(f'unterminated comment at offset {i}')
+            space = '\n' if '\n' in code[i:end] or space == '\n' else ' '
+            i = end + 2
+            continue
+
+        if char in '"\'':
+            kind, end = 'string', _scan_string(code, i)
+        elif char == '`':
+            kind, end = 'string', _scan_template(code, i)
+        elif char == '/' and (prev_kind in ('', 'punct') and prev_text not in (')', ']')
+                              or prev_kind == 'word' and prev_text in REGEX_KEYWORDS):
+            kind, end = 'regex', _scan_regex(code, i)
+        elif _word(char):
+            end = i + 1
+            while end < n and _word(code[end]):
+                end += 1
+            kind = 'word'
+        else:
+            kind, end = 'punct', i + 1
+            if char == '{':
+                depth += 1
+            elif char == '}':
+                if substitution and not depth:
+                    return end
+                depth -= 1
+
+        prev_kind, prev_text = kind, code[i:end]
+        yield kind, prev_text, space
+        space = ''
+        i = end
+
+def minify_js(code: str) -> str:
+    """Drop comments and redundant whitespace, keeping line breaks wherever ASI could need them
+
+    Strings, template literals and regular expressions are copied verbatim;
+    identifiers are not renamed, so inline onclick handlers keep working.
+    """
+    out = []
+    last = ''
+    for kind, text, space in _js_tokens(code):
+        first = text[0]
+        if space and last:
+            if space == '\n' and last not in OPEN_CHARS and first not in CLOSE_CHARS:
+                out.append('\n')
+            elif (_word(last) and _word(first)
+                  or last in '+-' and first in '+-'
+                  or last == '/' and first in '/*'
+                  or last.isdigit() and first == '.'):
+                out.append(' ')
+        out.append(text)
+        last = text[-1]
+    return ''.join(out) + '\n'
+
+CSS_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+CSS_STRING = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'')
+CSS_SPACE = re.compile(r'\s+')
+CSS_AROUND = re.compile(r'\s*([{};,>])\s*')
+CSS_AFTER_COLON = re.compile(r':\s+')
+
+def minify_css(code: str) -> str:
+    """Drop comments and whitespace around CSS punctuation (strings are left untouched)"""
+    parts = []
+    last = 0
+    for match in CSS_STRING.finditer(code):
+        parts.append((code[last:match.start()], False))
+        parts.append((match.group(0), True))
+        last = match.end()
+    parts.append((code[last:], False))
+
+    out = []
+    for text, is_string in parts:
+        if not is_string:
+            text = CSS_COMMENT.sub('', text)
+            text = CSS_SPACE.sub(' ', text)
+            text = CSS_AROUND.sub(r'\1', text)
+            # Only after the colon: "a :hover" and "a:hover" are different selectors
+            text = CSS_AFTER_COLON.sub(':', text)
+            text = text.replace(';}', '}')
+        out.append(text)
+    return ''.join(out).strip() + '\n'
+
+# Inline blocks; finditer never looks inside a match, so "<style>" written in a
+# script's template literal stays part of that script
+INLINE_BLOCK = re.compile(r'<(script|style)(\s[^>]*)?>(.*?)</\1>', re.DOTALL | re.IGNORECASE)
+PRESERVED_HTML = re.compile(r'<(script|style|pre|textarea)\b.*?</\1>', re.DOTALL | re.IGNORECASE)
+HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+HTML_INDENT = re.compile(r'\n\s+')
+
+def minify_html(html: str) -> str:
+    """Remove comments and indentation outside <script>/<style>/<pre>/<textarea>"""
+    out = []
+    last = 0
+    for match in PRESERVED_HTML.finditer(html):
+        out.append(HTML_INDENT.sub('\n', HTML_COMMENT.sub('', html[last:match.start()])))
+        out.append(match.group(0))
+        last = match.end()
+    out.append(HTML_INDENT.sub('\n', HTML_COMMENT.sub('', html[last:])))
+    return ''.join(out).strip() + '\n'
+
+MINIFIERS = {'.js': minify_js, '.css': minify_css}
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+class AssetBuild:
+    """Writes hashed assets into dist_dir and remembers what each page references"""
+
+    def __init__(self, source_dir: Path = SOURCE_DIR, dist_dir: Path = DIST_DIR, precompress: bool = True,
+                 offline: bool = True):
+        self.source_dir = Path(source_dir)
+        self.dist_dir = Path(dist_dir)
+        self.assets_dir = self.dist_dir / ASSETS_DIR
+        self.precompress = precompress
+        self.offline = offline
+        self.entries: Dict[str, str] = {}       # URL -> content hash, for the offline cache manifest
+        self.by_hash: Dict[str, str] = {}       # content hash -> asset URL
+        self.manifest: Dict[str, List[str]] = {}
+        self.headers: Dict[str, str] = {}
+        self.written: List[Path] = []
+        self.sizes = {'source': 0, 'output': 0}
+
+    def _write(self, path: Path, data: bytes, cache_control: str, cacheable: bool = True):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(path, data)
+        self.written.append(path)
+        if self.precompress:
+            self.written += write_compressed_siblings(path, data, warn=False)
+        url = path.relative_to(self.dist_dir).as_posix()
+        self.headers['/' + url] = cache_control
+        if cacheable:
+            self.entries[url] = content_hash(data)
+
+    def add_asset(self, name: str, code: str) -> str:
+        """Minify and write one asset (once per distinct content); return its URL"""
+        suffix = Path(name).suffix
+        data = MINIFIERS[suffix](code).encode('utf-8')
+        digest = content_hash(data)
+        if digest not in self.by_hash:
+            path = hashed_name(self.assets_dir / name, data)
+            self._write(path, data, CACHE_IMMUTABLE)
+            self.by_hash[digest] = f'{ASSETS_DIR}/{path.name}'
+            self.sizes['output'] += len(data)
+        return self.by_hash[digest]
+
+    def build_page(self, page: str):
+        # Normalized so the CRLF index.html shares its assets with rubric-builder.html
+        html = (self.source_dir / page).read_text(encoding='utf-8').replace('\r\n', '\n')
+        self.sizes['source'] += len(html.encode('utf-8'))
+        stem = Path(page).stem
+        urls = []
+        counters = {'script': 0, 'style': 0}
+
+        def external(match) -> str:
+            tag, attrs, body = match.group(1).lower(), match.group(2) or '', match.group(3)
+            src = re.search(r'\bsrc=["\']([^"\']+)["\']', attrs)
+            if tag == 'script' and src:
+                source = self.source_dir / src.group(1)
+                if not source.exists() or Path(src.group(1)).suffix != '.js':
+                    return match.group(0)
+                url = self.add_asset(src.group(1), source.read_text(encoding='utf-8'))
+                urls.append(url)
+                return match.group(0).replace(src.group(0), f'src="{url}"')
+            if attrs.strip() and not re.fullmatch(r'\s*type=["\'](text/javascript|text/css)["\']\s*', attrs):
+                return match.group(0)
+            counters[tag] += 1
+            suffix = '.js' if tag == 'script' else '.css'
+            url = self.add_asset(f'{stem}-{counters[tag]}{suffix}', body)
+            urls.append(url)
+            if tag == 'script':
+                return f'<script src="{url}"></script>'
+            return f'<link rel="stylesheet" href="{url}">'
+
+        def stylesheet(match) -> str:
+            href = match.group(2)
+            source = self.source_dir / href
+            if href.startswith(ASSETS_DIR + '/') or not source.exists():
+                return match.group(0)
+            url = self.add_asset(href, source.read_text(encoding='utf-8'))
+            urls.append(url)
+            return match.group(0).replace(href, url)
+
+        html = INLINE_BLOCK.sub(external, html)
+        html = re.sub(r'(<link\b[^>]*\bhref=["\'])([^"\':]+\.css)(["\'])', stylesheet, html)
+        if self.offline and '</body>' in html:
+            url = self.add_asset('offline.js', format_registration())
+            urls.append(url)
+            html = html.replace('</body>', f'<script src="{url}"></script>\n</body>', 1)
+        html = minify_html(html)
+        self.sizes['output'] += len(html.encode('utf-8'))
+        self._write(self.dist_dir / page, html.encode('utf-8'), CACHE_REVALIDATE)
+        self.manifest[page] = urls
+
+    def copy_curriculum_data(self):
+        for name in CURRICULUM_FILES + (VERSION_STAMP,):
+            source = self.source_dir / name
+            if source.exists():
+                cache_control = CACHE_REVALIDATE if name == VERSION_STAMP else CACHE_VERSIONED
+                self._write(self.dist_dir / name, source.read_bytes(), cache_control)
+
+    def remove_stale_assets(self) -> int:
+        """Delete hashed assets left over from earlier builds"""
+        if not self.assets_dir.exists():
+            return 0
+        keep = set(self.written)
+        stale = [path for path in self.assets_dir.glob('*') if path not in keep]
+        for path in stale:
+            path.unlink()
+        return len(stale)
+
+    def write_offline_cache(self):
+        """Service worker plus the manifest of everything it caches (neither is cached itself)"""
+        manifest = build_cache_manifest(self.entries)
+        self._write(self.dist_dir / SERVICE_WORKER_NAME, minify_js(format_service_worker()).encode('utf-8'),
+                    CACHE_REVALIDATE, cacheable=False)
+        self._write(self.dist_dir / MANIFEST_NAME, (json.dumps(manifest, indent=2) + '\n').encode('utf-8'),
+                    CACHE_REVALIDATE, cacheable=False)
+        return manifest
+
+    def write_metadata(self):
+        manifest = {'pages': self.manifest, 'headers': self.headers}
+        write_if_changed(self.dist_dir / 'asset-manifest.json',
+                         json.dumps(manifest, indent=2, ensure_ascii=False) + '\n')
+        # Netlify / Cloudflare Pages style header rules
+        lines = []
+        for path, cache_control in sorted(self.headers.items()):
+            lines += [path, f'  Cache-Control: {cache_control}', '']
+        write_if_changed(self.dist_dir / '_headers', '\n'.join(lines))
+
+def build_static_assets(dist_dir: Path = DIST_DIR, precompress: bool = True, offline: bool = True) -> AssetBuild:
+    """Build every page into dist_dir and return the build record"""
+    build = AssetBuild(SOURCE_DIR, dist_dir, precompress, offline)
+    if precompress and brotli is None:
+        print("  brotli not installed - skipping .br output")
+    for page in PAGES:
+        if not (SOURCE_DIR / page).exists():
+            print(f"[WARNING] {page} not found - skipped")
+            continue
+        build.build_page(page)
+        print(f"[OK] {page}: {len(build.manifest[page])} asset(s)")
+    build.copy_curriculum_data()
+    if offline:
+        manifest = build.write_offline_cache()
+        print(f"[OK] {MANIFEST_NAME}: {len(manifest['entries'])} cached file(s), version {manifest['version']}")
+    stale = build.remove_stale_assets()
+    build.write_metadata()
+    if stale:
+        print(f"  Removed {stale} stale asset file(s)")
+    return build
+
+def refresh_static_build(dist_dir: Path = DIST_DIR) -> Optional[AssetBuild]:
+    """Pipeline hook: rebuild an existing dist/ so it ships the new curriculum data and manifest"""
+    if not Path(dist_dir).exists():
+        return None
+    print(f"\nRefreshing static build in {dist_dir}...")
+    try:
+        return build_static_assets(dist_dir)
+    except (OSError, ValueError) as e:
+        print(f"  [WARNING] Static build not refreshed: {e}")
+        return None
+
+def _assets_summary(build: AssetBuild) -> Tuple[int, int]:
+    """(number of distinct hashed assets, total bytes)"""
+    files = [build.dist_dir / url for url in build.by_hash.values()]
+    return len(files), sum(path.stat().st_size for path in files)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build minified, content-hashed copies of the teacher tool pages')
+    parser.add_argument('--out', type=Path, default=DIST_DIR, help='output directory')
+    parser.add_argument('--no-precompress', action='store_true', help='skip the .gz/.br copies')
+    parser.add_argument('--no-offline', action='store_true', help='skip the offline service worker')
+    parser.add_argument('--clean', action='store_true', help='delete the output directory first')
+    args = parser.parse_args()
+
+    if args.clean and args.out.exists():
+        shutil.rmtree(args.out)
+    try:
+        build = build_static_assets(args.out, precompress=not args.no_precompress, offline=not args.no_offline)
+    except ValueError as e:
+        print(f"[ERROR] Could not minify: {e}")
+        sys.exit(1)
+    count, size = _assets_summary(build)
+    print(f"\n[SUCCESS] {args.out}: {count} hashed asset(s), {size:,} bytes "
+          f"({build.sizes['output']:,} of {build.sizes['source']:,} source bytes incl. pages)")
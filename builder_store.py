@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Builder State Store
+On-disk store for the state the calendar and rubric builder used to keep only
+in localStorage (scheduleConfig, assignments, students, grades, savedRubrics).
+Each assignment, student, rubric and per-assignment grade sheet is its own
+SQLite row, so saving one grade rewrites one row instead of the whole
+gradebook, and the fields the pages filter on are indexed.
+
+    python builder_store.py import localStorage-dump.json
+    python builder_store.py stats
+"""
+
+import sys
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+from rubric_codec import as_rubric_list
+
+STORE_FILE = Path(__file__).parent / 'builder_state.sqlite3'
+
+# Arrays of {id, ...} objects, and the fields each one is indexed on
+COLLECTIONS = {
+    'assignments': ('dueDate', 'classPeriod', 'rubricId'),
+    'students': ('classSections', 'studentId'),
+    'savedRubrics': (),
+}
+# Objects keyed by assignment ID
+KEYED_COLLECTIONS = ('grades',)
+# Single JSON documents
+DOCUMENTS = ('scheduleConfig',)
+ITEM_COLLECTIONS = tuple(COLLECTIONS) + KEYED_COLLECTIONS
+STATE_NAMES = ITEM_COLLECTIONS + DOCUMENTS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE INDEX IF NOT EXISTS items_order ON items (collection, position);
+CREATE TABLE IF NOT EXISTS item_fields (
+    collection TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT NOT NULL,
+    id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS item_fields_lookup ON item_fields (collection, field, value);
+CREATE INDEX IF NOT EXISTS item_fields_owner ON item_fields (collection, id);
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+class BuilderStore:
+    """SQLite-backed builder state; every write is its own transaction"""
+
+    def __init__(self, path: Path = STORE_FILE):
+        self.path = Path(path)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _check(name: str, allowed: Iterable[str]):
+        if name not in allowed:
+            raise KeyError(name)
+
+    # -- collections ---------------------------------------------------------
+
+    def _index_fields(self, collection: str, item_id: str, item):
+        self.db.execute('DELETE FROM item_fields WHERE collection = ? AND id = ?', (collection, item_id))
+        rows = []
+        for field in COLLECTIONS.get(collection, ()):
+            value = item.get(field) if isinstance(item, dict) else None
+            values = value if isinstance(value, list) else [value]
+            rows += [(collection, field, str(v), item_id) for v in values if v not in (None, '')]
+        self.db.executemany('INSERT INTO item_fields VALUES (?, ?, ?, ?)', rows)
+
+    def _put(self, collection: str, item_id: str, item):
+        row = self.db.execute('SELECT position FROM items WHERE collection = ? AND id = ?',
+                              (collection, item_id)).fetchone()
+        if row:
+            position = row[0]
+        else:
+            position = self.db.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM items WHERE collection = ?',
+                                       (collection,)).fetchone()[0]
+        self.db.execute('INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?)',
+                        (collection, item_id, position, _dumps(item)))
+        self._index_fields(collection, item_id, item)
+
+    def put_item(self, collection: str, item_id: str, item):
+        """Insert or replace one item (array collections keep insertion order)"""
+        self._check(collection, ITEM_COLLECTIONS)
+        if collection in COLLECTIONS:
+            if not isinstance(item, dict):
+                raise ValueError(f'{collection} items must be objects')
+            item = dict(item, id=item_id)
+        with self.db:
+            self._put(collection, item_id, item)
+        return item
+
+    def delete_item(self, collection: str, item_id: str) -> bool:
+        self._check(collection, ITEM_COLLECTIONS)
+        with self.db:
+            deleted = self.db.execute('DELETE FROM items WHERE collection = ? AND id = ?',
+                                      (collection, item_id)).rowcount
+            self.db.execute('DELETE FROM item_fields WHERE collection = ? AND id = ?', (collection, item_id))
+        return bool(deleted)
+
+    def get_item(self, collection: str, item_id: str):
+        self._check(collection, ITEM_COLLECTIONS)
+        row = self.db.execute('SELECT data FROM items WHERE collection = ? AND id = ?',
+                              (collection, item_id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _rows(self, collection: str):
+        return self.db.execute('SELECT id, data FROM items WHERE collection = ? ORDER BY position',
+                               (collection,)).fetchall()
+
+    def get_collection(self, collection: str):
+        """The whole collection in the shape localStorage held it (array, or object for grades)"""
+        self._check(collection, ITEM_COLLECTIONS)
+        rows = self._rows(collection)
+        if collection in KEYED_COLLECTIONS:
+            return {item_id: json.loads(data) for item_id, data in rows}
+        return [json.loads(data) for _, data in rows]
+
+    def find(self, collection: str, field: str, value: str = None,
+             low: str = None, high: str = None) -> List[Dict]:
+        """Items whose indexed field equals value, or lies in [low, high] (ISO dates compare as text)"""
+        self._check(collection, COLLECTIONS)
+        self._check(field, COLLECTIONS[collection])
+        if value is not None:
+            condition, args = 'value = ?', [value]
+        else:
+            condition, args = 'value >= ? AND value <= ?', [low or '', high or '\uffff']
+        rows = self.db.execute(
+            'SELECT data FROM items WHERE collection = ? AND id IN '
+            f'(SELECT id FROM item_fields WHERE collection = ? AND field = ? AND {condition}) ORDER BY position',
+            [collection, collection, field] + args)
+        return [json.loads(data) for (data,) in rows]
+
+    def replace_collection(self, collection: str, value):
+        """Replace a whole collection (an import, or the first upload of a browser's localStorage)"""
+        self._check(collection, ITEM_COLLECTIONS)
+        if collection in KEYED_COLLECTIONS:
+            if not isinstance(value, dict):
+                raise ValueError(f'{collection} must be an object')
+            items = list(value.items())
+        else:
+            if not isinstance(value, list) or not all(isinstance(item, dict) and item.get('id') for item in value):
+                raise ValueError(f'{collection} must be an array of objects with an id')
+            items = [(str(item['id']), item) for item in value]
+        with self.db:
+            self.db.execute('DELETE FROM items WHERE collection = ?', (collection,))
+            self.db.execute('DELETE FROM item_fields WHERE collection = ?', (collection,))
+            for item_id, item in items:
+                self._put(collection, item_id, item)
+
+    # -- documents -----------------------------------------------------------
+
+    def get_document(self, name: str):
+        self._check(name, DOCUMENTS)
+        row = self.db.execute('SELECT data FROM documents WHERE name = ?', (name,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def put_document(self, name: str, value):
+        self._check(name, DOCUMENTS)
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO documents VALUES (?, ?)', (name, _dumps(value)))
+        return value
+
+    # -- whole state -----------------------------------------------------------
+
+    def get(self, name: str):
+        return self.get_document(name) if name in DOCUMENTS else self.get_collection(name)
+
+    def replace(self, name: str, value):
+        if name in DOCUMENTS:
+            self.put_document(name, value)
+        else:
+            self.replace_collection(name, value)
+
+    def state(self) -> Dict:
+        """Every collection and document, as the pages' localStorage keys"""
+        return {name: self.get(name) for name in STATE_NAMES}
+
+    def import_state(self, data: Dict) -> List[str]:
+        """Load a localStorage dump (values may still be JSON strings); returns the names imported"""
+        imported = []
+        for name in STATE_NAMES:
+            if name not in data:
+                continue
+            value = data[name]
+            if isinstance(value, str):
+                value = json.loads(value)
+            if name == 'savedRubrics':
+                value = as_rubric_list(value)
+            self.replace(name, value)
+            imported.append(name)
+        return imported
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict(self.db.execute('SELECT collection, COUNT(*) FROM items GROUP BY collection').fetchall())
+        return {name: counts.get(name, 0) for name in ITEM_COLLECTIONS}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect or load the builder state store')
+    parser.add_argument('--store', type=Path, default=STORE_FILE, help='SQLite store file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    load = commands.add_parser('import', help='load a localStorage dump (JSON object of key -> value)')
+    load.add_argument('dump', type=Path)
+    commands.add_parser('export', help='print the whole state as JSON')
+    commands.add_parser('stats', help='count stored items')
+    args = parser.parse_args()
+
+    with BuilderStore(args.store) as store:
+        if args.command == 'import':
+            try:
+                names = store.import_state(json.loads(args.dump.read_text(encoding='utf-8')))
+            except (OSError, ValueError) as e:
+                print(f"[ERROR] {args.dump}: {e}")
+                sys.exit(1)
+            print(f"[OK] Imported {', '.join(names) or 'nothing'}")
+        elif args.command == 'export':
+            print(json.dumps(store.state(), indent=2, ensure_ascii=False))
+        else:
+            for name, count in store.stats().items():
+                print(f"  {name}: {count}")
@@ -4,9 +4,154 @@ let currentView = 'month';
 let selectedAssignment = null;
 let editingStudentId = null;
 
+// Builder state: each localStorage key is parsed once and kept in memory. When the page is
+// served by curriculum_server.py its store becomes the source of truth and every save is
+// written through item by item instead of re-serializing whole collections. Once the
+// server holds a collection this browser's copy is dropped (shared ones are kept in sync),
+// so a later page load never merges deleted entries back in.
+const STATE_DEFAULTS = {
+    scheduleConfig: '{}',
+    assignments: '[]',
+    students: '[]',
+    grades: '{}',
+    savedRubrics: '[]'
+};
+// The rubric builder reads these from localStorage, so they are kept there in server mode too
+const SHARED_STATE = ['savedRubrics'];
+const stateCache = {};
+let stateApiAvailable = false;
+
+// savedRubrics is stored dictionary-encoded (rubric_codec.js); everything else as plain JSON
+function parseStoredState(name, text) {
+    if (name === 'savedRubrics') return parseRubricLibrary(text);
+    return JSON.parse(text || STATE_DEFAULTS[name]);
+}
+
+function storeLocalState(name, value) {
+    localStorage.setItem(name, name === 'savedRubrics' ? stringifyRubricLibrary(value) : JSON.stringify(value));
+}
+
+function loadState(name) {
+    if (!(name in stateCache)) {
+        stateCache[name] = parseStoredState(name, localStorage.getItem(name));
+    }
+    return stateCache[name];
+}
+
+// itemId names the one entry that changed (a student, assignment or rubric id, or the
+// assignment id of a grade sheet); without it the whole collection is written. Resolves to
+// true once the local server has the change
+function saveState(name, value, itemId) {
+    stateCache[name] = value;
+    if (!stateApiAvailable || SHARED_STATE.includes(name)) {
+        storeLocalState(name, value);
+    }
+    if (!stateApiAvailable) return Promise.resolve(false);
+
+    let url = 'api/' + name;
+    let method = 'PUT';
+    let body = value;
+    if (itemId !== undefined) {
+        url += '/' + encodeURIComponent(itemId);
+        body = Array.isArray(value) ? value.find(item => item.id === itemId) : value[itemId];
+        if (body === undefined) method = 'DELETE';
+    }
+    const options = { method: method };
+    if (method === 'PUT') {
+        options.headers = { 'Content-Type': 'application/json' };
+        options.body = JSON.stringify(body);
+    }
+    return fetch(url, options)
+        .then(response => {
+            if (!response.ok && !(method === 'DELETE' && response.status === 404)) throw new Error(response.status);
+            return true;
+        })
+        .catch(error => {
+            console.warn('Could not save ' + name + ' to the local server, keeping it in this browser:', error);
+            storeLocalState(name, value);
+            return false;
+        });
+}
+
+// Entries only this browser has (saved before the server was used, or while it was down)
+function mergeLocalState(name, serverValue, localValue) {
+    if (Array.isArray(serverValue)) {
+        const known = new Set(serverValue.map(item => item.id));
+        const missing = localValue.filter(item => item && item.id && !known.has(item.id));
+        return { value: serverValue.concat(missing), changed: missing.length > 0 };
+    }
+    if (name === 'scheduleConfig') {
+        const useLocal = Object.keys(serverValue).length === 0 && Object.keys(localValue).length > 0;
+        return { value: useLocal ? localValue : serverValue, changed: useLocal };
+    }
+    const missing = Object.keys(localValue).filter(key => !(key in serverValue));
+    missing.forEach(key => {
+        serverValue[key] = localValue[key];
+    });
+    return { value: serverValue, changed: missing.length > 0 };
+}
+
+// Switch to the local server's store when the page is served by curriculum_server.py
+function connectStateApi() {
+    if (!location.protocol.startsWith('http')) return Promise.resolve(false);
+    return fetch('api/state', { cache: 'no-cache' })
+        .then(response => response.ok ? response.json() : Promise.reject(response.status))
+        .then(state => {
+            stateApiAvailable = true;
+            Object.keys(STATE_DEFAULTS).forEach(name => {
+                const text = localStorage.getItem(name);
+                const local = parseStoredState(name, text);
+                const merged = mergeLocalState(name, state[name], local);
+                let synced;
+                if (merged.changed) {
+                    synced = saveState(name, merged.value);
+                } else {
+                    stateCache[name] = merged.value;
+                    synced = Promise.resolve(true);
+                }
+                if (SHARED_STATE.includes(name)) {
+                    // The builder reads these from localStorage: give it the server's copy
+                    storeLocalState(name, merged.value);
+                } else if (text !== null) {
+                    // Everything this copy held is on the server now; unless a failed save
+                    // has since stored newer data, drop it so it is never merged in again
+                    synced.then(saved => {
+                        if (saved && localStorage.getItem(name) === text) localStorage.removeItem(name);
+                    });
+                }
+            });
+            return true;
+        })
+        .catch(() => false);
+}
+
+// Another tab (usually the rubric builder) changed localStorage
+window.addEventListener('storage', event => {
+    if (!(event.key in stateCache)) return;
+    if (!stateApiAvailable) {
+        delete stateCache[event.key];
+    } else if (SHARED_STATE.includes(event.key)) {
+        // Every writer keeps the whole shared list in localStorage, so the new value is
+        // current: take it as is (an edited entry replaces the cached one) and send the
+        // server the entries that were added, changed or deleted
+        const incoming = parseStoredState(event.key, event.newValue);
+        const previous = new Map(stateCache[event.key].map(item => [item.id, JSON.stringify(item)]));
+        stateCache[event.key] = incoming;
+        incoming.forEach(item => {
+            if (!item || !item.id) return;
+            if (previous.get(item.id) !== JSON.stringify(item)) saveState(event.key, incoming, item.id);
+            previous.delete(item.id);
+        });
+        previous.forEach((text, id) => saveState(event.key, incoming, id));
+    }
+});
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     initializeApp();
+    connectStateApi().then(connected => {
+        if (connected) initializeApp();
+    });
 });
 
 function initializeApp() {
@@ -53,7 +198,7 @@ function showTab(tabName) {
 
 // Schedule Configuration
 function loadScheduleConfig() {
-    const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
+    const config = loadState('scheduleConfig');
     
     if (config.cycleLength) {
         document.getElementById('cycleLength').value = config.cycleLength;
@@ -110,38 +255,46 @@ function addClassToSchedule() {
     const className = prompt('Enter class name:');
     if (!className) return;
     
-    const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
+    const config = loadState('scheduleConfig');
     if (!config.classSchedule) config.classSchedule = {};
     if (!config.classSchedule[dayNum]) config.classSchedule[dayNum] = [];
     
     config.classSchedule[dayNum].push(className);
-    localStorage.setItem('scheduleConfig', JSON.stringify(config));
+    saveState('scheduleConfig', config);
     
     renderScheduleGrid(config);
 }
 
 function removeClassFromDay(day, index) {
-    const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
+    const config = loadState('scheduleConfig');
     if (config.classSchedule && config.classSchedule[day]) {
         config.classSchedule[day].splice(index, 1);
-        localStorage.setItem('scheduleConfig', JSON.stringify(config));
+        saveState('scheduleConfig', config);
         renderScheduleGrid(config);
     }
 }
 
 function updateScheduleConfig() {
-    renderScheduleGrid(JSON.parse(localStorage.getItem('scheduleConfig') || '{}'));
+    renderScheduleGrid(loadState('scheduleConfig'));
 }
 
 function saveScheduleConfig() {
+    const previous = loadState('scheduleConfig');
     const config = {
         cycleLength: parseInt(document.getElementById('cycleLength').value),
         startDate: document.getElementById('startDate').value,
         endDate: document.getElementById('endDate').value,
-        classSchedule: JSON.parse(localStorage.getItem('scheduleConfig') || '{}').classSchedule || {}
+        classSchedule: previous.classSchedule || {},
+        holidays: previous.holidays || []
     };
+    // An uploaded cycle table only holds for the school year it was built for
+    const table = previous.cycleTable;
+    if (table && table.start === config.startDate && table.end === config.endDate &&
+        table.cycleLength === config.cycleLength) {
+        config.cycleTable = table;
+    }
     
-    localStorage.setItem('scheduleConfig', JSON.stringify(config));
+    saveState('scheduleConfig', config);
     alert('Schedule configuration saved!');
 }
 
@@ -153,19 +306,37 @@ function handleCalendarUpload(event) {
     reader.onload = function(e) {
         try {
             let holidays = [];
+            let table = null;
             if (file.name.endsWith('.csv')) {
                 holidays = parseCSVCalendar(e.target.result);
             } else if (file.name.endsWith('.json')) {
-                holidays = JSON.parse(e.target.result);
+                const data = JSON.parse(e.target.result);
+                if (typeof data.days === 'string') {
+                    // Cycle table written by school_calendar.py
+                    table = data;
+                    holidays = cycleTableDates(table, CLOSED_DAY);
+                } else {
+                    holidays = data;
+                }
             }
             
-            const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
+            const config = loadState('scheduleConfig');
             config.holidays = holidays;
-            localStorage.setItem('scheduleConfig', JSON.stringify(config));
+            if (table) {
+                config.cycleTable = table;
+                config.startDate = table.start;
+                config.endDate = table.end;
+                config.cycleLength = table.cycleLength;
+            } else {
+                delete config.cycleTable;
+            }
+            saveState('scheduleConfig', config);
             
             document.getElementById('calendarPreview').innerHTML = 
-                `<p>Loaded ${holidays.length} holidays/non-instructional days</p>`;
+                `<p>Loaded ${holidays.length} holidays/non-instructional days` +
+                (table ? ` and the cycle days of ${table.schoolDays} school days` : '') + `</p>`;
             
+            loadScheduleConfig();
             renderCalendar();
         } catch (error) {
             alert('Error parsing calendar file: ' + error.message);
@@ -212,9 +383,17 @@ function renderMonthView() {
     const startDate = new Date(firstDay);
     startDate.setDate(startDate.getDate() - startDate.getDay());
     
-    const assignments = JSON.parse(localStorage.getItem('assignments') || '[]');
-    const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
-    const holidays = config.holidays || [];
+    const config = loadState('scheduleConfig');
+    const holidays = new Set(config.holidays || []);
+    const table = cycleTable();
+    const labels = (table && table.labels) || {};
+    
+    // Assignments grouped by due date once, not filtered again for every cell
+    const assignmentsByDate = new Map();
+    loadState('assignments').forEach(assignment => {
+        if (!assignmentsByDate.has(assignment.dueDate)) assignmentsByDate.set(assignment.dueDate, []);
+        assignmentsByDate.get(assignment.dueDate).push(assignment);
+    });
     
     const calendarView = document.getElementById('calendarView');
     calendarView.innerHTML = '<div class="calendar-month"></div>';
@@ -249,8 +428,10 @@ function renderMonthView() {
         }
         
         // Check if holiday
-        if (holidays.includes(dateStr)) {
+        const dayCode = cycleTableCode(table, current);
+        if (dayCode === CLOSED_DAY || holidays.has(dateStr)) {
             dayDiv.classList.add('holiday');
+            if (labels[dateStr]) dayDiv.title = labels[dateStr];
         }
         
         // Check if today
@@ -260,9 +441,13 @@ function renderMonthView() {
         }
         
         dayDiv.innerHTML = `<div class="day-number">${dayNum}</div>`;
+        const cycleDay = dayCode ? CYCLE_DAY_CHARS.indexOf(dayCode) + 1 : 0;
+        if (cycleDay > 0) {
+            dayDiv.innerHTML += `<div class="cycle-day">Day ${cycleDay}</div>`;
+        }
         
         // Add assignments for this date
-        const dayAssignments = assignments.filter(a => a.dueDate === dateStr);
+        const dayAssignments = assignmentsByDate.get(dateStr) || [];
         dayAssignments.forEach(assignment => {
             const badge = document.createElement('div');
             badge.className = 'assignment-badge';
@@ -312,33 +497,69 @@ function formatDate(date) {
     return date.toISOString().split('T')[0];
 }
 
-function getCycleDay(date) {
-    const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
-    const startDate = config.startDate ? new Date(config.startDate) : null;
+// Cycle table: one character per date from table.start - a weekend, a weekday without
+// school, or the cycle day. school_calendar.py writes it from the board's calendar; without
+// one it is built here once per schedule change instead of walking dates on every lookup.
+const WEEKEND_DAY = '.';
+const CLOSED_DAY = '-';
+const CYCLE_DAY_CHARS = '123456789abcdefghijklmnopqrstuvwxyz';
+const DAY_MS = 24 * 60 * 60 * 1000;
+let cycleTableMemo = null;
+
+function buildCycleTable(config) {
+    if (!config.startDate) return null;
+    const start = Date.parse(config.startDate);
+    const end = config.endDate ? Date.parse(config.endDate) : start + 365 * DAY_MS;
     const cycleLength = config.cycleLength || 9;
-    
-    if (!startDate) return null;
-    
-    // Calculate days since start, excluding weekends and holidays
-    let current = new Date(startDate);
-    let dayCount = 1;
-    const holidays = config.holidays || [];
-    
-    while (current < date) {
-        const dateStr = formatDate(current);
-        const dayOfWeek = current.getDay();
-        
-        // Skip weekends and holidays
-        if (dayOfWeek !== 0 && dayOfWeek !== 6 && !holidays.includes(dateStr)) {
-            dayCount++;
+    const holidays = new Set(config.holidays || []);
+    const days = [];
+    let schoolDays = 0;
+    for (let time = start; time <= end; time += DAY_MS) {
+        const day = new Date(time);
+        if (day.getUTCDay() === 0 || day.getUTCDay() === 6) {
+            days.push(WEEKEND_DAY);
+        } else if (holidays.has(day.toISOString().split('T')[0])) {
+            days.push(CLOSED_DAY);
+        } else {
+            days.push(CYCLE_DAY_CHARS[schoolDays % cycleLength]);
+            schoolDays++;
         }
-        
-        current.setDate(current.getDate() + 1);
     }
-    
-    // Calculate which cycle day this is
-    const cycleDay = ((dayCount - 1) % cycleLength) + 1;
-    return cycleDay;
+    return { start: config.startDate, cycleLength: cycleLength, schoolDays: schoolDays, days: days.join(''), labels: {} };
+}
+
+function cycleTable() {
+    const config = loadState('scheduleConfig');
+    if (config.cycleTable) return config.cycleTable;
+    const key = [config.startDate, config.endDate, config.cycleLength, config.holidays];
+    if (!cycleTableMemo || key.some((value, i) => value !== cycleTableMemo.key[i])) {
+        cycleTableMemo = { key: key, table: buildCycleTable(config) };
+    }
+    return cycleTableMemo.table;
+}
+
+// Table character of a local calendar date, or undefined outside the table
+function cycleTableCode(table, date) {
+    if (!table) return undefined;
+    const index = Math.round((Date.UTC(date.getFullYear(), date.getMonth(), date.getDate()) -
+                              Date.parse(table.start)) / DAY_MS);
+    return table.days[index];
+}
+
+function cycleTableDates(table, code) {
+    const start = Date.parse(table.start);
+    const dates = [];
+    for (let i = table.days.indexOf(code); i >= 0; i = table.days.indexOf(code, i + 1)) {
+        dates.push(new Date(start + i * DAY_MS).toISOString().split('T')[0]);
+    }
+    return dates;
+}
+
+// Cycle day (1-based) of a school day, or null on weekends, days without school and outside the year
+function getCycleDay(date) {
+    const code = cycleTableCode(cycleTable(), date);
+    const index = code ? CYCLE_DAY_CHARS.indexOf(code) : -1;
+    return index >= 0 ? index + 1 : null;
 }
 
 function assignRubricToDate(dateStr) {
@@ -353,7 +574,7 @@ function loadStudents() {
 }
 
 function renderStudents() {
-    const students = JSON.parse(localStorage.getItem('students') || '[]');
+    const students = loadState('students');
     const searchTerm = document.getElementById('studentSearch')?.value.toLowerCase() || '';
     const classFilter = document.getElementById('classFilter')?.value || '';
     
@@ -420,11 +641,11 @@ function saveStudent(event) {
         studentId: id,
         classSections: classSections,
         dateAdded: editingStudentId ? 
-            JSON.parse(localStorage.getItem('students') || '[]').find(s => s.id === editingStudentId)?.dateAdded || new Date().toISOString() :
+            loadState('students').find(s => s.id === editingStudentId)?.dateAdded || new Date().toISOString() :
             new Date().toISOString()
     };
     
-    let students = JSON.parse(localStorage.getItem('students') || '[]');
+    let students = loadState('students');
     
     if (editingStudentId) {
         const index = students.findIndex(s => s.id === editingStudentId);
@@ -435,13 +656,13 @@ function saveStudent(event) {
         students.push(student);
     }
     
-    localStorage.setItem('students', JSON.stringify(students));
+    saveState('students', students, student.id);
     closeModal('addStudentModal');
     renderStudents();
 }
 
 function editStudent(id) {
-    const students = JSON.parse(localStorage.getItem('students') || '[]');
+    const students = loadState('students');
     const student = students.find(s => s.id === id);
     if (!student) return;
     
@@ -466,18 +687,20 @@ function editStudent(id) {
 function deleteStudent(id) {
     if (!confirm('Are you sure you want to delete this student?')) return;
     
-    let students = JSON.parse(localStorage.getItem('students') || '[]');
+    let students = loadState('students');
     students = students.filter(s => s.id !== id);
-    localStorage.setItem('students', JSON.stringify(students));
+    saveState('students', students, id);
     
-    // Also remove grades for this student
-    let grades = JSON.parse(localStorage.getItem('grades') || '{}');
+    // Also remove grades for this student (keyed "<studentId>_<criterionIndex>"),
+    // saving only the grade sheets that had any
+    const grades = loadState('grades');
+    const prefix = `${id}_`;
     Object.keys(grades).forEach(assignmentId => {
-        if (grades[assignmentId][id]) {
-            delete grades[assignmentId][id];
-        }
+        const keys = Object.keys(grades[assignmentId]).filter(key => key.startsWith(prefix));
+        if (keys.length === 0) return;
+        keys.forEach(key => delete grades[assignmentId][key]);
+        saveState('grades', grades, assignmentId);
     });
-    localStorage.setItem('grades', JSON.stringify(grades));
     
     renderStudents();
 }
@@ -487,7 +710,7 @@ function filterStudents() {
 }
 
 function updateClassFilter() {
-    const students = JSON.parse(localStorage.getItem('students') || '[]');
+    const students = loadState('students');
     const allSections = new Set();
     
     students.forEach(s => {
@@ -508,10 +731,56 @@ function updateClassFilter() {
     filterSelect.value = currentValue;
 }
 
+// Same matching as roster_import.py: by student ID, then by name ignoring case and spacing
+// (a student with a different ID is someone else). A matched student keeps its id so
+// existing grades stay attached; one whose name fits several students is left out.
+function studentNameKey(name) {
+    return (name || '').toLowerCase().split(/\s+/).filter(Boolean).join(' ');
+}
+
+function mergeImportedStudents(existing, imported) {
+    const students = existing.slice();
+    const byStudentId = new Map();
+    const byName = new Map();
+    const add = (map, key, position) => {
+        if (!map.has(key)) map.set(key, new Set());
+        map.get(key).add(position);
+    };
+    const index = (student, position) => {
+        if (student.studentId) add(byStudentId, student.studentId, position);
+        add(byName, studentNameKey(student.name), position);
+    };
+    // Positions still holding a student with that ID or name (replaced entries may have changed)
+    const lookup = (map, key, keyOf) => Array.from(map.get(key) || []).filter(p => keyOf(students[p]) === key);
+    students.forEach(index);
+    let ambiguous = 0;
+    imported.forEach(student => {
+        const name = studentNameKey(student.name);
+        let candidates = student.studentId ? lookup(byStudentId, student.studentId, s => s.studentId) : [];
+        if (candidates.length === 0) {
+            candidates = lookup(byName, name, s => studentNameKey(s.name))
+                .filter(p => !(student.studentId && students[p].studentId));
+        }
+        if (candidates.length > 1) {
+            ambiguous++;
+            return;
+        }
+        let position = candidates[0];
+        if (position === undefined) {
+            students.push(student);
+            position = students.length - 1;
+        } else {
+            students[position] = Object.assign({}, student, { id: students[position].id });
+        }
+        index(students[position], position);
+    });
+    return { students: students, ambiguous: ambiguous };
+}
+
 function importStudents() {
     const input = document.createElement('input');
     input.type = 'file';
-    input.accept = '.csv';
+    input.accept = '.csv,.json';
     input.onchange = function(e) {
         const file = e.target.files[0];
         if (!file) return;
@@ -519,6 +788,17 @@ function importStudents() {
         const reader = new FileReader();
         reader.onload = function(e) {
             try {
+                // students.json from roster_import.py: already merged, so it replaces matching entries
+                if (file.name.toLowerCase().endsWith('.json')) {
+                    const imported = JSON.parse(e.target.result);
+                    if (!Array.isArray(imported)) throw new Error('expected an array of students');
+                    const merged = mergeImportedStudents(loadState('students'), imported);
+                    saveState('students', merged.students);
+                    alert(`Imported ${imported.length - merged.ambiguous} students` + (merged.ambiguous
+                        ? ` (${merged.ambiguous} skipped: each matches several students with the same name)` : ''));
+                    renderStudents();
+                    return;
+                }
                 const lines = e.target.result.split('\n');
                 const students = [];
                 
@@ -538,9 +818,9 @@ function importStudents() {
                     }
                 }
                 
-                const existing = JSON.parse(localStorage.getItem('students') || '[]');
+                const existing = loadState('students');
                 existing.push(...students);
-                localStorage.setItem('students', JSON.stringify(existing));
+                saveState('students', existing);
                 
                 alert(`Imported ${students.length} students`);
                 renderStudents();
@@ -554,7 +834,7 @@ function importStudents() {
 }
 
 function exportStudents() {
-    const students = JSON.parse(localStorage.getItem('students') || '[]');
+    const students = loadState('students');
     let csv = 'Name,ID,Class Sections\n';
     
     students.forEach(s => {
@@ -576,7 +856,7 @@ function loadRubrics() {
 }
 
 function renderRubrics() {
-    const rubrics = JSON.parse(localStorage.getItem('savedRubrics') || '[]');
+    const rubrics = loadState('savedRubrics');
     const rubricsList = document.getElementById('rubricsList');
     rubricsList.innerHTML = '';
     
@@ -612,7 +892,7 @@ function assignRubric(rubricId) {
 }
 
 function populateAssignRubricForm() {
-    const rubrics = JSON.parse(localStorage.getItem('savedRubrics') || '[]');
+    const rubrics = loadState('savedRubrics');
     const select = document.getElementById('assignRubricSelect');
     select.innerHTML = '';
     
@@ -627,7 +907,7 @@ function populateAssignRubricForm() {
     });
     
     // Populate class select
-    const config = JSON.parse(localStorage.getItem('scheduleConfig') || '{}');
+    const config = loadState('scheduleConfig');
     const classSelect = document.getElementById('assignClass');
     classSelect.innerHTML = '';
     
@@ -654,7 +934,7 @@ function saveAssignment(event) {
     const classPeriod = document.getElementById('assignClass').value;
     const weight = parseFloat(document.getElementById('assignWeight').value) || 10;
     
-    const rubrics = JSON.parse(localStorage.getItem('savedRubrics') || '[]');
+    const rubrics = loadState('savedRubrics');
     const rubric = rubrics.find(r => r.id === rubricId);
     if (!rubric) {
         alert('Rubric not found');
@@ -671,9 +951,9 @@ function saveAssignment(event) {
         dateCreated: new Date().toISOString()
     };
     
-    let assignments = JSON.parse(localStorage.getItem('assignments') || '[]');
+    let assignments = loadState('assignments');
     assignments.push(assignment);
-    localStorage.setItem('assignments', JSON.stringify(assignments));
+    saveState('assignments', assignments, assignment.id);
     
     closeModal('assignRubricModal');
     renderCalendar();
@@ -686,7 +966,7 @@ function loadAssignments() {
 }
 
 function populateAssignmentSelect() {
-    const assignments = JSON.parse(localStorage.getItem('assignments') || '[]');
+    const assignments = loadState('assignments');
     const select = document.getElementById('assignmentSelect');
     select.innerHTML = '<option value="">Select Assignment</option>';
     
@@ -706,14 +986,14 @@ function loadRubricToBuilder(rubricId) {
 function deleteRubric(id) {
     if (!confirm('Are you sure you want to delete this rubric?')) return;
     
-    let rubrics = JSON.parse(localStorage.getItem('savedRubrics') || '[]');
+    let rubrics = loadState('savedRubrics');
     rubrics = rubrics.filter(r => r.id !== id);
-    localStorage.setItem('savedRubrics', JSON.stringify(rubrics));
+    saveState('savedRubrics', rubrics, id);
     
     // Also remove assignments using this rubric
-    let assignments = JSON.parse(localStorage.getItem('assignments') || '[]');
+    let assignments = loadState('assignments');
     assignments = assignments.filter(a => a.rubricId !== id);
-    localStorage.setItem('assignments', JSON.stringify(assignments));
+    saveState('assignments', assignments);
     
     renderRubrics();
     populateAssignmentSelect();
@@ -727,11 +1007,11 @@ function loadAssignmentGrades() {
         return;
     }
     
-    const assignments = JSON.parse(localStorage.getItem('assignments') || '[]');
+    const assignments = loadState('assignments');
     const assignment = assignments.find(a => a.id === assignmentId);
     if (!assignment) return;
     
-    const rubrics = JSON.parse(localStorage.getItem('savedRubrics') || '[]');
+    const rubrics = loadState('savedRubrics');
     const rubric = rubrics.find(r => r.id === assignment.rubricId);
     if (!rubric) return;
     
@@ -741,8 +1021,8 @@ function loadAssignmentGrades() {
 }
 
 function renderGradeEntryInterface(assignment, rubric) {
-    const students = JSON.parse(localStorage.getItem('students') || '[]');
-    const grades = JSON.parse(localStorage.getItem('grades') || '{}');
+    const students = loadState('students');
+    const grades = loadState('grades');
     const assignmentGrades = grades[assignment.id] || {};
     
     let html = `
@@ -804,7 +1084,7 @@ function renderGradeEntryInterface(assignment, rubric) {
 }
 
 function saveGrade(assignmentId, studentId, criterionIndex, levelIndex) {
-    let grades = JSON.parse(localStorage.getItem('grades') || '{}');
+    let grades = loadState('grades');
     if (!grades[assignmentId]) {
         grades[assignmentId] = {};
     }
@@ -816,7 +1096,7 @@ function saveGrade(assignmentId, studentId, criterionIndex, levelIndex) {
         grades[assignmentId][gradeKey] = levelIndex;
     }
     
-    localStorage.setItem('grades', JSON.stringify(grades));
+    saveState('grades', grades, assignmentId);
     
     // Refresh the display
     loadAssignmentGrades();
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Curriculum Bundle Output
+Builds the pfeqCurriculum object the rubric builder loads from a merged
+subject -> grade curriculum tree, and writes it as readable or minified
+JavaScript, optionally with content-hashed precompressed copies.
+Every write also produces pfeq_curriculum_data.json, the canonical data that
+Python tools read back with load_curriculum_json, and the search index the
+builder loads on demand (pfeq_curriculum_data.search.json).
+"""
+
+import re
+import gzip
+import json
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from curriculum_suggestions import build_suggestion_index
+from curriculum_search import bundle_search_index, search_file_for
+from curriculum_delta import MAX_PATCH_SHARE, apply_patch, diff_bundles, patch_file_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUNDLE_FORMATS = ('pretty', 'min', 'json')
+INDENT = '    '
+
+def _bundle_competency(comp: Dict) -> Dict:
+    """Competency as emitted in the bundle (the builder expects learningObjectives)"""
+    entry = {}
+    if comp.get('id'):
+        entry['id'] = comp['id']
+    entry['name'] = comp['name']
+    entry['learningObjectives'] = list(comp.get('learningObjectives', []))
+    return entry
+
+def _bundle_topic(topic) -> Dict:
+    """Topic as emitted in the bundle (the builder expects concepts and learningObjectives)"""
+    if isinstance(topic, str):
+        topic = {'name': topic}
+    entry = {'name': topic['name']}
+    if topic.get('competencies'):
+        entry['competencies'] = list(topic['competencies'])
+    entry['concepts'] = list(topic.get('concepts', []))
+    entry['learningObjectives'] = list(topic.get('learningObjectives', []))
+    if topic.get('progression'):
+        progression = {}
+        for key in ('buildsOn', 'preparesFor'):
+            if topic['progression'].get(key):
+                progression[key] = list(topic['progression'][key])
+        entry['progression'] = progression
+    return entry
+
+def build_bundle(curriculum: Dict) -> Dict:
+    """Build the pfeqCurriculum object for a subject -> grade -> data tree"""
+    subjects = {}
+    for subject, grades in sorted(curriculum.items()):
+        subject_grades = {}
+        for grade, data in sorted(grades.items()):
+            subject_grades[grade] = {
+                'competencies': [_bundle_competency(c) for c in data.get('competencies', [])],
+                'topics': [_bundle_topic(t) for t in data.get('topics', [])],
+                'crossCurricularCompetencies': list(data.get('crossCurricularCompetencies', [])),
+                'broadAreasOfLearning': list(data.get('broadAreasOfLearning', [])),
+                'subjectThemes': list(data.get('subjectThemes', []))
+            }
+        subjects[subject] = {'grades': subject_grades}
+
+    return {
+        'subjects': subjects,
+        # Ranked criterion suggestions per topic, as indexes into the grade's lists
+        'suggestions': build_suggestion_index(curriculum)
+    }
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_$][\w$]*$')
+
+def _js_key(key: str) -> str:
+    return key if _IDENTIFIER.match(key) else json.dumps(key)
+
+def _format_pretty(value, depth: int) -> str:
+    """Format a value as indented JavaScript, one item per line"""
+    if isinstance(value, dict):
+        if not value:
+            return '{}'
+        pad = INDENT * (depth + 1)
+        items = [f'{pad}{_js_key(k)}: {_format_pretty(v, depth + 1)},' for k, v in value.items()]
+        return '{\n' + '\n'.join(items) + '\n' + INDENT * depth + '}'
+    if isinstance(value, list):
+        if not value:
+            return '[]'
+        pad = INDENT * (depth + 1)
+        items = [f'{pad}{_format_pretty(v, depth + 1)},' for v in value]
+        return '[\n' + '\n'.join(items) + '\n' + INDENT * depth + ']'
+    return json.dumps(value)
+
+def format_json(bundle: Dict) -> str:
+    """Canonical JSON form of a bundle"""
+    return json.dumps(bundle, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+def format_loader_shim(json_name: str, version: str = None) -> str:
+    """JavaScript that defines pfeqCurriculum by fetching the JSON data file
+
+    The builder polls for pfeqCurriculum.subjects, so assigning it once the
+    fetch resolves is enough. With a version the JSON URL is cache-busted
+    by content; without one the browser revalidates it on every load.
+    """
+    if version:
+        fetch_args = json.dumps(f'{json_name}?v={version}')
+    else:
+        fetch_args = json.dumps(json_name) + ', { cache: "no-cache" }'
+    return '\n'.join([
+        f'// Loads {json_name} into pfeqCurriculum (generated - do not edit)',
+        '(function () {',
+        f'    fetch({fetch_args})',
+        '        .then(function (response) {',
+        '            if (!response.ok) throw new Error(response.status + " " + response.statusText);',
+        '            return response.json();',
+        '        })',
+        '        .then(function (data) {',
+        '            window.pfeqCurriculum = data;',
+        '            window.dispatchEvent(new Event("pfeqCurriculumLoaded"));',
+        '        })',
+        f'        .catch(function (error) {{ console.error("Failed to load {json_name}", error); }});',
+        '})();',
+        ''
+    ])
+
+def format_bundle(bundle: Dict, output_format: str = 'pretty',
+                  json_name: str = 'pfeq_curriculum_data.json', version: str = None) -> str:
+    """Serialize a bundle as JavaScript defining pfeqCurriculum"""
+    if output_format == 'json':
+        return format_loader_shim(json_name, version)
+    if output_format == 'min':
+        return 'const pfeqCurriculum=' + json.dumps(bundle, ensure_ascii=False, separators=(',', ':')) + ';'
+    if output_format != 'pretty':
+        raise ValueError(f"Unknown bundle format: {output_format}")
+
+    js_lines = ['const pfeqCurriculum = {']
+    for key, value in bundle.items():
+        if key == 'subjects':
+            js_lines.append(f'{INDENT}subjects: {_format_pretty(value, 1)},')
+        else:
+            # Lookup tables stay on one line - they are read by code, not people
+            js_lines.append(f'{INDENT}{_js_key(key)}: {json.dumps(value)},')
+    js_lines.append('};')
+    return '\n'.join(js_lines)
+
+class _JSLiteralParser:
+    """Reads back the JavaScript literal subset the bundle formats produce"""
+
+    SKIP = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.DOTALL)
+    IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+    NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+    CONSTANTS = {'true': True, 'false': False, 'null': None}
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+
+    def skip(self):
+        self.pos = self.SKIP.match(self.text, self.pos).end()
+
+    def peek(self) -> str:
+        self.skip()
+        return self.text[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self):
+        char = self.peek()
+        if char == '{':
+            return self.object()
+        if char == '[':
+            return self.array()
+        if char == '"':
+            result, self.pos = self.decoder.raw_decode(self.text, self.pos)
+            return result
+        match = self.NUMBER.match(self.text, self.pos)
+        if match:
+            self.pos = match.end()
+            return json.loads(match.group(0))
+        match = self.IDENTIFIER.match(self.text, self.pos)
+        if match and match.group(0) in self.CONSTANTS:
+            self.pos = match.end()
+            return self.CONSTANTS[match.group(0)]
+        raise ValueError(f"Unexpected input at offset {self.pos}")
+
+    def object(self) -> Dict:
+        result = {}
+        self.expect('{')
+        while self.peek() != '}':
+            if self.peek() == '"':
+                key, self.pos = self.decoder.raw_decode(self.text, self.pos)
+            else:
+                match = self.IDENTIFIER.match(self.text, self.pos)
+                if not match:
+                    raise ValueError(f"Expected key at offset {self.pos}")
+                key, self.pos = match.group(0), match.end()
+            self.expect(':')
+            result[key] = self.value()
+            if self.peek() == ',':
+                self.pos += 1
+        self.expect('}')
+        return result
+
+    def array(self) -> List:
+        result = []
+        self.expect('[')
+        while self.peek() != ']':
+            result.append(self.value())
+            if self.peek() == ',':
+                self.pos += 1
+        self.expect(']')
+        return result
+
+def parse_js_bundle(js_code: str) -> Dict:
+    """Read the pfeqCurriculum object back out of a generated bundle"""
+    match = re.search(r'pfeqCurriculum\s*=', js_code)
+    if not match:
+        raise ValueError("No pfeqCurriculum assignment found")
+    parser = _JSLiteralParser(js_code)
+    parser.pos = match.end()
+    return parser.value()
+
+def bundle_to_curriculum(bundle: Dict) -> Dict:
+    """Convert a bundle back into the pipeline's subject -> grade -> data tree"""
+    curriculum = {}
+    for subject, subject_data in bundle.get('subjects', {}).items():
+        curriculum[subject] = {}
+        for grade, data in subject_data.get('grades', {}).items():
+            competencies = []
+            for comp in data.get('competencies', []):
+                entry = dict(comp)
+                entry['learningObjectives'] = list(comp.get('learningObjectives', []))
+                competencies.append(entry)
+
+            topics = []
+            for topic in data.get('topics', []):
+                entry = dict(topic)
+                entry['concepts'] = list(topic.get('concepts', []))
+                entry['learningObjectives'] = list(topic.get('learningObjectives', []))
+                if 'progression' in topic:
+                    entry['progression'] = {
+                        'buildsOn': list(topic['progression'].get('buildsOn', [])),
+                        'preparesFor': list(topic['progression'].get('preparesFor', []))
+                    }
+                topics.append(entry)
+
+            curriculum[subject][grade] = {
+                'competencies': competencies,
+                'topics': topics,
+                'crossCurricularCompetencies': list(data.get('crossCurricularCompetencies', [])),
+                'broadAreasOfLearning': list(data.get('broadAreasOfLearning', [])),
+                'subjectThemes': list(data.get('subjectThemes', []))
+            }
+    return curriculum
+
+def load_curriculum_json(json_file: Path) -> Dict:
+    """Load pfeq_curriculum_data.json as a subject -> grade -> data tree"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return bundle_to_curriculum(json.load(f))
+
+def verify_round_trip(bundle: Dict):
+    """Check that every output format carries exactly the same data"""
+    expected = json.loads(json.dumps(bundle))
+    for output_format in ('pretty', 'min'):
+        if parse_js_bundle(format_bundle(bundle, output_format)) != expected:
+            raise ValueError(f"Bundle does not round-trip through the {output_format} format")
+    if json.loads(format_json(bundle)) != expected:
+        raise ValueError("Bundle does not round-trip through JSON")
+    if build_bundle(bundle_to_curriculum(expected)) != expected:
+        raise ValueError("Bundle does not round-trip through load_curriculum_json")
+
+def content_hash(data: bytes, length: int = 10) -> str:
+    """Short content hash used in cache-busting filenames"""
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def write_if_changed(path: Path, content) -> bool:
+    """Write content unless the file already holds identical bytes; return whether it was written"""
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    if path.exists() and path.stat().st_size == len(data):
+        if content_hash(path.read_bytes()) == content_hash(data):
+            return False
+    path.write_bytes(data)
+    return True
+
+def write_compressed_siblings(path: Path, data: bytes, warn: bool = True) -> List[Path]:
+    """Write .gz (and, with brotli installed, .br) copies of data next to path"""
+    # mtime=0 keeps the .gz byte-identical across runs with the same content
+    gz_file = path.with_name(path.name + '.gz')
+    write_if_changed(gz_file, gzip.compress(data, compresslevel=9, mtime=0))
+    written = [gz_file]
+
+    if brotli is not None:
+        br_file = path.with_name(path.name + '.br')
+        write_if_changed(br_file, brotli.compress(data, quality=11))
+        written.append(br_file)
+    elif warn:
+        print("  brotli not installed - skipping .br output")
+
+    return written
+
+def hashed_name(path: Path, data: bytes) -> Path:
+    """path with the content hash of data inserted before the suffix"""
+    return path.with_name(f'{path.stem}.{content_hash(data)}{path.suffix}')
+
+def write_precompressed(output_file: Path, content: str) -> List[Path]:
+    """Write a content-hashed copy of the output plus .gz and .br siblings"""
+    data = content.encode('utf-8')
+    hashed_file = hashed_name(output_file, data)
+    write_if_changed(hashed_file, data)
+    return [hashed_file] + write_compressed_siblings(hashed_file, data)
+
+def version_file_for(output_file: Path) -> Path:
+    """Location of the version stamp written next to a bundle"""
+    return output_file.with_name(f'{output_file.stem}.version.json')
+
+def write_delta_patch(previous_bundle: Dict, bundle: Dict, version: str, patch_file: Path) -> Optional[str]:
+    """Write the patch from the previous bundle to this one
+
+    Returns the version the patch applies to, or None when no patch was
+    written (same data, or a patch not worth shipping).
+    """
+    previous_version = content_hash(format_json(previous_bundle).encode('utf-8'))
+    if previous_version == version:
+        return None
+    patch = diff_bundles(previous_bundle, bundle, previous_version, version)
+    json_code = format_json(bundle)
+    if format_json(apply_patch(previous_bundle, patch)) != json_code:
+        print("  [WARNING] Delta patch does not reproduce the bundle - not written")
+        return None
+    patch_json = format_json(patch)
+    if len(patch_json) > MAX_PATCH_SHARE * len(json_code):
+        return None
+    write_if_changed(patch_file, patch_json)
+    print(f"  Delta patch {previous_version} -> {version}: {patch_file.name} ({len(patch_json):,} bytes)")
+    return previous_version
+
+def write_bundle(bundle: Dict, output_file: Path, output_format: str = 'pretty',
+                 precompress: bool = False) -> Dict:
+    """Write a bundle to output_file (plus its .json sibling), skipping files whose content is unchanged
+
+    Returns {'code', 'version', 'script', 'search', 'changed'}. The version is a hash
+    of the canonical JSON, which the builder caches the data under; script is
+    a hash of the JavaScript file actually written, which the builder loads it
+    with as ?v=, so switching --format changes the URL even when the data does
+    not. search is the hash of the search index file, fetched the same way.
+    The stamp file is only rewritten when one of them changes. When the data
+    changed, a delta patch from the previous .json is written alongside and
+    named in the stamp, so a client on the previous version can update cheaply.
+    """
+    output_file = Path(output_file)
+    json_file = output_file.with_suffix('.json')
+    version_file = version_file_for(output_file)
+    json_code = format_json(bundle)
+    version = content_hash(json_code.encode('utf-8'))
+    js_code = format_bundle(bundle, output_format, json_name=json_file.name, version=version)
+    script_version = content_hash(js_code.encode('utf-8'))
+    search_file = search_file_for(output_file)
+    search_code = format_json(bundle_search_index(bundle))
+    search_version = content_hash(search_code.encode('utf-8'))
+
+    previous_bundle = None
+    if json_file.exists():
+        try:
+            previous_bundle = json.loads(json_file.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    changed = write_if_changed(json_file, json_code)
+    changed = write_if_changed(output_file, js_code) or changed
+    changed = write_if_changed(search_file, search_code) or changed
+
+    previous_stamp = {}
+    if version_file.exists():
+        try:
+            previous_stamp = json.loads(version_file.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError):
+            pass
+    if (previous_stamp.get('version') != version or previous_stamp.get('script') != script_version
+            or previous_stamp.get('search') != search_version):
+        stamp = {'version': version, 'script': script_version, 'search': search_version,
+                 'updated': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+        patch_file = patch_file_for(output_file)
+        if previous_stamp.get('version') == version:
+            # Only the format changed: the patch to this data version still applies
+            if previous_stamp.get('patch') and patch_file.exists():
+                stamp['patch'] = previous_stamp['patch']
+        else:
+            patch_from = write_delta_patch(previous_bundle, bundle, version, patch_file) if previous_bundle else None
+            if patch_from:
+                stamp['patch'] = {'from': patch_from, 'file': patch_file.name}
+            elif patch_file.exists():
+                patch_file.unlink()
+        version_file.write_text(json.dumps(stamp) + '\n', encoding='utf-8')
+
+    if changed:
+        print(f"  Curriculum data version: {version}")
+    else:
+        print(f"  Unchanged (version {version}) - nothing written")
+
+    if precompress:
+        written = write_precompressed(output_file, js_code)
+        if output_format == 'json':
+            written += write_precompressed(json_file, json_code)
+        written += write_precompressed(search_file, search_code)
+        for path in written:
+            print(f"  Precompressed: {path.name} ({path.stat().st_size:,} bytes)")
+
+    return {'code': js_code, 'version': version, 'script': script_version, 'search': search_version,
+            'changed': changed}
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Curriculum Delta Patches
+Structural diff between two curriculum bundles, so a client holding version
+N-1 can fetch a small patch instead of the whole pfeq_curriculum_data bundle.
+
+A patch mirrors the bundle's shape. Every object level is a "map patch":
+    {"remove": [keys], "set": {key: new value}, "patch": {key: nested patch},
+     "order": [keys]}
+with each part present only when needed ("order" only when the key order
+is not old keys minus removed plus new keys appended). Competency and topic
+lists are patched as maps keyed by competency ID (or name) and topic name;
+every other list is replaced whole. Applying a patch reproduces the new
+bundle exactly, key order included, so its canonical JSON hashes to the new
+version.
+
+    python curriculum_delta.py old.json new.json
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PATCH_FORMAT = 1
+# Lists patched item by item, and how their items are keyed
+KEYED_LISTS = {
+    'competencies': lambda comp: comp.get('id') or comp.get('name'),
+    'topics': lambda topic: topic.get('name'),
+}
+# A patch not at least this much smaller than the full bundle is not worth fetching
+MAX_PATCH_SHARE = 0.5
+
+def _size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')))
+
+def _same(a, b) -> bool:
+    """Equal including key order (dict == ignores order, the canonical JSON does not)"""
+    return a == b and json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False)
+
+def _diff_map(old: Dict, new: Dict,
+              diff_value: Optional[Callable[[str, object, object], Optional[Dict]]] = None) -> Optional[Dict]:
+    """Map patch turning old into new (None if they are equal)"""
+    patch = {}
+    removed = [key for key in old if key not in new]
+    replaced = {}
+    nested = {}
+    for key, value in new.items():
+        if key in old and _same(old[key], value):
+            continue
+        sub = diff_value(key, old[key], value) if key in old and diff_value else None
+        # Only nest when the nested patch is actually smaller than the value
+        if sub is not None and _size(sub) < _size(value):
+            nested[key] = sub
+        else:
+            replaced[key] = value
+    if removed:
+        patch['remove'] = removed
+    if replaced:
+        patch['set'] = replaced
+    if nested:
+        patch['patch'] = nested
+    default_order = [key for key in old if key in new] + [key for key in new if key not in old]
+    if list(new) != default_order:
+        patch['order'] = list(new)
+    return patch or None
+
+def _apply_map(old: Dict, patch: Dict,
+               apply_value: Optional[Callable[[str, object, Dict], object]] = None) -> Dict:
+    removed = set(patch.get('remove', []))
+    result = {key: value for key, value in old.items() if key not in removed}
+    for key, sub in patch.get('patch', {}).items():
+        result[key] = apply_value(key, result[key], sub)
+    for key, value in patch.get('set', {}).items():
+        result[key] = value
+    if 'order' in patch:
+        result = {key: result[key] for key in patch['order']}
+    return result
+
+def _keyed(field: str, items: List[Dict]) -> Optional[Dict]:
+    """List as an ordered key -> item map, or None if the keys are not unique"""
+    key_of = KEYED_LISTS[field]
+    mapping = {}
+    for item in items:
+        key = key_of(item) if isinstance(item, dict) else None
+        if not isinstance(key, str) or key in mapping:
+            return None
+        mapping[key] = item
+    return mapping
+
+def _diff_tree(key: str, old, new) -> Optional[Dict]:
+    """Nested map patch for plain dicts (lists are replaced)"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        return _diff_map(old, new, _diff_tree)
+    return None
+
+def _apply_tree(key: str, old, patch: Dict):
+    return _apply_map(old, patch, _apply_tree)
+
+def _diff_grade_field(field: str, old, new) -> Optional[Dict]:
+    if field not in KEYED_LISTS:
+        return None
+    old_map, new_map = _keyed(field, old), _keyed(field, new)
+    if old_map is None or new_map is None:
+        return None
+    return _diff_map(old_map, new_map)
+
+def _apply_grade_field(field: str, old: List, patch: Dict) -> List:
+    return list(_apply_map(_keyed(field, old), patch).values())
+
+def _diff_grade(grade: str, old: Dict, new: Dict) -> Optional[Dict]:
+    return _diff_map(old, new, _diff_grade_field)
+
+def _apply_grade(grade: str, old: Dict, patch: Dict) -> Dict:
+    return _apply_map(old, patch, _apply_grade_field)
+
+def _diff_subject(subject: str, old: Dict, new: Dict) -> Optional[Dict]:
+    return _diff_map(old, new, lambda key, o, n: _diff_map(o, n, _diff_grade) if key == 'grades' else None)
+
+def _apply_subject(subject: str, old: Dict, patch: Dict) -> Dict:
+    return _apply_map(old, patch, lambda key, o, p: _apply_map(o, p, _apply_grade) if key == 'grades' else None)
+
+def _diff_bundle_field(key: str, old, new) -> Optional[Dict]:
+    if key == 'subjects':
+        return _diff_map(old, new, _diff_subject)
+    return _diff_tree(key, old, new)
+
+def _apply_bundle_field(key: str, old, patch: Dict):
+    if key == 'subjects':
+        return _apply_map(old, patch, _apply_subject)
+    return _apply_tree(key, old, patch)
+
+def diff_bundles(old: Dict, new: Dict, from_version: str, to_version: str) -> Dict:
+    """Patch turning bundle old (from_version) into bundle new (to_version)"""
+    return {
+        'format': PATCH_FORMAT,
+        'from': from_version,
+        'to': to_version,
+        'changes': _diff_map(old, new, _diff_bundle_field) or {}
+    }
+
+def apply_patch(bundle: Dict, patch: Dict) -> Dict:
+    """Apply a patch from diff_bundles to the bundle it was computed against"""
+    if patch.get('format') != PATCH_FORMAT:
+        raise ValueError(f"Unsupported patch format: {patch.get('format')}")
+    return _apply_map(bundle, patch['changes'], _apply_bundle_field)
+
+def patch_file_for(output_file: Path) -> Path:
+    """Location of the delta patch written next to a bundle"""
+    return output_file.with_name(f'{output_file.stem}.patch.json')
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("Usage: python curriculum_delta.py old.json new.json")
+        sys.exit(1)
+    sys.path.insert(0, str(Path(__file__).parent))
+    from curriculum_bundle import content_hash, format_json
+
+    old_bundle, new_bundle = (json.loads(Path(p).read_text(encoding='utf-8')) for p in sys.argv[1:])
+    old_version = content_hash(format_json(old_bundle).encode('utf-8'))
+    new_version = content_hash(format_json(new_bundle).encode('utf-8'))
+    patch = diff_bundles(old_bundle, new_bundle, old_version, new_version)
+    if format_json(apply_patch(old_bundle, patch)) != format_json(new_bundle):
+        print("[ERROR] Patch does not reproduce the new bundle")
+        sys.exit(1)
+    print(json.dumps(patch, indent=2, ensure_ascii=False))
+    print(f"\n{old_version} -> {new_version}: patch {_size(patch):,} bytes, "
+          f"full bundle {_size(new_bundle):,} bytes", file=sys.stderr)
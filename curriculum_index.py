@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Curriculum Matching Thresholds
+The keyword and prefix lengths the rubric builder's live validation matches
+criteria against. The builder derives its matching index once per grade, the
+first time that grade is matched (buildGradeMatchIndex), rather than loading
+it from the bundle, where it would repeat most of the curriculum text; the
+Python tools that score criteria the same way share these thresholds.
+"""
+
+# Same thresholds as matchCriterionToCurriculum / calculateGradeSpecificCoverage
+KEYWORD_MIN_LENGTH = 5          # JS: words.filter(w => w.length > 4)
+TOPIC_PREFIX_LENGTH = 15        # JS: topic.name.toLowerCase().substring(0, 15)
+OBJECTIVE_PREFIX_LENGTH = 10    # JS: obj.toLowerCase().substring(0, 10)
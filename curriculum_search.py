@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Curriculum Search Index
+Precomputes a sorted-prefix index over the accent-folded words of every topic
+name, competency name and learning objective, so the rubric builder's
+curriculum search (and tooling) can autocomplete with a binary search instead
+of scanning every subject and grade on each keystroke.
+
+The index is array-backed and stores references into the bundle's subjects
+tree rather than copies of the text. It is written next to the bundle as
+pfeq_curriculum_data.search.json rather than inside it, so a curriculum edit
+does not put the whole renumbered index into the delta patch; the builder
+fetches it the first time the search box is used. Entries are stored in
+ranking order, so a lookup only resolves the few entries it returns:
+
+    grades:       [[subject, grade], ...]
+    entries:      [kind, grade ref, item, objective, ...]  (4 numbers per entry)
+    words:        sorted unique folded words
+    offsets:      entries containing words[w] are postings[offsets[w]:offsets[w + 1]]
+    postings:     entry numbers, ascending per word
+    leadOffsets:  entries whose first word is words[w] are leadPostings[leadOffsets[w]:leadOffsets[w + 1]]
+    leadPostings: entry numbers, ascending per word
+
+    python curriculum_search.py photosynth
+    python curriculum_search.py "ecrire texte" --subject French --grade "Secondary 1" --limit 5
+"""
+
+import re
+import sys
+import json
+import argparse
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# Entry kinds, in ranking order; item is the topic or competency index and
+# objective the index in its learningObjectives (-1 for names)
+KINDS = ('topic', 'competency', 'topicObjective', 'competencyObjective')
+ENTRY_SIZE = 4
+LIGATURES = str.maketrans({'œ': 'oe', 'æ': 'ae', 'ß': 'ss'})
+WORD = re.compile(r'[a-z0-9]+')
+MIN_WORD_LENGTH = 2     # single letters (l', d') only add noise
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents, as the builder's foldSearchText does"""
+    text = unicodedata.normalize('NFD', text.lower())
+    text = ''.join(char for char in text if not '\u0300' <= char <= '\u036f')
+    return text.translate(LIGATURES)
+
+def search_words(text: str) -> List[str]:
+    return [word for word in WORD.findall(fold(text)) if len(word) >= MIN_WORD_LENGTH]
+
+def _grade_entries(data: Dict) -> Iterable:
+    """(kind, item, objective, text) for one grade, skipping repeated objectives of an item"""
+    for topic_index, topic in enumerate(data.get('topics', [])):
+        if isinstance(topic, str):
+            topic = {'name': topic}
+        yield 0, topic_index, -1, topic['name']
+        seen = set()
+        for obj_index, obj in enumerate(topic.get('learningObjectives', [])):
+            if obj not in seen:
+                seen.add(obj)
+                yield 2, topic_index, obj_index, obj
+    for comp_index, comp in enumerate(data.get('competencies', [])):
+        yield 1, comp_index, -1, comp.get('name', '')
+        seen = set()
+        for obj_index, obj in enumerate(comp.get('learningObjectives', [])):
+            if obj not in seen:
+                seen.add(obj)
+                yield 3, comp_index, obj_index, obj
+
+def search_file_for(output_file: Path) -> Path:
+    """Location of the search index written next to a bundle"""
+    return output_file.with_name(f'{output_file.stem}.search.json')
+
+def _postings(words: List[str], word_entries: Dict[str, List[int]]):
+    offsets = [0]
+    postings = []
+    for word in words:
+        postings.extend(word_entries.get(word, []))
+        offsets.append(len(postings))
+    return offsets, postings
+
+def build_search_index(curriculum: Dict) -> Dict:
+    """Build the search index for a subject -> grade -> data curriculum tree
+
+    Grades are numbered in the bundle's (sorted) order, and items by their
+    position in the grade's topics and competencies arrays. Entries are
+    numbered by rank: kind, then shorter text, then curriculum order.
+    """
+    grades = []
+    found = []
+    for subject, subject_grades in sorted(curriculum.items()):
+        for grade, data in sorted(subject_grades.items()):
+            grade_ref = len(grades)
+            grades.append([subject, grade])
+            for kind, item, objective, text in _grade_entries(data):
+                rank = (kind, len(text), grade_ref, len(found))
+                found.append((rank, (kind, grade_ref, item, objective), text))
+    found.sort(key=lambda entry: entry[0])
+
+    entries = []
+    word_entries = {}
+    lead_entries = {}
+    for number, (_, entry, text) in enumerate(found):
+        entries.extend(entry)
+        text_words = search_words(text)
+        for word in dict.fromkeys(text_words):
+            word_entries.setdefault(word, []).append(number)
+        if text_words:
+            lead_entries.setdefault(text_words[0], []).append(number)
+
+    words = sorted(word_entries)
+    offsets, postings = _postings(words, word_entries)
+    lead_offsets, lead_postings = _postings(words, lead_entries)
+    return {
+        'grades': grades,
+        'entries': entries,
+        'words': words,
+        'offsets': offsets,
+        'postings': postings,
+        'leadOffsets': lead_offsets,
+        'leadPostings': lead_postings
+    }
+
+def bundle_search_index(bundle: Dict) -> Dict:
+    """Build the search index for a bundle (its grade data has the fields the index reads)"""
+    return build_search_index({subject: data['grades'] for subject, data in bundle['subjects'].items()})
+
+class CurriculumSearch:
+    """Prefix lookups over a bundle's search index"""
+
+    def __init__(self, bundle: Dict, index: Optional[Dict] = None):
+        self.subjects = bundle['subjects']
+        if index is None:
+            # No search file next to the bundle: index it here
+            index = bundle_search_index(bundle)
+        self.grades = index['grades']
+        self.entries = index['entries']
+        self.words = index['words']
+        self.offsets = index['offsets']
+        self.postings = index['postings']
+        self.lead_offsets = index['leadOffsets']
+        self.lead_postings = index['leadPostings']
+
+    @classmethod
+    def load(cls, path: Path) -> 'CurriculumSearch':
+        """From pfeq_curriculum_data.json or a generated .js bundle, with the search file beside it"""
+        path = Path(path)
+        text = path.read_text(encoding='utf-8')
+        if path.suffix == '.js':
+            from curriculum_bundle import parse_js_bundle
+            bundle = parse_js_bundle(text)
+        else:
+            bundle = json.loads(text)
+        search_file = search_file_for(path)
+        index = json.loads(search_file.read_text(encoding='utf-8')) if search_file.exists() else None
+        return cls(bundle, index)
+
+    def word_range(self, prefix: str) -> range:
+        """Positions in words of every word starting with prefix"""
+        first = bisect_left(self.words, prefix)
+        last = bisect_left(self.words, prefix + '\uffff', first)
+        return range(first, last)
+
+    def matching_entries(self, prefix: str, lead: bool = False) -> Set[int]:
+        """Entries with a word (or, with lead, a first word) starting with prefix"""
+        postings, offsets = (self.lead_postings, self.lead_offsets) if lead else (self.postings, self.offsets)
+        found = set()
+        for w in self.word_range(prefix):
+            found.update(postings[offsets[w]:offsets[w + 1]])
+        return found
+
+    def entry(self, number: int) -> Dict:
+        """An entry resolved against the subjects tree"""
+        kind, grade_ref, item, objective = self.entries[number * ENTRY_SIZE:(number + 1) * ENTRY_SIZE]
+        subject, grade = self.grades[grade_ref]
+        data = self.subjects[subject]['grades'][grade]
+        result = {'kind': KINDS[kind], 'subject': subject, 'grade': grade}
+        if kind in (0, 2):
+            topic = data['topics'][item]
+            result['topic'] = topic['name']
+            result['text'] = topic['learningObjectives'][objective] if kind == 2 else topic['name']
+        else:
+            comp = data['competencies'][item]
+            result['competency'] = comp['name']
+            if comp.get('id'):
+                result['competencyId'] = comp['id']
+            result['text'] = comp['learningObjectives'][objective] if kind == 3 else comp['name']
+        return result
+
+    def complete(self, query: str, subject: Optional[str] = None, grade: Optional[str] = None,
+                 kinds: Optional[Iterable[str]] = None, limit: int = 10) -> List[Dict]:
+        """Entries containing a word starting with each word of the query
+
+        Entries whose text starts with the query come first, then topics,
+        competencies and objectives in that order, shorter texts first.
+        """
+        words = search_words(query)
+        if not words:
+            return []
+        found = None
+        # Longest words first: they have the fewest matches to intersect
+        for word in sorted(set(words), key=len, reverse=True):
+            matches = self.matching_entries(word)
+            found = matches if found is None else found & matches
+            if not found:
+                return []
+
+        allowed = {KINDS.index(kind) for kind in kinds} if kinds else None
+        entries, grades = self.entries, self.grades
+        ranked = []
+        for number in sorted(found):
+            kind, grade_ref = entries[number * ENTRY_SIZE], entries[number * ENTRY_SIZE + 1]
+            if subject and grades[grade_ref][0] != subject or grade and grades[grade_ref][1] != grade:
+                continue
+            if allowed is None or kind in allowed:
+                ranked.append(number)
+
+        # Entry numbers already rank by kind and length; texts that start with
+        # the query go first, and only entries whose first word matches can
+        leading = self.matching_entries(words[0], lead=True)
+        folded_query = fold(query).strip()
+        results = []
+        taken = set()
+        for number in ranked:
+            if len(results) == limit:
+                break
+            if number in leading:
+                entry = self.entry(number)
+                if fold(entry['text']).startswith(folded_query):
+                    results.append(entry)
+                    taken.add(number)
+        for number in ranked:
+            if len(results) == limit:
+                break
+            if number not in taken:
+                results.append(self.entry(number))
+        return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Autocomplete topics, competencies and objectives')
+    parser.add_argument('query', help='words or word beginnings to look up (accents optional)')
+    parser.add_argument('--data', type=Path, default=Path(__file__).parent / 'pfeq_curriculum_data.js',
+                        help='curriculum bundle (.js) or pfeq_curriculum_data.json')
+    parser.add_argument('--subject', help='only this subject')
+    parser.add_argument('--grade', help='only this grade')
+    parser.add_argument('--kind', nargs='+', choices=KINDS, help='only these kinds of entry')
+    parser.add_argument('--limit', type=int, default=10, help='results to show (default: 10)')
+    args = parser.parse_args()
+
+    try:
+        search = CurriculumSearch.load(args.data)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[ERROR] {args.data}: {e}")
+        sys.exit(1)
+    results = search.complete(args.query, args.subject, args.grade, args.kind, args.limit)
+    if not results:
+        print(f"No matches for '{args.query}'")
+    for result in results:
+        where = result.get('topic') or result.get('competency')
+        context = f" ({where})" if result['text'] != where else ''
+        print(f"  [{result['kind']}] {result['subject']} / {result['grade']}: {result['text']}{context}")
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Local Curriculum Server
+Small asyncio HTTP/1.1 server for running the teacher tool on localhost. It
+serves the pages and the curriculum bundle (dist/ when a static build exists,
+otherwise the source folder) with ETags and gzip, and exposes the builder
+state kept in builder_store as a JSON API:
+
+    GET    /api/state                      every collection at once
+    GET    /api/<name>                     one collection or document
+    GET    /api/<name>?field=value         indexed lookup (field=low..high for a range)
+    PUT    /api/<name>                     replace a collection or document
+    GET    /api/<name>/<id>                one item
+    PUT    /api/<name>/<id>                insert or replace one item
+    DELETE /api/<name>/<id>                remove one item
+
+    python curriculum_server.py --port 8000
+"""
+
+import sys
+import gzip
+import json
+import asyncio
+import argparse
+import traceback
+import mimetypes
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+from curriculum_bundle import content_hash
+from builder_store import COLLECTIONS, DOCUMENTS, STORE_FILE, BuilderStore
+from build_static_assets import ASSETS_DIR, CACHE_IMMUTABLE, CACHE_REVALIDATE, CACHE_VERSIONED, DIST_DIR, SOURCE_DIR
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+MAX_BODY_BYTES = 32 * 1024 * 1024
+IDLE_TIMEOUT = 60           # seconds a keep-alive connection may sit idle
+GZIP_MIN_BYTES = 1024
+COMPRESSIBLE = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+# Only web files are served, so pointing --root at the source folder does not expose the state store
+SERVED_SUFFIXES = ('.html', '.js', '.css', '.json', '.svg', '.png', '.ico', '.webmanifest', '.txt')
+
+mimetypes.add_type('text/javascript', '.js')
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str = ''):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+class Request:
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        self.headers = headers
+        self.body = body
+        parts = urlsplit(target)
+        self.path = unquote(parts.path)
+        self.query = dict(parse_qsl(parts.query))
+
+    def json(self):
+        try:
+            return json.loads(self.body.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f'invalid JSON body: {e}')
+
+    def accepts_gzip(self) -> bool:
+        return 'gzip' in self.headers.get('accept-encoding', '')
+
+class Response:
+    def __init__(self, status: HTTPStatus, body: bytes = b'', headers: Optional[Dict[str, str]] = None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Next request on the connection, or None once the client closed it"""
+    line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode('latin-1').split(' ', 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'malformed request line')
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+    if length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, 'invalid Content-Length')
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+    body = await reader.readexactly(length) if length else b''
+    return Request(method.upper(), target, headers, body)
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    candidates = request.headers.get('if-none-match', '')
+    return any(tag.strip().lstrip('W/') in (etag, '*') for tag in candidates.split(','))
+
+def representation(request: Request, data: bytes, content_type: str, cache_control: str,
+                   gzipped: Optional[bytes] = None, etag: Optional[str] = None) -> Response:
+    """200 (gzip when the client accepts it and it helps) or 304 when the client's copy is current"""
+    etag = etag or f'"{content_hash(data, 16)}"'
+    compressible = content_type.startswith(COMPRESSIBLE) and len(data) >= GZIP_MIN_BYTES
+    use_gzip = request.accepts_gzip() and (gzipped is not None or compressible)
+    if use_gzip:
+        etag = etag[:-1] + '-gz"'
+    headers = {'ETag': etag, 'Cache-Control': cache_control, 'Vary': 'Accept-Encoding'}
+    if _etag_matches(request, etag):
+        return Response(HTTPStatus.NOT_MODIFIED, headers=headers)
+    if use_gzip:
+        data = gzipped if gzipped is not None else gzip.compress(data, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+    headers['Content-Type'] = content_type
+    return Response(HTTPStatus.OK, data, headers)
+
+def json_response(request: Request, value, status: HTTPStatus = HTTPStatus.OK) -> Response:
+    data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if status != HTTPStatus.OK:
+        return Response(status, data, {'Content-Type': 'application/json; charset=utf-8'})
+    return representation(request, data, 'application/json; charset=utf-8', CACHE_REVALIDATE)
+
+class StaticFiles:
+    """Files under root, cached in memory until their mtime or size changes"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root).resolve()
+        self._cache: Dict[Path, Tuple[Tuple[int, int], bytes, Optional[bytes], str, str]] = {}
+
+    def _load(self, path: Path):
+        """(stamp, data, gzipped data or None, ETag, content type), compressed once per file version"""
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached
+        data = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+        if content_type.startswith('text/') or content_type in ('application/json', 'application/javascript'):
+            content_type += '; charset=utf-8'
+        gzipped = None
+        gz_file = path.with_name(path.name + '.gz')
+        # A precompressed sibling from build_static_assets, if it is at least as new
+        if gz_file.exists() and gz_file.stat().st_mtime_ns >= stat.st_mtime_ns:
+            gzipped = gz_file.read_bytes()
+        elif content_type.startswith(COMPRESSIBLE) and len(data) >= GZIP_MIN_BYTES:
+            gzipped = gzip.compress(data, compresslevel=9, mtime=0)
+        entry = (stamp, data, gzipped, f'"{content_hash(data, 16)}"', content_type)
+        self._cache[path] = entry
+        return entry
+
+    def serve(self, request: Request) -> Response:
+        relative = request.path.lstrip('/')
+        if not relative or relative.endswith('/'):
+            relative += 'index.html'
+        path = (self.root / relative).resolve()
+        if self.root not in path.parents or path.suffix not in SERVED_SUFFIXES or not path.is_file():
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+        _, data, gzipped, etag, content_type = self._load(path)
+
+        if relative.startswith(ASSETS_DIR + '/'):
+            cache_control = CACHE_IMMUTABLE
+        elif 'v' in request.query:
+            cache_control = CACHE_VERSIONED
+        else:
+            cache_control = CACHE_REVALIDATE
+        return representation(request, data, content_type, cache_control, gzipped, etag)
+
+class CurriculumServer:
+    """Routes requests to the JSON API or the static files"""
+
+    def __init__(self, root: Path, store: BuilderStore):
+        self.static = StaticFiles(root)
+        self.store = store
+
+    def api(self, request: Request, name: str, item_id: Optional[str]) -> Response:
+        store = self.store
+        if name == 'state' and item_id is None and request.method == 'GET':
+            return json_response(request, store.state())
+        if item_id is None:
+            if request.method == 'GET':
+                lookups = [(field, value) for field, value in request.query.items()
+                           if field in COLLECTIONS.get(name, ())]
+                if lookups:
+                    field, value = lookups[0]
+                    if '..' in value:
+                        low, high = value.split('..', 1)
+                        return json_response(request, store.find(name, field, low=low or None, high=high or None))
+                    return json_response(request, store.find(name, field, value))
+                return json_response(request, store.get(name))
+            if request.method == 'PUT':
+                store.replace(name, request.json())
+                return json_response(request, store.get(name))
+        elif name not in DOCUMENTS:
+            if request.method == 'GET':
+                item = store.get_item(name, item_id)
+                if item is None:
+                    raise HTTPError(HTTPStatus.NOT_FOUND)
+                return json_response(request, item)
+            if request.method == 'PUT':
+                return json_response(request, store.put_item(name, item_id, request.json()))
+            if request.method == 'DELETE':
+                if not store.delete_item(name, item_id):
+                    raise HTTPError(HTTPStatus.NOT_FOUND)
+                return Response(HTTPStatus.NO_CONTENT)
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+    def handle(self, request: Request) -> Response:
+        try:
+            if request.path.startswith('/api/'):
+                parts = [part for part in request.path[len('/api/'):].split('/') if part]
+                if not 1 <= len(parts) <= 2:
+                    raise HTTPError(HTTPStatus.NOT_FOUND)
+                try:
+                    return self.api(request, parts[0], parts[1] if len(parts) == 2 else None)
+                except KeyError:
+                    raise HTTPError(HTTPStatus.NOT_FOUND, f'unknown collection or field: {parts[0]}')
+                except ValueError as e:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+            if request.method not in ('GET', 'HEAD'):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+            return self.static.serve(request)
+        except HTTPError as e:
+            return self._error(e.status, str(e))
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            # Store errors (sqlite3.Error) and bugs: answer 500 rather than dropping the connection
+            print(f"[ERROR] {request.method} {request.path}: {e!r}", file=sys.stderr)
+            traceback.print_exc()
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, 'internal server error')
+
+    @staticmethod
+    def _error(status: HTTPStatus, message: str) -> Response:
+        return Response(status, json.dumps({'error': message}).encode('utf-8'),
+                        {'Content-Type': 'application/json; charset=utf-8'})
+
+    async def connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except HTTPError as e:
+                    writer.write(self._encode(self._error(e.status, str(e)), 'GET', False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                response = self.handle(request)
+                keep_alive = request.headers.get('connection', '').lower() != 'close'
+                writer.write(self._encode(response, request.method, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            print(f"[ERROR] connection: {e!r}", file=sys.stderr)
+            traceback.print_exc()
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _encode(response: Response, method: str, keep_alive: bool) -> bytes:
+        headers = dict(response.headers)
+        headers['Content-Length'] = str(len(response.body))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = [f'HTTP/1.1 {response.status.value} {response.status.phrase}']
+        head += [f'{name}: {value}' for name, value in headers.items()]
+        data = ('\r\n'.join(head) + '\r\n\r\n').encode('latin-1')
+        if method != 'HEAD' and response.status not in (HTTPStatus.NO_CONTENT, HTTPStatus.NOT_MODIFIED):
+            data += response.body
+        return data
+
+async def start_server(root: Path, store: BuilderStore, host: str = DEFAULT_HOST,
+                       port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+    """Start serving in the running event loop (port 0 picks a free port)"""
+    app = CurriculumServer(root, store)
+    return await asyncio.start_server(app.connection, host, port)
+
+async def serve_forever(root: Path, store_file: Path, host: str, port: int):
+    with BuilderStore(store_file) as store:
+        server = await start_server(root, store, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"[SERVE] http://{address[0]}:{address[1]}/ from {root} (state in {store_file.name}) - Ctrl+C to stop")
+        async with server:
+            await server.serve_forever()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve the teacher tool and its state API on localhost')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--root', type=Path, default=DIST_DIR if DIST_DIR.exists() else SOURCE_DIR,
+                        help='folder to serve (default: dist/ when built, else the source folder)')
+    parser.add_argument('--store', type=Path, default=STORE_FILE, help='SQLite builder state file')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve_forever(args.root, args.store, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n[SERVE] Stopped")
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Curriculum Snapshot Store
+Keeps the merged curriculum tree of every pipeline run, for auditing old
+rubrics against the curriculum as it was when they were written. Trees are
+stored as content-addressed nodes (one per competency, topic, grade, subject
+and root), so a run that only changed one grade adds a handful of nodes and
+shares everything else with earlier snapshots.
+
+    python curriculum_snapshots.py list
+    python curriculum_snapshots.py show 3
+    python curriculum_snapshots.py diff 2 latest
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SNAPSHOT_DIR = Path(__file__).parent / 'pfeq_snapshots'
+LIST_FIELDS = ('crossCurricularCompetencies', 'broadAreasOfLearning', 'subjectThemes')
+
+def _canonical(node) -> bytes:
+    return json.dumps(node, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def competency_key(comp: Dict) -> str:
+    return comp.get('id') or comp.get('name', '')
+
+def topic_key(topic) -> str:
+    return topic if isinstance(topic, str) else topic.get('name', '')
+
+class SnapshotStore:
+    """Content-addressed node store plus an append-only log of snapshots
+
+    objects/<2>/<62>.json holds each node under the SHA-256 of its JSON;
+    snapshots.jsonl has one {number, root, created, label} line per commit.
+    """
+
+    def __init__(self, directory: Path = SNAPSHOT_DIR):
+        self.directory = Path(directory)
+        self.objects_dir = self.directory / 'objects'
+        self.log_path = self.directory / 'snapshots.jsonl'
+        self._cache: Dict[str, object] = {}
+
+    # -- nodes ---------------------------------------------------------------
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f'{digest[2:]}.json'
+
+    def put(self, node) -> str:
+        """Store a node (if new) and return its hash"""
+        data = _canonical(node)
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._cache:
+            path = self._object_path(digest)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix('.tmp')
+                tmp.write_bytes(data)
+                tmp.replace(path)
+            self._cache[digest] = node
+        return digest
+
+    def get(self, digest: str):
+        """Load a node by hash (cached in memory)"""
+        if digest not in self._cache:
+            self._cache[digest] = json.loads(self._object_path(digest).read_bytes())
+        return self._cache[digest]
+
+    def _put_grade(self, data: Dict) -> str:
+        node = {
+            'competencies': [self.put(comp) for comp in data.get('competencies', [])],
+            'topics': [self.put(topic) for topic in data.get('topics', [])],
+        }
+        for field in LIST_FIELDS:
+            node[field] = list(data.get(field, []))
+        return self.put(node)
+
+    def _put_tree(self, curriculum: Dict) -> str:
+        subjects = {}
+        for subject, grades in sorted(curriculum.items()):
+            subjects[subject] = self.put({'grades': {grade: self._put_grade(data)
+                                                     for grade, data in sorted(grades.items())}})
+        return self.put({'subjects': subjects})
+
+    # -- snapshots -----------------------------------------------------------
+
+    def snapshots(self) -> List[Dict]:
+        if not self.log_path.exists():
+            return []
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def commit(self, curriculum: Dict, label: str = '') -> Dict:
+        """Record a curriculum tree as a new snapshot and return its log entry"""
+        root = self._put_tree(curriculum)
+        history = self.snapshots()
+        entry = {
+            'number': len(history) + 1,
+            'root': root,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'label': label
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        unchanged = bool(history) and history[-1]['root'] == root
+        print(f"  Snapshot {entry['number']} ({root[:10]}){' - unchanged since last run' if unchanged else ''}")
+        return entry
+
+    def resolve(self, ref) -> Dict:
+        """Snapshot by number, 'latest', negative offset (-1 = latest) or root hash prefix"""
+        history = self.snapshots()
+        if not history:
+            raise KeyError('no snapshots recorded yet')
+        ref = str(ref)
+        if ref == 'latest':
+            return history[-1]
+        if ref.lstrip('-').isdigit():
+            number = int(ref)
+            index = number if number < 0 else number - 1
+            # Numbers start at 1: 0 would otherwise wrap round to the latest
+            if number != 0 and -len(history) <= index < len(history):
+                return history[index]
+            raise KeyError(f'no snapshot {ref}')
+        matches = {entry['root']: entry for entry in history if entry['root'].startswith(ref)}
+        if len(matches) != 1:
+            raise KeyError(f'{ref!r} matches {len(matches)} snapshot trees')
+        return next(entry for entry in reversed(history) if entry['root'] in matches)
+
+    def checkout(self, ref) -> Dict:
+        """The subject -> grade -> data tree of a snapshot"""
+        root = self.get(self.resolve(ref)['root'])
+        curriculum = {}
+        for subject, subject_hash in root['subjects'].items():
+            curriculum[subject] = {}
+            for grade, grade_hash in self.get(subject_hash)['grades'].items():
+                node = self.get(grade_hash)
+                data = {
+                    'competencies': [self.get(h) for h in node['competencies']],
+                    'topics': [self.get(h) for h in node['topics']],
+                }
+                for field in LIST_FIELDS:
+                    data[field] = list(node[field])
+                curriculum[subject][grade] = data
+        return curriculum
+
+    # -- comparison ----------------------------------------------------------
+
+    def _keyed_hashes(self, hashes: List[str], key_of) -> Dict[str, str]:
+        return {key_of(self.get(h)): h for h in hashes}
+
+    def _compare_items(self, old: List[str], new: List[str], key_of) -> Dict[str, List[str]]:
+        if old == new:
+            return {}
+        old_keyed = self._keyed_hashes(old, key_of)
+        new_keyed = self._keyed_hashes(new, key_of)
+        changes = {
+            'added': [k for k in new_keyed if k not in old_keyed],
+            'removed': [k for k in old_keyed if k not in new_keyed],
+            'changed': [k for k in new_keyed if k in old_keyed and old_keyed[k] != new_keyed[k]],
+        }
+        return {kind: keys for kind, keys in changes.items() if keys}
+
+    def _compare_grade(self, old_hash: str, new_hash: str) -> Dict:
+        old, new = self.get(old_hash), self.get(new_hash)
+        changes = {}
+        competencies = self._compare_items(old['competencies'], new['competencies'], competency_key)
+        if competencies:
+            changes['competencies'] = competencies
+        topics = self._compare_items(old['topics'], new['topics'], topic_key)
+        if topics:
+            changes['topics'] = topics
+        for field in LIST_FIELDS:
+            if old[field] != new[field]:
+                changes[field] = {
+                    'added': [v for v in new[field] if v not in old[field]],
+                    'removed': [v for v in old[field] if v not in new[field]],
+                }
+        return changes
+
+    def compare(self, ref_a, ref_b) -> Dict:
+        """What changed from snapshot a to snapshot b
+
+        Subtrees with the same hash are identical and skipped without being
+        loaded, so comparing mostly-unchanged snapshots touches few nodes.
+        """
+        a, b = self.resolve(ref_a), self.resolve(ref_b)
+        result = {'from': a['number'], 'to': b['number'], 'subjects': {}}
+        if a['root'] == b['root']:
+            return result
+        old_subjects = self.get(a['root'])['subjects']
+        new_subjects = self.get(b['root'])['subjects']
+        for subject in sorted(set(old_subjects) | set(new_subjects)):
+            old_hash, new_hash = old_subjects.get(subject), new_subjects.get(subject)
+            if old_hash == new_hash:
+                continue
+            if old_hash is None or new_hash is None:
+                result['subjects'][subject] = 'added' if old_hash is None else 'removed'
+                continue
+            old_grades, new_grades = self.get(old_hash)['grades'], self.get(new_hash)['grades']
+            grades = {}
+            for grade in sorted(set(old_grades) | set(new_grades)):
+                old_grade, new_grade = old_grades.get(grade), new_grades.get(grade)
+                if old_grade == new_grade:
+                    continue
+                if old_grade is None or new_grade is None:
+                    grades[grade] = 'added' if old_grade is None else 'removed'
+                else:
+                    grades[grade] = self._compare_grade(old_grade, new_grade)
+            result['subjects'][subject] = grades
+        return result
+
+    def stats(self) -> Tuple[int, int]:
+        """(number of stored nodes, bytes they occupy)"""
+        files = list(self.objects_dir.glob('*/*.json')) if self.objects_dir.exists() else []
+        return len(files), sum(f.stat().st_size for f in files)
+
+def commit_snapshot(curriculum: Dict, label: str = '', directory: Path = SNAPSHOT_DIR) -> Optional[Dict]:
+    """Pipeline hook: record the run's merged curriculum, never failing the run over it"""
+    try:
+        return SnapshotStore(directory).commit(curriculum, label)
+    except (OSError, ValueError, TypeError) as e:
+        # TypeError: a value json cannot serialize
+        print(f"  [WARNING] Could not record curriculum snapshot: {e}")
+        return None
+
+def _print_comparison(comparison: Dict):
+    print(f"Snapshot {comparison['from']} -> {comparison['to']}")
+    if not comparison['subjects']:
+        print("  No changes")
+    for subject, grades in comparison['subjects'].items():
+        if isinstance(grades, str):
+            print(f"  {subject}: {grades}")
+            continue
+        for grade, changes in grades.items():
+            if isinstance(changes, str):
+                print(f"  {subject} - {grade}: {changes}")
+                continue
+            print(f"  {subject} - {grade}:")
+            for field, kinds in changes.items():
+                for kind, items in kinds.items():
+                    for item in items:
+                        print(f"      {field} {kind}: {item}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect recorded curriculum snapshots')
+    parser.add_argument('--dir', type=Path, default=SNAPSHOT_DIR, help='snapshot store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='list snapshots')
+    show = commands.add_parser('show', help='print a snapshot as JSON')
+    show.add_argument('ref')
+    diff = commands.add_parser('diff', help='compare two snapshots')
+    diff.add_argument('old')
+    diff.add_argument('new', nargs='?', default='latest')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.dir)
+    try:
+        if args.command == 'list':
+            for entry in store.snapshots():
+                print(f"  {entry['number']:4d}  {entry['root'][:10]}  {entry['created']}  {entry['label']}")
+            nodes, size = store.stats()
+            print(f"\n{len(store.snapshots())} snapshot(s), {nodes} stored node(s), {size:,} bytes")
+        elif args.command == 'show':
+            print(json.dumps(store.checkout(args.ref), indent=2, ensure_ascii=False))
+        else:
+            _print_comparison(store.compare(args.old, args.new))
+    except KeyError as e:
+        print(f"[ERROR] {e.args[0]}")
+        sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
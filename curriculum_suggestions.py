@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Curriculum Suggestion Index
+Precomputes, for every subject/grade/topic, the criterion suggestions the
+rubric builder offers (getCompetencySuggestions, getLearningObjectiveSuggestions
+and generateCriteriaFromObjectives), already matched, ranked and
+deduplicated, so a selection change is a lookup instead of re-matching every
+competency against the topic's objectives.
+
+Suggestions are stored as indexes into the grade's own lists, which the
+bundle already carries, to keep the bundle small:
+
+    topics[t] = {
+        groups: [[competency index, [topic objective indexes], [competency objective indexes]], ...],
+        objectives: [topic objective indexes]
+    }
+"""
+
+from typing import Dict, List, Union
+
+from curriculum_index import KEYWORD_MIN_LENGTH
+
+def _topic_objectives(topic: Union[str, Dict]) -> List[str]:
+    return [] if isinstance(topic, str) else list(topic.get('learningObjectives', []))
+
+def _unique_indexes(items: List[str]) -> List[int]:
+    """Index of the first occurrence of each distinct item"""
+    seen = set()
+    indexes = []
+    for index, item in enumerate(items):
+        if item not in seen:
+            seen.add(item)
+            indexes.append(index)
+    return indexes
+
+def build_topic_suggestions(grade_data: Dict, topic: Union[str, Dict]) -> Dict:
+    """Suggestion groups for one topic
+
+    A topic objective belongs to a competency when it contains any word of
+    the competency name longer than four letters, as the builder matched
+    them. Within a group the topic's objectives come first, most matching
+    words first, then the competency's own objectives not already
+    suggested; groups with more matching words rank first. Ties keep
+    curriculum order.
+    """
+    objectives = _topic_objectives(topic)
+    objective_indexes = _unique_indexes(objectives)
+    lowered = [obj.lower() for obj in objectives]
+
+    groups = []
+    for comp_index, comp in enumerate(grade_data.get('competencies', [])):
+        keywords = [kw for kw in comp.get('name', '').lower().split(' ') if len(kw) >= KEYWORD_MIN_LENGTH]
+        scored = []
+        for index in objective_indexes:
+            matches = sum(1 for kw in keywords if kw in lowered[index])
+            if matches:
+                scored.append((matches, index))
+        scored.sort(key=lambda item: -item[0])
+        topic_matches = [index for _, index in scored]
+
+        comp_objectives = list(comp.get('learningObjectives', []))
+        suggested = {objectives[index] for index in topic_matches}
+        own = [index for index in _unique_indexes(comp_objectives) if comp_objectives[index] not in suggested]
+        if topic_matches or own:
+            groups.append((sum(matches for matches, _ in scored), [comp_index, topic_matches, own]))
+
+    groups.sort(key=lambda item: -item[0])
+    return {
+        'groups': [group for _, group in groups],
+        'objectives': objective_indexes
+    }
+
+def build_suggestion_index(curriculum: Dict) -> Dict:
+    """Suggestions for every topic of a subject -> grade -> data curriculum tree
+
+    topics[t] lines up with the grade's topics array in the bundle.
+    """
+    grades = {}
+    for subject, subject_grades in sorted(curriculum.items()):
+        for grade, data in sorted(subject_grades.items()):
+            grades.setdefault(subject, {})[grade] = {
+                'topics': [build_topic_suggestions(data, topic) for topic in data.get('topics', [])]
+            }
+    return {'grades': grades}
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Curriculum Watch Mode
+Monitors the PFEQ folders and regenerates pfeq_curriculum_data.js as PDFs
+are added, replaced or removed. Uses inotify where available (Linux) and
+falls back to cheap mtime/size polling elsewhere. Bursts of file events are
+debounced, only added or changed documents are re-extracted, and the parsed
+data of every document stays in memory between rebuilds.
+"""
+
+import os
+import sys
+import time
+import select
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from extract_pfeq_data import PARALLEL_PAGE_THRESHOLD, merge_curriculum_data
+from curriculum_bundle import build_bundle, write_bundle
+from text_corpus import TextCorpus
+from curriculum_snapshots import commit_snapshot
+from build_static_assets import refresh_static_build
+from extraction_watchdog import DOCUMENT_TIME_BUDGET, process_pdf_with_watchdog, write_quarantine_report
+
+POLL_INTERVAL = 2.0         # seconds between folder scans without inotify
+DEBOUNCE_SECONDS = 1.5      # quiet time required before a rebuild
+MAX_DEBOUNCE_SECONDS = 30   # rebuild anyway if events keep coming this long
+
+# inotify(7) event masks
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+def scan_pdfs(folders: List[Path]) -> Dict[Path, Tuple[int, int]]:
+    """(mtime, size) of every PDF in the folders"""
+    stamps = {}
+    for folder in folders:
+        if not folder.exists():
+            continue
+        for pdf_file in folder.glob('*.pdf'):
+            try:
+                stat = pdf_file.stat()
+            except OSError:
+                continue
+            stamps[pdf_file] = (stat.st_mtime_ns, stat.st_size)
+    return stamps
+
+class InotifyWaiter:
+    """Blocks until a watched folder reports a file event"""
+
+    def __init__(self, folders: List[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        watched = 0
+        for folder in folders:
+            if folder.exists() and libc.inotify_add_watch(self.fd, os.fsencode(folder), WATCH_MASK) >= 0:
+                watched += 1
+        if not watched:
+            os.close(self.fd)
+            raise OSError('none of the folders could be watched')
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """True if events arrived within timeout (None waits indefinitely)"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWaiter:
+    """Rescans the folders every POLL_INTERVAL seconds and reports when anything changed"""
+
+    def __init__(self, folders: List[Path], interval: float = POLL_INTERVAL):
+        self.folders = folders
+        self.interval = interval
+        self.last = scan_pdfs(folders)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            pause = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if pause <= 0:
+                return False
+            time.sleep(pause)
+            current = scan_pdfs(self.folders)
+            if current != self.last:
+                self.last = current
+                return True
+
+    def close(self):
+        pass
+
+def make_waiter(folders: List[Path], poll_interval: float = POLL_INTERVAL):
+    """inotify waiter on Linux, polling waiter everywhere else (or if inotify is unavailable)"""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWaiter(folders)
+        except (OSError, AttributeError) as e:
+            print(f"[WATCH] inotify unavailable ({e}), polling every {poll_interval:g}s")
+    return PollingWaiter(folders, poll_interval)
+
+class CurriculumWatcher:
+    """In-memory extraction state for the watched folders"""
+
+    def __init__(self, folders: List[Path], output_file: Path, output_format: str = 'pretty',
+                 precompress: bool = False, budget: float = DOCUMENT_TIME_BUDGET,
+                 page_threshold: int = PARALLEL_PAGE_THRESHOLD):
+        self.folders = folders
+        self.output_file = output_file
+        self.output_format = output_format
+        self.precompress = precompress
+        self.budget = budget
+        self.page_threshold = page_threshold
+        self.corpus = TextCorpus()
+        self.stamps: Dict[Path, Tuple[int, int]] = {}
+        self.documents: Dict[Path, List[Dict]] = {}
+        self.quarantine: Dict[Path, List[Dict]] = {}
+
+    def sync(self) -> bool:
+        """Re-extract added/changed PDFs, forget removed ones and rebuild; False if nothing changed"""
+        start = time.perf_counter()
+        current = scan_pdfs(self.folders)
+        changed = sorted(p for p, stamp in current.items() if self.stamps.get(p) != stamp)
+        removed = sorted(p for p in self.stamps if p not in current)
+        if not changed and not removed:
+            return False
+
+        for pdf_file in changed:
+            status = 'Changed' if pdf_file in self.stamps else 'Added'
+            print(f"  [{status}] {pdf_file.name}")
+            entries = []
+            self.documents[pdf_file] = process_pdf_with_watchdog(
+                pdf_file, entries, budget=self.budget, corpus=self.corpus,
+                page_threshold=self.page_threshold)
+            self.quarantine[pdf_file] = entries
+        for pdf_file in removed:
+            print(f"  [Removed] {pdf_file.name}")
+            self.documents.pop(pdf_file, None)
+            self.quarantine.pop(pdf_file, None)
+        self.stamps = current
+
+        write_quarantine_report([entry for entries in self.quarantine.values() for entry in entries])
+        self.rebuild(time.perf_counter() - start)
+        return True
+
+    def rebuild(self, extract_seconds: float = 0.0):
+        """Regenerate the bundle from the parsed data held in memory"""
+        all_parsed_data = [item for items in self.documents.values() for item in items]
+        if not all_parsed_data:
+            print("[WATCH] No curriculum data extracted yet - nothing written")
+            return
+        start = time.perf_counter()
+        curriculum = merge_curriculum_data(all_parsed_data)
+        bundle = build_bundle(curriculum)
+        result = write_bundle(bundle, self.output_file, output_format=self.output_format,
+                              precompress=self.precompress)
+        elapsed = extract_seconds + time.perf_counter() - start
+        label = 'UPDATED' if result['changed'] else 'UNCHANGED'
+        print(f"[{label}] {self.output_file.name} version {result['version']} "
+              f"({len(self.documents)} PDFs, {elapsed:.1f}s)")
+        commit_snapshot(curriculum, label='watch')
+        refresh_static_build()
+
+    def close(self):
+        self.corpus.close()
+
+def watch_folders(folders: List[Path], output_file: Path, output_format: str = 'pretty',
+                  precompress: bool = False, budget: float = DOCUMENT_TIME_BUDGET,
+                  page_threshold: int = PARALLEL_PAGE_THRESHOLD,
+                  poll_interval: float = POLL_INTERVAL):
+    """Build once, then rebuild whenever the folders settle after a change (until Ctrl+C)"""
+    watcher = CurriculumWatcher(folders, output_file, output_format, precompress, budget, page_threshold)
+    waiter = make_waiter(folders, poll_interval)
+    print(f"[WATCH] Watching {len(folders)} folder(s) with {type(waiter).__name__} - Ctrl+C to stop")
+    try:
+        if not watcher.sync():
+            print("[WATCH] No PDFs found yet")
+        while True:
+            waiter.wait()
+            # Debounce: let a burst of copies finish before re-extracting
+            deadline = time.monotonic() + MAX_DEBOUNCE_SECONDS
+            while time.monotonic() < deadline and waiter.wait(DEBOUNCE_SECONDS):
+                pass
+            watcher.sync()
+    except KeyboardInterrupt:
+        print("\n[WATCH] Stopped")
+    finally:
+        waiter.close()
+        watcher.close()
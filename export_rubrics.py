@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Bulk Rubric Exporter
+Renders every saved rubric for every class section in one run, as the same
+HTML document the builder's Export button downloads plus a CSV copy, into a
+single zip archive. The export template is compiled once per worker process
+and documents are rendered in parallel, with per-document timings reported
+and stored in the archive.
+
+    python export_rubrics.py savedRubrics.json --sections 601 602 603 -o term1-rubrics.zip
+    python export_rubrics.py savedRubrics.json --students students.json -o term1-rubrics.zip
+    python export_rubrics.py --store builder_state.sqlite3 --workers 4
+"""
+
+import io
+import os
+import re
+import csv
+import sys
+import json
+import html
+import time
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from saved_rubrics import load_saved_rubrics
+
+ARCHIVE_FILE = 'rubric-export.zip'
+TIMINGS_NAME = 'export-timings.csv'
+CHUNK_SIZE = 32             # documents per worker task
+
+# The builder's exportRubric page, with the class section under the title
+EXPORT_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{title}}</title>
+    <style>
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            max-width: 1200px;
+            margin: 40px auto;
+            padding: 20px;
+            background: #f5f5f5;
+        }
+        .rubric-container {
+            background: white;
+            padding: 30px;
+            border-radius: 10px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        h1 {
+            text-align: center;
+            color: #333;
+            border-bottom: 3px solid #667eea;
+            padding-bottom: 15px;
+            margin-bottom: 15px;
+        }
+        .section {
+            text-align: center;
+            color: #667eea;
+            font-weight: 600;
+            margin-bottom: 10px;
+        }
+        .task-desc {
+            text-align: center;
+            color: #666;
+            margin-bottom: 30px;
+            font-style: italic;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 20px;
+        }
+        th {
+            background: #667eea;
+            color: white;
+            padding: 15px;
+            text-align: center;
+            font-weight: 600;
+        }
+        td {
+            padding: 15px;
+            border: 1px solid #e0e0e0;
+            vertical-align: top;
+        }
+        tr:nth-child(even) {
+            background: #f8f9fa;
+        }
+        @media print {
+            body { background: white; margin: 0; padding: 10px; }
+        }
+    </style>
+</head>
+<body>
+    <div class="rubric-container">
+        <h1>{{title}}</h1>
+        {{section}}
+        <div class="task-desc">{{taskDescription}}</div>
+        <table>
+            <thead>
+                <tr>
+                    <th style="width: 20%;">Criteria</th>
+                    {{levelHeaders}}
+                </tr>
+            </thead>
+            <tbody>
+                {{criteriaRows}}
+            </tbody>
+        </table>
+    </div>
+</body>
+</html>
+"""
+
+PLACEHOLDER = re.compile(r'\{\{(\w+)\}\}')
+
+def compile_template(template: str) -> Callable[[Dict[str, str]], str]:
+    """Split the template into literal parts and field names once; rendering is then a join"""
+    parts = PLACEHOLDER.split(template)
+    literals, fields = parts[0::2], parts[1::2]
+
+    def render(values: Dict[str, str]) -> str:
+        out = [literals[0]]
+        for field, literal in zip(fields, literals[1:]):
+            out.append(values[field])
+            out.append(literal)
+        return ''.join(out)
+    return render
+
+def rubric_slug(title: str) -> str:
+    """File name stem the builder uses for a downloaded rubric"""
+    return re.sub(r'[^a-z0-9]', '_', title, flags=re.IGNORECASE).lower() or 'rubric'
+
+def _level_names(rubric: Dict) -> List[str]:
+    names = list(rubric.get('levelNames') or [])
+    count = int(rubric.get('numLevels') or len(names) or 4)
+    return (names + [f'Level {n + 1}' for n in range(len(names), count)])[:count]
+
+def render_html(render: Callable, rubric: Dict, section: Optional[str]) -> str:
+    escape = html.escape
+    levels = _level_names(rubric)
+    rows = []
+    for criterion in rubric.get('criteria') or []:
+        descriptors = list(criterion.get('descriptors') or [])[:len(levels)]
+        descriptors += [''] * (len(levels) - len(descriptors))
+        cells = ''.join(f'<td>{escape(d or "")}</td>' for d in descriptors)
+        rows.append(f'<tr><td><strong>{escape(criterion.get("name", ""))}</strong></td>{cells}</tr>')
+    return render({
+        'title': escape(rubric.get('title', '')),
+        'section': f'<div class="section">{escape(section)}</div>' if section else '',
+        'taskDescription': escape(rubric.get('taskDescription', '')),
+        'levelHeaders': ''.join(f'<th>{escape(name)}</th>' for name in levels),
+        'criteriaRows': ''.join(rows)
+    })
+
+def render_csv(rubric: Dict, section: Optional[str]) -> str:
+    levels = _level_names(rubric)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow([rubric.get('title', '')] + ([section] if section else []))
+    writer.writerow(['Criteria'] + levels)
+    for criterion in rubric.get('criteria') or []:
+        descriptors = list(criterion.get('descriptors') or [])[:len(levels)]
+        writer.writerow([criterion.get('name', '')] + [d or '' for d in descriptors] +
+                        [''] * (len(levels) - len(descriptors)))
+    return out.getvalue()
+
+# -- workers -------------------------------------------------------------------
+
+_worker_rubrics: List[Dict] = []
+_worker_render: Optional[Callable] = None
+
+def _init_worker(rubrics: List[Dict], template: str):
+    """Each worker receives the library and compiles the template once"""
+    global _worker_rubrics, _worker_render
+    _worker_rubrics = rubrics
+    _worker_render = compile_template(template)
+
+def _render_chunk(jobs: List[Tuple[int, Optional[str], str]]) -> List[Tuple[str, bytes, bytes, float]]:
+    """Render (rubric index, section, archive stem) jobs; returns stem, HTML, CSV and seconds per document"""
+    results = []
+    for index, section, stem in jobs:
+        start = time.perf_counter()
+        rubric = _worker_rubrics[index]
+        page = render_html(_worker_render, rubric, section).encode('utf-8')
+        table = render_csv(rubric, section).encode('utf-8-sig')
+        results.append((stem, page, table, time.perf_counter() - start))
+    return results
+
+def plan_exports(rubrics: List[Dict], sections: List[str]) -> List[Tuple[int, Optional[str], str]]:
+    """One job per rubric and section, with unique archive paths"""
+    jobs = []
+    used = set()
+    for section in sections or [None]:
+        folder = f"{rubric_slug(section)}/" if section else ''
+        for index, rubric in enumerate(rubrics):
+            stem = f"{folder}{rubric_slug(rubric.get('title', ''))}_rubric"
+            if stem in used:
+                stem = f"{stem}_{rubric_slug(str(rubric.get('id', index)))}"
+            # Sections or ids can slug alike ("60 1" and "60_1"): count up until the name is free
+            base, count = stem, 2
+            while stem in used:
+                stem = f"{base}_{count}"
+                count += 1
+            used.add(stem)
+            jobs.append((index, section, stem))
+    return jobs
+
+def export_rubrics(rubrics: List[Dict], sections: List[str], archive_file: Path,
+                   workers: int = 0) -> List[Tuple[str, float, int]]:
+    """Render every job into archive_file; returns (document, seconds, bytes) per document"""
+    jobs = plan_exports(rubrics, sections)
+    chunks = [jobs[i:i + CHUNK_SIZE] for i in range(0, len(jobs), CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    timings = []
+
+    def store(archive: zipfile.ZipFile, results):
+        for stem, page, table, seconds in results:
+            archive.writestr(f'{stem}.html', page)
+            archive.writestr(f'{stem}.csv', table)
+            timings.append((stem, seconds, len(page) + len(table)))
+
+    tmp = archive_file.with_suffix(archive_file.suffix + '.tmp')
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_DEFLATED) as archive:
+        if workers == 1 or len(chunks) <= 1:
+            _init_worker(rubrics, EXPORT_TEMPLATE)
+            for chunk in chunks:
+                store(archive, _render_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(rubrics, EXPORT_TEMPLATE)) as pool:
+                for results in pool.map(_render_chunk, chunks):
+                    store(archive, results)
+
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(['document', 'milliseconds', 'bytes'])
+        writer.writerows((stem, f'{seconds * 1000:.3f}', size) for stem, seconds, size in timings)
+        archive.writestr(TIMINGS_NAME, out.getvalue())
+    tmp.replace(archive_file)
+    return timings
+
+def sections_from_state(data: Dict) -> List[str]:
+    """Every class section named by the students (or, failing that, the assignments) of a state dump"""
+    students = data.get('students') or []
+    if isinstance(students, str):
+        students = json.loads(students)
+    assignments = data.get('assignments') or []
+    if isinstance(assignments, str):
+        assignments = json.loads(assignments)
+    sections = {section for student in students for section in student.get('classSections') or []}
+    if not sections:
+        sections = {a['classPeriod'] for a in assignments if a.get('classPeriod')}
+    return sorted(sections)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export every saved rubric for every class section')
+    parser.add_argument('rubrics', nargs='*', type=Path,
+                        help='exported savedRubrics JSON files or folders of them')
+    parser.add_argument('--store', type=Path, help='read rubrics and sections from the builder state store')
+    parser.add_argument('--sections', nargs='+', help='class sections to export for')
+    parser.add_argument('--students', type=Path,
+                        help='students JSON or localStorage dump whose class sections to export for')
+    parser.add_argument('-o', '--output', type=Path, default=Path(ARCHIVE_FILE), help='zip archive to write')
+    parser.add_argument('--workers', type=int, default=0, help='worker processes (default: one per CPU)')
+    args = parser.parse_args()
+    if not args.rubrics and not args.store:
+        parser.error('give rubric files or --store')
+
+    rubrics = load_saved_rubrics(args.rubrics)
+    sections = list(args.sections or [])
+    try:
+        if args.store:
+            from builder_store import BuilderStore
+            with BuilderStore(args.store) as store:
+                rubrics += [r for r in store.get('savedRubrics') if isinstance(r, dict)]
+                if not sections:
+                    sections = sections_from_state({'students': store.get('students'),
+                                                    'assignments': store.get('assignments')})
+        if args.students and not args.sections:
+            data = json.loads(args.students.read_text(encoding='utf-8'))
+            sections = sections_from_state({'students': data} if isinstance(data, list) else data)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    if not rubrics:
+        print("[ERROR] No saved rubrics found")
+        sys.exit(1)
+
+    print(f"Exporting {len(rubrics)} rubric(s) for {len(sections) or 'no'} section(s)")
+    start = time.perf_counter()
+    timings = export_rubrics(rubrics, sections, args.output, args.workers)
+    elapsed = time.perf_counter() - start
+
+    seconds = sorted(t for _, t, _ in timings)
+    slowest = max(timings, key=lambda timing: timing[1])
+    print(f"[OK] {len(timings):,} documents (HTML + CSV) in {elapsed:.2f}s "
+          f"({len(timings) / max(elapsed, 1e-9):,.0f} documents/s)")
+    print(f"  Per document: median {seconds[len(seconds) // 2] * 1000:.2f} ms, "
+          f"p95 {seconds[int(len(seconds) * 0.95)] * 1000:.2f} ms, "
+          f"slowest {slowest[1] * 1000:.2f} ms ({slowest[0]})")
+    print(f"  Archive saved to: {args.output} ({args.output.stat().st_size:,} bytes, timings in {TIMINGS_NAME})")
@@ -9,8 +9,9 @@ import re
 import json
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-import pdfplumber
-import pypdf
+
+from curriculum_bundle import build_bundle, format_bundle
+from text_corpus import pages_to_text
 
 # Subject name mappings from filenames
 SUBJECT_MAPPINGS = {
@@ -44,29 +45,92 @@ GRADE_PATTERNS = [
     (r'cycle2|cycle\s*2|deuxieme\s*cycle|deuxieme-cycle', 'Secondary 4'),
 ]
 
-def extract_pdf_text(pdf_path: Path) -> str:
-    """Extract text from a PDF file using pdfplumber (better for complex layouts)"""
+# Documents longer than this are split into page ranges extracted in parallel
+PARALLEL_PAGE_THRESHOLD = 120
+PAGES_PER_CHUNK = 30
+
+def _exit_with_parent():
+    """Pool initializer: end this worker if the process that started it dies (e.g. killed by the watchdog)"""
+    import threading
+    import multiprocessing
+    import multiprocessing.connection
+    parent = multiprocessing.parent_process()
+    if parent is None:
+        return
+
+    def watch():
+        multiprocessing.connection.wait([parent.sentinel])
+        os._exit(1)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+def _extract_page_indices(pdf_path: Path, indices: List[int]) -> List[str]:
+    """Extract the given 0-based pages with pdfplumber (also runs in pool workers)"""
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in indices]
+
+def _count_pages(pdf_path: Path) -> int:
+    import pypdf
+    with open(pdf_path, 'rb') as file:
+        return len(pypdf.PdfReader(file).pages)
+
+def extract_pdf_pages(pdf_path: Path, page_threshold: int = PARALLEL_PAGE_THRESHOLD,
+                      workers: Optional[int] = None,
+                      page_indices: Optional[List[int]] = None) -> List[str]:
+    """Extract the text of each page using pdfplumber (better for complex layouts)
+
+    With page_indices only those 0-based pages are extracted; the others come
+    back as empty strings so page numbers still line up. When more than
+    page_threshold pages are to be extracted they are split into chunks for a
+    process pool and reassembled in page order (0 disables splitting).
+    """
     try:
-        text = ""
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text
+        page_count = _count_pages(pdf_path)
+        if page_indices is None:
+            indices = list(range(page_count))
+        else:
+            indices = sorted({i for i in page_indices if 0 <= i < page_count})
+        workers = workers or os.cpu_count() or 1
+
+        if page_threshold and len(indices) > page_threshold and workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            chunks = [indices[start:start + PAGES_PER_CHUNK]
+                      for start in range(0, len(indices), PAGES_PER_CHUNK)]
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                                     initializer=_exit_with_parent) as pool:
+                texts = [text for chunk in pool.map(_extract_page_indices, [pdf_path] * len(chunks), chunks)
+                         for text in chunk]
+        else:
+            texts = _extract_page_indices(pdf_path, indices)
+
+        pages = [""] * page_count
+        for i, text in zip(indices, texts):
+            pages[i] = text
+        return pages
     except Exception as e:
         print(f"Error extracting from {pdf_path.name} with pdfplumber: {e}")
         # Fallback to pypdf
-        try:
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = pypdf.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
-        except Exception as e2:
-            print(f"Error extracting from {pdf_path.name} with pypdf: {e2}")
-            return ""
+        return extract_pdf_pages_basic(pdf_path)
+
+def extract_pdf_pages_basic(pdf_path: Path) -> List[str]:
+    """Extract the text of each page using pypdf only (no layout analysis, more robust)"""
+    try:
+        import pypdf
+        with open(pdf_path, 'rb') as file:
+            pdf_reader = pypdf.PdfReader(file)
+            return [page.extract_text() or "" for page in pdf_reader.pages]
+    except Exception as e2:
+        print(f"Error extracting from {pdf_path.name} with pypdf: {e2}")
+        return []
+
+def extract_pdf_text(pdf_path: Path) -> str:
+    """Extract text from a PDF file using pdfplumber (better for complex layouts)"""
+    return pages_to_text(extract_pdf_pages(pdf_path))
+
+def extract_pdf_text_basic(pdf_path: Path) -> str:
+    """Extract text from a PDF file using pypdf only (no layout analysis, more robust)"""
+    return ''.join(page + "\n" for page in extract_pdf_pages_basic(pdf_path))
 
 def identify_subject_grade(filename: str, text: str) -> Tuple[Optional[str], List[str]]:
     """Identify subject and grade from filename and/or text"""
@@ -221,74 +285,85 @@ def identify_subject_grade(filename: str, text: str) -> Tuple[Optional[str], Lis
     
     return subject, grades_list
 
+# Competency parsing patterns (compiled once; extract_competencies is a single pass)
+COMPETENCY_ID_RE = re.compile(r'([A-Z]{2,4})-(\d+)-(\d+)')  # e.g. HCE-4-1, GEO-2-1, ST-1-1
+COMPETENCY_ID_ONLY_RE = re.compile(r'^[A-Z]+-\d+-\d+$')
+OBJECTIVES_HEADER_RE = re.compile(r'learning\s+objectives?|objectifs?\s+d\'apprentissage|objectifs?\s+dapprentissage', re.IGNORECASE)
+OBJECTIVE_ITEM_RE = re.compile(r'^[-•\d]+[\.\)]\s*(.+)$')
+BULLET_START_RE = re.compile(r'^[-•\d]')
+NAME_LOOKAHEAD_LINES = 5      # the name follows the ID within this many lines
+OBJECTIVE_WINDOW_LINES = 20   # bullets this close to the ID are taken as its objectives
+
 def extract_competencies(text: str) -> List[Dict]:
-    """Extract competencies from text"""
+    """Extract competencies and their learning objectives in one pass over the lines
+
+    Each competency ID starts a new competency. Until its name is found (on
+    the ID line or within NAME_LOOKAHEAD_LINES lines) the parser is waiting
+    for a name; bullet items within OBJECTIVE_WINDOW_LINES lines of the ID,
+    or anywhere after a "learning objectives" header, become its objectives.
+    """
     competencies = []
-    
-    # Pattern for competency IDs (e.g., HCE-4-1, GEO-2-1, ST-1-1)
-    competency_id_pattern = r'([A-Z]{2,4})-(\d+)-(\d+)'
-    
-    lines = text.split('\n')
     current_competency = None
+    current_line = 0
+    seen_objectives = set()
+    awaiting_name = False
     collecting_objectives = False
     
-    for i, line in enumerate(lines):
+    for i, line in enumerate(text.split('\n')):
+        if awaiting_name and i - current_line > NAME_LOOKAHEAD_LINES:
+            awaiting_name = False
+        
         line_clean = line.strip()
         if not line_clean:
             continue
         
         # Check for competency ID
-        id_match = re.search(competency_id_pattern, line_clean)
+        id_match = COMPETENCY_ID_RE.search(line_clean)
         if id_match:
-            if current_competency and current_competency.get('name'):
+            if current_competency:
                 competencies.append(current_competency)
             
-            # Look for competency name in current and next few lines
+            # ID and name may share the line
             name = ""
-            # Check current line
-            if len(line_clean) > 20 and not re.match(r'^[A-Z]+-\d+-\d+$', line_clean):
-                # Might be ID and name on same line
-                parts = re.split(competency_id_pattern, line_clean, maxsplit=1)
-                if len(parts) > 3:
-                    potential_name = parts[-1].strip()
-                    if len(potential_name) > 10:
-                        name = potential_name
-            
-            # Check next few lines for name
-            if not name:
-                for j in range(i+1, min(i+6, len(lines))):
-                    next_line = lines[j].strip()
-                    if next_line and len(next_line) > 15 and len(next_line) < 200:
-                        # Not just an ID, not a bullet point, reasonable length
-                        if not re.match(r'^[-•\d]', next_line) and not re.search(competency_id_pattern, next_line):
-                            name = next_line
-                            break
+            if len(line_clean) > 20 and not COMPETENCY_ID_ONLY_RE.match(line_clean):
+                potential_name = line_clean[id_match.end():].strip()
+                if len(potential_name) > 10:
+                    name = potential_name
             
             current_competency = {
                 'id': id_match.group(0),
                 'name': name or f"Competency {id_match.group(3)}",
                 'learningObjectives': []
             }
+            current_line = i
+            seen_objectives = set()
+            awaiting_name = not name
             collecting_objectives = False
             continue
         
-        # If we have a competency, look for learning objectives
-        if current_competency:
-            # Look for section headers that indicate objectives
-            if re.search(r'learning\s+objectives?|objectifs?\s+d\'apprentissage|objectifs?\s+dapprentissage', line_clean, re.IGNORECASE):
-                collecting_objectives = True
-                continue
-            
-            # Collect objectives (usually bullet points or numbered)
-            if collecting_objectives or i < 20:  # First 20 lines after competency likely contain objectives
-                obj_match = re.match(r'^[-•\d]+[\.\)]\s*(.+)$', line_clean)
-                if obj_match:
-                    obj_text = obj_match.group(1).strip()
-                    if len(obj_text) > 15 and len(obj_text) < 300:  # Reasonable length
-                        if obj_text not in current_competency['learningObjectives']:
-                            current_competency['learningObjectives'].append(obj_text)
+        if not current_competency:
+            continue
+        
+        # First reasonable non-bullet line after the ID is the name
+        if awaiting_name and 15 < len(line_clean) < 200 and not BULLET_START_RE.match(line_clean):
+            current_competency['name'] = line_clean
+            awaiting_name = False
+        
+        # Look for section headers that indicate objectives
+        if OBJECTIVES_HEADER_RE.search(line_clean):
+            collecting_objectives = True
+            continue
+        
+        # Collect objectives (usually bullet points or numbered)
+        if collecting_objectives or i - current_line <= OBJECTIVE_WINDOW_LINES:
+            obj_match = OBJECTIVE_ITEM_RE.match(line_clean)
+            if obj_match:
+                obj_text = obj_match.group(1).strip()
+                if 15 < len(obj_text) < 300 and obj_text not in seen_objectives:  # Reasonable length
+                    seen_objectives.add(obj_text)
+                    current_competency['learningObjectives'].append(obj_text)
     
-    if current_competency and current_competency.get('name'):
+    if current_competency:
         competencies.append(current_competency)
     
     return competencies
@@ -912,21 +987,31 @@ def validate_topic_for_grade(topic_name: str, grade: str, subject: str) -> bool:
     # For other subjects or if no specific validation, allow the topic
     return True
 
-def parse_curriculum_data(text: str, filename: str) -> List[Dict]:
-    """Parse curriculum data from extracted text - returns list for multiple grades"""
-    subject, grades_list = identify_subject_grade(filename, text)
+def parse_curriculum_data(text: str, filename: str, sections: Optional[Dict[str, str]] = None,
+                          classification: Optional[Tuple[Optional[str], List[str]]] = None) -> List[Dict]:
+    """Parse curriculum data from extracted text - returns list for multiple grades
+
+    sections optionally gives an extractor its own text (keys 'competencies',
+    'topics', 'crossCurricular', 'broadAreas', 'themes'), and classification
+    a (subject, grades) already found from the PDF metadata and outline.
+    """
+    if classification and classification[0] and classification[1]:
+        subject, grades_list = classification
+    else:
+        subject, grades_list = identify_subject_grade(filename, text)
     
     if not subject or not grades_list:
         return []
     
-    competencies = extract_competencies(text)
+    sections = sections or {}
+    competencies = extract_competencies(sections.get('competencies', text))
     
     # Return one entry per grade with grade-appropriate topics
     results = []
     for grade in grades_list:
         # Extract topics with subject and grade context for better filtering
         # For History subjects, extraction is grade-specific, so extract per grade
-        topics = extract_topics(text, grade=grade, subject=subject)
+        topics = extract_topics(sections.get('topics', text), grade=grade, subject=subject)
         
         # Filter topics to be grade-appropriate (for non-History subjects)
         grade_appropriate_topics = []
@@ -935,9 +1020,9 @@ def parse_curriculum_data(text: str, filename: str) -> List[Dict]:
                 grade_appropriate_topics.append(topic)
         
         # Extract cross-curricular competencies and broad areas of learning for this grade
-        cross_curricular = extract_cross_curricular_competencies(text, subject, grade)
-        broad_areas = extract_broad_areas_of_learning(text, subject, grade)
-        subject_themes = extract_subject_themes(text, subject, grade)
+        cross_curricular = extract_cross_curricular_competencies(sections.get('crossCurricular', text), subject, grade)
+        broad_areas = extract_broad_areas_of_learning(sections.get('broadAreas', text), subject, grade)
+        subject_themes = extract_subject_themes(sections.get('themes', text), subject, grade)
         
         results.append({
             'subject': subject,
@@ -952,8 +1037,8 @@ def parse_curriculum_data(text: str, filename: str) -> List[Dict]:
     
     return results
 
-def generate_js_structure(parsed_data_list: List[Dict]) -> str:
-    """Generate JavaScript code for pfeqCurriculum structure"""
+def merge_curriculum_data(parsed_data_list: List[Dict]) -> Dict:
+    """Merge parsed entries into a subject -> grade -> data curriculum tree"""
     # Organize by subject -> grade
     curriculum = {}
     
@@ -1072,89 +1157,12 @@ def generate_js_structure(parsed_data_list: List[Dict]) -> str:
                 curriculum[subject][grade]['subjectThemes'].append(theme)
                 existing_themes.add(theme)
     
-    # Generate JavaScript code
-    js_lines = ['const pfeqCurriculum = {', '    subjects: {']
-    
-    for subject, grades in sorted(curriculum.items()):
-        js_lines.append(f'        "{subject}": {{')
-        js_lines.append('            grades: {')
-        
-        for grade, data in sorted(grades.items()):
-            js_lines.append(f'                "{grade}": {{')
-            
-            # Competencies
-            js_lines.append('                    competencies: [')
-            for comp in data['competencies']:
-                js_lines.append('                        {')
-                if comp.get('id'):
-                    js_lines.append(f'                            id: "{comp["id"]}",')
-                js_lines.append(f'                            name: {json.dumps(comp["name"])},')
-                if comp.get('learningObjectives'):
-                    js_lines.append('                            learningObjectives: [')
-                    for obj in comp['learningObjectives']:
-                        js_lines.append(f'                                {json.dumps(obj)},')
-                    js_lines.append('                            ]')
-                js_lines.append('                        },')
-            js_lines.append('                    ],')
-            
-            # Topics
-            js_lines.append('                    topics: [')
-            for topic in data['topics']:
-                js_lines.append('                        {')
-                js_lines.append(f'                            name: {json.dumps(topic["name"])},')
-                if topic.get('concepts'):
-                    js_lines.append('                            concepts: [')
-                    for concept in topic['concepts']:
-                        js_lines.append(f'                                {json.dumps(concept)},')
-                    js_lines.append('                            ],')
-                if topic.get('learningObjectives'):
-                    js_lines.append('                            learningObjectives: [')
-                    for obj in topic['learningObjectives']:
-                        js_lines.append(f'                                {json.dumps(obj)},')
-                    js_lines.append('                            ],')
-                if topic.get('progression'):
-                    js_lines.append('                            progression: {')
-                    if topic['progression'].get('buildsOn'):
-                        js_lines.append('                                buildsOn: [')
-                        for item in topic['progression']['buildsOn']:
-                            js_lines.append(f'                                    {json.dumps(item)},')
-                        js_lines.append('                                ],')
-                    if topic['progression'].get('preparesFor'):
-                        js_lines.append('                                preparesFor: [')
-                        for item in topic['progression']['preparesFor']:
-                            js_lines.append(f'                                    {json.dumps(item)},')
-                        js_lines.append('                                ],')
-                    js_lines.append('                            },')
-                js_lines.append('                        },')
-            js_lines.append('                    ],')
-            
-            # Cross-curricular competencies
-            js_lines.append('                    crossCurricularCompetencies: [')
-            for comp in data.get('crossCurricularCompetencies', []):
-                js_lines.append(f'                        {json.dumps(comp)},')
-            js_lines.append('                    ],')
-            
-            # Broad areas of learning
-            js_lines.append('                    broadAreasOfLearning: [')
-            for area in data.get('broadAreasOfLearning', []):
-                js_lines.append(f'                        {json.dumps(area)},')
-            js_lines.append('                    ],')
-            
-            # Subject themes
-            js_lines.append('                    subjectThemes: [')
-            for theme in data.get('subjectThemes', []):
-                js_lines.append(f'                        {json.dumps(theme)},')
-            js_lines.append('                    ]')
-            
-            js_lines.append('                },')
-        
-        js_lines.append('            }')
-        js_lines.append('        },')
-    
-    js_lines.append('    }')
-    js_lines.append('};')
-    
-    return '\n'.join(js_lines)
+    return curriculum
+
+def generate_js_structure(parsed_data_list: List[Dict], output_format: str = 'pretty') -> str:
+    """Generate JavaScript code for pfeqCurriculum structure"""
+    curriculum = merge_curriculum_data(parsed_data_list)
+    return format_bundle(build_bundle(curriculum), output_format)
 
 def process_all_pdfs(folder_path: str) -> str:
     """Process all PDFs in folder and generate JavaScript code - DEPRECATED, use main() instead"""
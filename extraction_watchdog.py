@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Extraction Watchdog
+Runs each PDF's extraction and parsing in a worker process with a time budget,
+so one document with a broken text layer (e.g. huge malformed lines that make
+the topic regexes backtrack) cannot stall the whole run. A document that runs
+over budget is killed and retried once with a degraded extractor; anything
+that still fails is recorded in a quarantine report.
+"""
+
+import sys
+import json
+import time
+import multiprocessing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+from text_corpus import TextCorpus, pages_to_text
+from extract_pfeq_data import PARALLEL_PAGE_THRESHOLD
+from pdf_outline import plan_extraction
+from boilerplate import strip_boilerplate
+
+DOCUMENT_TIME_BUDGET = 120          # seconds per document, per attempt
+DEGRADED_MAX_LINE_LENGTH = 400      # longer lines are dropped by the degraded extractor
+QUARANTINE_REPORT = Path(__file__).parent / 'extraction_quarantine.json'
+
+def drop_long_lines(text: str, max_length: int = DEGRADED_MAX_LINE_LENGTH) -> Tuple[str, List[Dict]]:
+    """Remove lines too long to be real curriculum content, returning the kept text and what was dropped"""
+    kept = []
+    dropped = []
+    for line_number, line in enumerate(text.split('\n'), 1):
+        if len(line) > max_length:
+            dropped.append({
+                'line': line_number,
+                'length': len(line),
+                'preview': line[:120]
+            })
+        else:
+            kept.append(line)
+    return '\n'.join(kept), dropped
+
+def process_pdf(pdf_path: Path, degraded: bool = False, corpus_dir: Optional[Path] = None,
+                page_threshold: int = PARALLEL_PAGE_THRESHOLD) -> Dict:
+    """Extract and parse one PDF; the degraded mode uses pypdf only and drops overlong lines
+
+    Outside degraded mode, a metadata/outline pre-pass classifies the PDF and
+    limits extraction to the pages its sections need. With a corpus_dir, page
+    texts already in the corpus for an unchanged PDF are read from it instead
+    of re-running the extractor; freshly extracted pages are returned under
+    'pages' (and 'extracted') for the caller to append. Repeated headers and
+    footers are stripped before parsing ('boilerplate' counts the lines
+    dropped). Documents with more than page_threshold pages to extract are
+    extracted in parallel page ranges.
+    """
+    from extract_pfeq_data import extract_pdf_pages, extract_pdf_pages_basic, parse_curriculum_data
+
+    plan = None
+    if not degraded:
+        try:
+            plan = plan_extraction(pdf_path)
+        except Exception as e:
+            print(f"  Outline pre-pass failed for {pdf_path.name}: {e}")
+    needed = plan['pages'] if plan else None
+
+    pages = None
+    if corpus_dir is not None and not degraded:
+        with TextCorpus(corpus_dir) as corpus:
+            if corpus.is_current(pdf_path, needed):
+                pages = corpus.pages(corpus.document_key(pdf_path))
+    extracted = pages is None
+    if extracted:
+        if degraded:
+            pages = extract_pdf_pages_basic(pdf_path)
+        else:
+            pages = extract_pdf_pages(pdf_path, page_threshold, page_indices=needed)
+
+    # The corpus keeps the raw pages; parsers get them without running headers and footers
+    clean_pages, boilerplate = strip_boilerplate(pages)
+
+    dropped = []
+    sections = {}
+    if degraded:
+        text, dropped = drop_long_lines(''.join(page + '\n' for page in clean_pages))
+    elif needed is not None:
+        text = pages_to_text([clean_pages[i] for i in needed if i < len(clean_pages)])
+        sections = {key: pages_to_text([clean_pages[i] for i in indices if i < len(clean_pages)])
+                    for key, indices in plan['sections'].items()}
+    else:
+        text = pages_to_text(clean_pages)
+
+    result = {
+        'items': [],
+        'dropped': dropped,
+        'boilerplate': boilerplate,
+        'pages': pages if extracted and not degraded else None,
+        'extracted': needed
+    }
+    if not text or not isinstance(text, str) or len(text.strip()) < 100:
+        return result
+
+    classification = (plan['subject'], plan['grades']) if plan else None
+    result['items'] = parse_curriculum_data(text, pdf_path.name, sections, classification)
+    return result
+
+def _worker(conn, func, args):
+    try:
+        conn.send(('ok', func(*args)))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+def run_with_budget(func, args: tuple, budget: float) -> Tuple[str, object]:
+    """Run func(*args) in a worker process, killing it after budget seconds
+
+    Returns (status, result) with status 'ok', 'error' (result is the
+    message) or 'timeout' (result is None).
+    """
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    # Not a daemon: the worker may start its own page-extraction pool
+    worker = multiprocessing.Process(target=_worker, args=(child_conn, func, args))
+    worker.start()
+    child_conn.close()
+
+    if parent_conn.poll(budget):
+        try:
+            status, result = parent_conn.recv()
+        except EOFError:
+            status, result = 'error', f"worker exited with code {worker.exitcode}"
+        worker.join()
+    else:
+        worker.terminate()
+        worker.join(5)
+        if worker.is_alive():
+            worker.kill()
+            worker.join()
+        status, result = 'timeout', None
+
+    parent_conn.close()
+    return status, result
+
+def process_pdf_with_watchdog(pdf_path: Path, quarantine: List[Dict],
+                              budget: float = DOCUMENT_TIME_BUDGET,
+                              corpus: Optional[TextCorpus] = None,
+                              page_threshold: int = PARALLEL_PAGE_THRESHOLD) -> List[Dict]:
+    """Process one PDF under the time budget, retrying degraded and quarantining on failure
+
+    Pages extracted for a PDF that is not yet (or no longer) in the corpus
+    are appended to it, so the next run can skip extraction.
+    """
+    start = time.perf_counter()
+    corpus_dir = corpus.directory if corpus is not None else None
+    status, result = run_with_budget(process_pdf, (pdf_path, False, corpus_dir, page_threshold), budget)
+    if status == 'ok':
+        if corpus is not None and result['pages'] is not None:
+            corpus.add_document(pdf_path, result['pages'], result['extracted'])
+        if result['boilerplate']:
+            print(f"  [CLEAN] {pdf_path.name} - dropped {result['boilerplate']} repeated header/footer lines")
+        return result['items']
+
+    first_failure = f"timed out after {budget:.0f}s" if status == 'timeout' else result
+    print(f"  [WATCHDOG] {pdf_path.name} - {first_failure}, retrying with degraded extractor")
+
+    status, result = run_with_budget(process_pdf, (pdf_path, True), budget)
+    entry = {
+        'document': str(pdf_path),
+        'firstAttempt': first_failure,
+        'elapsed': round(time.perf_counter() - start, 1)
+    }
+    if status == 'ok':
+        entry['outcome'] = 'degraded'
+        entry['droppedLines'] = result['dropped']
+        quarantine.append(entry)
+        return result['items']
+
+    entry['outcome'] = 'failed'
+    entry['degradedAttempt'] = f"timed out after {budget:.0f}s" if status == 'timeout' else result
+    quarantine.append(entry)
+    print(f"  [QUARANTINED] {pdf_path.name} - {entry['degradedAttempt']}")
+    return []
+
+def write_quarantine_report(quarantine: List[Dict], report_file: Path = QUARANTINE_REPORT):
+    """Write the quarantine report for this run (removing a stale one when the run was clean)"""
+    if not quarantine:
+        if report_file.exists():
+            report_file.unlink()
+        return
+
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'documents': quarantine
+    }
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n[WARNING] {len(quarantine)} document(s) needed the watchdog - see {report_file}")
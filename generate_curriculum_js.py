@@ -4,84 +4,37 @@ Generate JavaScript curriculum data file from hardcoded curriculum data
 This script reads curriculum_data.py and generates pfeq_curriculum_data.js
 """
 
-import json
+import argparse
 from pathlib import Path
 from curriculum_data import CURRICULUM_DATA
+from curriculum_bundle import BUNDLE_FORMATS, build_bundle, format_bundle, write_bundle
 
-def generate_js_structure(curriculum_data: dict) -> str:
+def generate_js_structure(curriculum_data: dict, output_format: str = 'pretty') -> str:
     """Generate JavaScript code for pfeqCurriculum structure from hardcoded data"""
-    js_lines = ['const pfeqCurriculum = {', '    subjects: {']
-    
-    for subject, grades in sorted(curriculum_data.items()):
-        js_lines.append(f'        "{subject}": {{')
-        js_lines.append('            grades: {')
-        
-        for grade, data in sorted(grades.items()):
-            js_lines.append(f'                "{grade}": {{')
-            
-            # Competencies
-            js_lines.append('                    competencies: [')
-            for comp in data.get('competencies', []):
-                js_lines.append('                        {')
-                if comp.get('id'):
-                    js_lines.append(f'                            id: "{comp["id"]}",')
-                js_lines.append(f'                            name: {json.dumps(comp["name"])},')
-                if comp.get('learningObjectives'):
-                    js_lines.append('                            learningObjectives: [')
-                    for obj in comp['learningObjectives']:
-                        js_lines.append(f'                                {json.dumps(obj)},')
-                    js_lines.append('                            ]')
-                js_lines.append('                        },')
-            js_lines.append('                    ],')
-            
-            # Topics
-            js_lines.append('                    topics: [')
-            for topic_name in data.get('topics', []):
-                js_lines.append('                        {')
-                js_lines.append(f'                            name: {json.dumps(topic_name)},')
-                js_lines.append('                        },')
-            js_lines.append('                    ],')
-            
-            # Cross-curricular competencies
-            js_lines.append('                    crossCurricularCompetencies: [')
-            for comp in data.get('crossCurricularCompetencies', []):
-                js_lines.append(f'                        {json.dumps(comp)},')
-            js_lines.append('                    ],')
-            
-            # Broad areas of learning
-            js_lines.append('                    broadAreasOfLearning: [')
-            for area in data.get('broadAreasOfLearning', []):
-                js_lines.append(f'                        {json.dumps(area)},')
-            js_lines.append('                    ],')
-            
-            # Subject themes
-            js_lines.append('                    subjectThemes: [')
-            for theme in data.get('subjectThemes', []):
-                js_lines.append(f'                        {json.dumps(theme)},')
-            js_lines.append('                    ]')
-            
-            js_lines.append('                },')
-        
-        js_lines.append('            }')
-        js_lines.append('        },')
-    
-    js_lines.append('    }')
-    js_lines.append('};')
-    
-    return '\n'.join(js_lines)
+    return format_bundle(build_bundle(curriculum_data), output_format)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate pfeq_curriculum_data.js from curriculum_data.py')
+    parser.add_argument('--format', choices=BUNDLE_FORMATS, default='pretty',
+                        help='pretty (readable), min (compact, for deployment) or json (data file plus a loader script)')
+    parser.add_argument('--precompress', action='store_true',
+                        help='also write content-hashed .gz/.br copies')
+    args = parser.parse_args()
+    
     print("Generating JavaScript curriculum data file...")
     
     # Generate JS code from curriculum data
-    js_output = generate_js_structure(CURRICULUM_DATA)
+    output_file = Path(__file__).parent / 'pfeq_curriculum_data.js'
+    result = write_bundle(build_bundle(CURRICULUM_DATA), output_file,
+                          output_format=args.format, precompress=args.precompress)
+    js_output = result['code']
     
     if js_output:
-        # Save to file
-        output_file = Path(__file__).parent / 'pfeq_curriculum_data.js'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(js_output)
-        print(f"JavaScript code saved to: {output_file}")
+        if result['changed']:
+            print(f"JavaScript code saved to: {output_file}")
+            print(f"Curriculum JSON saved to: {output_file.with_suffix('.json')}")
+        else:
+            print(f"Unchanged: {output_file}")
         print(f"Generated {len(js_output)} characters of JavaScript code")
         
         # Count subjects and grades
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Gradebook Analytics
+Term statistics over a whole school's gradebook export. The nested
+grades[assignmentId]["<studentId>_<criterion>"] object is flattened once into
+NumPy columns (student, assignment, criterion, level, score) with index
+tables for students, assignments, sections and rubric criteria; every
+aggregate below is then a bincount/sort over those columns instead of a loop
+over the nested object.
+
+Scores follow the calendar's grade sheet: a criterion at level i of n is
+(i + 1) / n * 100, an assignment's score is the mean of its graded criteria,
+and a student's average weights assignments by their weight.
+
+    python gradebook_analytics.py localStorage-dump.json --from 2025-08-25 --to 2025-11-07
+    python gradebook_analytics.py --store builder_state.sqlite3 --output term1.json
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from rubric_codec import as_rubric_list
+
+# Lower bounds of the score bands reported in distributions ('<60', '60-69', ... '90-100')
+SCORE_BANDS = (60, 70, 80, 90)
+BAND_LABELS = ['<60'] + [f'{low}-{high - 1}' for low, high in zip(SCORE_BANDS, SCORE_BANDS[1:])] + \
+              [f'{SCORE_BANDS[-1]}-100']
+GRADEBOOK_KEYS = ('students', 'assignments', 'grades', 'savedRubrics')
+
+def _state_value(data: Dict, name: str, default):
+    """A localStorage dump keeps each value as a JSON string; exports keep it parsed"""
+    value = data.get(name, default)
+    return json.loads(value) if isinstance(value, str) else value
+
+def _group_stats(groups: np.ndarray, values: np.ndarray, group_count: int) -> Dict[str, np.ndarray]:
+    """count/mean/median/min/max of values per group (NaN where a group is empty)"""
+    counts = np.bincount(groups, minlength=group_count)
+    stats = {'count': counts}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats['mean'] = np.bincount(groups, weights=values, minlength=group_count) / counts
+    order = np.lexsort((values, groups))
+    ordered = values[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    for name in ('median', 'min', 'max'):
+        stats[name] = np.full(group_count, np.nan)
+    first, last = starts[present], starts[present] + counts[present] - 1
+    stats['min'][present] = ordered[first]
+    stats['max'][present] = ordered[last]
+    stats['median'][present] = (ordered[first + (counts[present] - 1) // 2] +
+                                ordered[first + counts[present] // 2]) / 2
+    return stats
+
+def _band_counts(groups: np.ndarray, values: np.ndarray, group_count: int) -> np.ndarray:
+    """(group_count, bands) histogram of scores"""
+    bands = np.digitize(values, SCORE_BANDS)
+    return np.bincount(groups * len(BAND_LABELS) + bands,
+                       minlength=group_count * len(BAND_LABELS)).reshape(group_count, len(BAND_LABELS))
+
+def _number(value) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 1)
+
+class Gradebook:
+    """Column arrays over one gradebook export"""
+
+    def __init__(self, students: List[Dict], assignments: List[Dict], grades: Dict[str, Dict],
+                 rubrics: List[Dict]):
+        # Students and their section memberships (a student may be in several sections)
+        self.student_ids = [str(s.get('id')) for s in students]
+        self.student_names = [s.get('name', '') for s in students]
+        student_index = {sid: i for i, sid in enumerate(self.student_ids)}
+        self.sections: List[str] = []
+        section_index: Dict[str, int] = {}
+        member_students, member_sections = [], []
+        for i, student in enumerate(students):
+            for section in student.get('classSections') or []:
+                if section not in section_index:
+                    section_index[section] = len(self.sections)
+                    self.sections.append(section)
+                member_students.append(i)
+                member_sections.append(section_index[section])
+        self.member_student = np.array(member_students, dtype=np.int64)
+        self.member_section = np.array(member_sections, dtype=np.int64)
+
+        # Rubric criteria, numbered globally: criterion c of rubric r is criterion_base[r] + c
+        rubric_index = {}
+        self.criteria: List[Tuple[str, str]] = []
+        self.criterion_levels: List[int] = []
+        self.level_names: List[List[str]] = []
+        criterion_base = []
+        for rubric in rubrics:
+            rubric_index[str(rubric.get('id'))] = len(criterion_base)
+            criterion_base.append(len(self.criteria))
+            levels = int(rubric.get('numLevels') or len(rubric.get('levelNames') or []) or 4)
+            title = rubric.get('title') or str(rubric.get('id'))
+            for criterion in rubric.get('criteria') or []:
+                self.criteria.append((title, criterion.get('name', '')))
+                self.criterion_levels.append(levels)
+                self.level_names.append(list(rubric.get('levelNames') or []))
+
+        # Assignments
+        self.assignment_ids = [str(a.get('id')) for a in assignments]
+        self.assignment_titles = [a.get('rubricTitle', '') for a in assignments]
+        assignment_index = {aid: i for i, aid in enumerate(self.assignment_ids)}
+        self.assignment_weight = np.array([float(a.get('weight') or 0) for a in assignments])
+        self.assignment_due = np.array([a.get('dueDate') or 'NaT' for a in assignments], dtype='datetime64[D]')
+
+        # Grade columns, one row per graded criterion
+        self.skipped = {'unknown assignment': 0, 'unknown rubric': 0, 'unknown student': 0, 'invalid level': 0}
+        student_col, assignment_col, criterion_col, level_col = [], [], [], []
+        for assignment_id, sheet in grades.items():
+            a = assignment_index.get(str(assignment_id))
+            if a is None:
+                self.skipped['unknown assignment'] += len(sheet)
+                continue
+            r = rubric_index.get(str(assignments[a].get('rubricId')))
+            if r is None:
+                self.skipped['unknown rubric'] += len(sheet)
+                continue
+            base = criterion_base[r]
+            criterion_count = (criterion_base[r + 1] if r + 1 < len(criterion_base) else len(self.criteria)) - base
+            for key, level in sheet.items():
+                sid, _, c = key.rpartition('_')
+                s = student_index.get(sid)
+                if s is None:
+                    self.skipped['unknown student'] += 1
+                    continue
+                try:
+                    c, level = int(c), int(level)
+                except (TypeError, ValueError):
+                    self.skipped['invalid level'] += 1
+                    continue
+                if not (0 <= c < criterion_count and 0 <= level < self.criterion_levels[base + c]):
+                    self.skipped['invalid level'] += 1
+                    continue
+                student_col.append(s)
+                assignment_col.append(a)
+                criterion_col.append(base + c)
+                level_col.append(level)
+
+        self.student = np.array(student_col, dtype=np.int64)
+        self.assignment = np.array(assignment_col, dtype=np.int64)
+        self.criterion = np.array(criterion_col, dtype=np.int64)
+        self.level = np.array(level_col, dtype=np.int64)
+        levels = np.array(self.criterion_levels, dtype=np.float64)
+        self.score = (self.level + 1) / levels[self.criterion] * 100 if len(self.level) else np.zeros(0)
+
+    @classmethod
+    def from_state(cls, data: Dict) -> 'Gradebook':
+        """Build from a localStorage dump, an export or BuilderStore.state()"""
+        return cls(_state_value(data, 'students', []), _state_value(data, 'assignments', []),
+                   _state_value(data, 'grades', {}), as_rubric_list(_state_value(data, 'savedRubrics', [])))
+
+    def grade_mask(self, start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Grades whose assignment is due within [start, end] (undated assignments only when unbounded)"""
+        due = self.assignment_due[self.assignment]
+        mask = np.ones(len(self.assignment), dtype=bool)
+        if start:
+            mask &= due >= np.datetime64(start, 'D')
+        if end:
+            mask &= due <= np.datetime64(end, 'D')
+        return mask
+
+    def assignment_scores(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(student, assignment, score) for every graded pair: the mean of its graded criteria"""
+        pair = self.student[mask] * max(len(self.assignment_ids), 1) + self.assignment[mask]
+        pairs, inverse = np.unique(pair, return_inverse=True)
+        scores = np.bincount(inverse, weights=self.score[mask]) / np.bincount(inverse)
+        return pairs // max(len(self.assignment_ids), 1), pairs % max(len(self.assignment_ids), 1), scores
+
+    def student_averages(self, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Weighted average per student (NaN if ungraded) and how many assignments it covers"""
+        students, assignments, scores = self.assignment_scores(mask)
+        weights = self.assignment_weight[assignments]
+        count = len(self.student_ids)
+        total_weight = np.bincount(students, weights=weights, minlength=count)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            averages = np.bincount(students, weights=weights * scores, minlength=count) / total_weight
+        return averages, np.bincount(students, minlength=count)
+
+    def section_summary(self, averages: np.ndarray) -> List[Dict]:
+        """Per section: enrolment, graded students and the distribution of their averages"""
+        member_average = averages[self.member_student]
+        graded = ~np.isnan(member_average)
+        enrolled = np.bincount(self.member_section, minlength=len(self.sections))
+        stats = _group_stats(self.member_section[graded], member_average[graded], len(self.sections))
+        bands = _band_counts(self.member_section[graded], member_average[graded], len(self.sections))
+        return [{
+            'section': section,
+            'students': int(enrolled[i]),
+            'graded': int(stats['count'][i]),
+            'mean': _number(stats['mean'][i]),
+            'median': _number(stats['median'][i]),
+            'min': _number(stats['min'][i]),
+            'max': _number(stats['max'][i]),
+            'distribution': dict(zip(BAND_LABELS, bands[i].tolist()))
+        } for i, section in enumerate(self.sections)]
+
+    def criterion_summary(self, mask: np.ndarray) -> List[Dict]:
+        """Per rubric criterion: grades given, mean score and how often each level was used"""
+        count = len(self.criteria)
+        criteria = self.criterion[mask]
+        stats = _group_stats(criteria, self.score[mask], count)
+        width = max(self.criterion_levels, default=1)
+        level_counts = np.bincount(criteria * width + self.level[mask],
+                                   minlength=count * width).reshape(count, width)
+        summary = []
+        for i, (rubric, name) in enumerate(self.criteria):
+            if not stats['count'][i]:
+                continue
+            labels = self.level_names[i] or [str(n + 1) for n in range(self.criterion_levels[i])]
+            summary.append({
+                'rubric': rubric,
+                'criterion': name,
+                'grades': int(stats['count'][i]),
+                'mean': _number(stats['mean'][i]),
+                'median': _number(stats['median'][i]),
+                'levels': dict(zip(labels, level_counts[i, :self.criterion_levels[i]].tolist()))
+            })
+        return summary
+
+    def assignment_summary(self, mask: np.ndarray) -> List[Dict]:
+        """Per assignment: students graded and their score distribution"""
+        _, assignments, scores = self.assignment_scores(mask)
+        count = len(self.assignment_ids)
+        stats = _group_stats(assignments, scores, count)
+        return [{
+            'id': self.assignment_ids[i],
+            'title': self.assignment_titles[i],
+            'dueDate': None if np.isnat(self.assignment_due[i]) else str(self.assignment_due[i]),
+            'graded': int(stats['count'][i]),
+            'mean': _number(stats['mean'][i]),
+            'median': _number(stats['median'][i])
+        } for i in range(count) if stats['count'][i]]
+
+    def report(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict:
+        mask = self.grade_mask(start, end)
+        averages, covered = self.student_averages(mask)
+        return {
+            'period': {'from': start, 'to': end},
+            'grades': int(mask.sum()),
+            'skipped': {reason: count for reason, count in self.skipped.items() if count},
+            'students': [{
+                'id': self.student_ids[i],
+                'name': self.student_names[i],
+                'assignments': int(covered[i]),
+                'average': _number(averages[i])
+            } for i in range(len(self.student_ids))],
+            'sections': self.section_summary(averages),
+            'assignments': self.assignment_summary(mask),
+            'criteria': self.criterion_summary(mask)
+        }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Aggregate a gradebook export by student, section and criterion')
+    parser.add_argument('export', nargs='?', type=Path,
+                        help='JSON with students, assignments, grades and savedRubrics (e.g. a localStorage dump)')
+    parser.add_argument('--store', type=Path, help='read the builder state store instead (see curriculum_server.py)')
+    parser.add_argument('--from', dest='start', help='first due date of the term (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='end', help='last due date of the term (YYYY-MM-DD)')
+    parser.add_argument('--output', type=Path, help='write the full JSON report here')
+    args = parser.parse_args()
+    if not args.export and not args.store:
+        parser.error('give an export file or --store')
+
+    try:
+        if args.store:
+            from builder_store import BuilderStore
+            with BuilderStore(args.store) as store:
+                data = {name: store.get(name) for name in GRADEBOOK_KEYS}
+        else:
+            data = json.loads(args.export.read_text(encoding='utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    gradebook = Gradebook.from_state(data)
+    loaded = time.perf_counter()
+    report = gradebook.report(args.start, args.end)
+    elapsed = time.perf_counter() - loaded
+
+    print(f"[OK] {len(gradebook.score):,} criterion grades, {len(gradebook.student_ids):,} students, "
+          f"{len(gradebook.assignment_ids):,} assignments, {len(gradebook.sections):,} sections")
+    print(f"  Loaded in {loaded - start:.2f}s, aggregated in {elapsed * 1000:.1f} ms")
+    for reason, count in report['skipped'].items():
+        print(f"  [WARNING] Skipped {count:,} grade(s): {reason}")
+
+    print(f"\n{'section':<24} {'students':>8} {'graded':>7} {'mean':>6} {'median':>7}  " + ' '.join(
+        f'{label:>6}' for label in BAND_LABELS))
+    for section in report['sections']:
+        mean = '--' if section['mean'] is None else f"{section['mean']:.1f}"
+        median = '--' if section['median'] is None else f"{section['median']:.1f}"
+        print(f"{section['section'][:24]:<24} {section['students']:>8} {section['graded']:>7} {mean:>6} "
+              f"{median:>7}  " + ' '.join(f'{n:>6}' for n in section['distribution'].values()))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\nReport saved to: {args.output}")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline Cache Manifest
+Generates the service worker that lets the built pages work on flaky school
+Wi-Fi. cache-manifest.json lists every built file with its content hash; the
+worker answers requests from its cache straight away and, on each page
+visit, re-reads the manifest and downloads only the entries whose hash
+changed since the build it already holds (unchanged entries are copied
+between caches, not refetched).
+"""
+
+import json
+from typing import Dict
+
+from curriculum_bundle import content_hash
+
+MANIFEST_NAME = 'cache-manifest.json'
+SERVICE_WORKER_NAME = 'sw.js'
+CACHE_PREFIX = 'pfeq-offline-'
+
+SERVICE_WORKER = """// Offline cache for the teacher tool pages (generated by build_static_assets.py - do not edit)
+const MANIFEST_URL = __MANIFEST__;
+const CACHE_PREFIX = __PREFIX__;
+
+// The complete cache: the one holding its manifest (written last when it is filled)
+async function currentCache() {
+    for (const name of await caches.keys()) {
+        if (!name.startsWith(CACHE_PREFIX)) continue;
+        const cache = await caches.open(name);
+        const stored = await cache.match(MANIFEST_URL);
+        if (stored) return { name, cache, manifest: await stored.json() };
+    }
+    return null;
+}
+
+// Bring the cache up to the server's manifest, fetching only entries whose hash changed
+async function revalidate() {
+    const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(MANIFEST_URL + ' ' + response.status);
+    const manifest = await response.clone().json();
+    const name = CACHE_PREFIX + manifest.version;
+    const current = await currentCache();
+    if (current && current.name === name) return;
+
+    const fresh = await caches.open(name);
+    await Promise.all(Object.entries(manifest.entries).map(async ([url, hash]) => {
+        if (current && current.manifest.entries[url] === hash) {
+            const cached = await current.cache.match(url);
+            if (cached) return fresh.put(url, cached);
+        }
+        const fetched = await fetch(url, { cache: 'no-cache' });
+        if (!fetched.ok) throw new Error(url + ' ' + fetched.status);
+        return fresh.put(url, fetched);
+    }));
+    await fresh.put(MANIFEST_URL, response);
+    for (const old of await caches.keys()) {
+        if (old.startsWith(CACHE_PREFIX) && old !== name) await caches.delete(old);
+    }
+}
+
+async function fromCache(request) {
+    const current = await currentCache();
+    if (current) {
+        const url = new URL(request.url);
+        // Directory URLs are served by their index.html
+        const key = url.pathname.endsWith('/') ? new URL('index.html', url) : request;
+        // Builder URLs carry ?v=<version>; the cached copy is whatever the manifest names
+        const cached = await current.cache.match(key, { ignoreSearch: true });
+        if (cached) return cached;
+    }
+    return fetch(request);
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(revalidate().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET' || new URL(request.url).origin !== location.origin) return;
+    event.respondWith(fromCache(request));
+    if (request.mode === 'navigate') {
+        event.waitUntil(revalidate().catch(error => console.warn('Offline cache not updated:', error)));
+    }
+});
+"""
+
+REGISTRATION = """// Registers the offline cache worker (generated by build_static_assets.py - do not edit)
+if ('serviceWorker' in navigator && location.protocol.startsWith('http')) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register(__WORKER__)
+            .catch(error => console.warn('Offline cache unavailable:', error));
+    });
+}
+"""
+
+def build_cache_manifest(entries: Dict[str, str]) -> Dict:
+    """Manifest for {url: content hash}; its version changes whenever any entry does"""
+    entries = dict(sorted(entries.items()))
+    version = content_hash(json.dumps(entries, separators=(',', ':')).encode('utf-8'))
+    return {'version': version, 'entries': entries}
+
+def format_service_worker() -> str:
+    return (SERVICE_WORKER
+            .replace('__MANIFEST__', json.dumps(MANIFEST_NAME))
+            .replace('__PREFIX__', json.dumps(CACHE_PREFIX)))
+
+def format_registration() -> str:
+    return REGISTRATION.replace('__WORKER__', json.dumps(SERVICE_WORKER_NAME))
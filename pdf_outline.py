@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+PDF Outline Pre-pass
+Reads a PFEQ PDF's document metadata and bookmark outline with pypdf, without
+rendering any page text. The metadata and bookmark titles classify the
+document (subject and grades) and the outline sections ("Competency 1",
+"Content", ...) decide which pages each extractor needs, so only those pages
+go through pdfplumber's layout extraction.
+
+    python pdf_outline.py some-program.pdf
+"""
+
+import re
+import sys
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Leading pages always extracted: title page and introduction carry the
+# subject/grade wording identify_subject_grade falls back to
+FRONT_MATTER_PAGES = 3
+
+# Outline titles -> extractor that needs the section. Checked in order, so the
+# cross-curricular sections are claimed before the subject competencies.
+SECTION_PATTERNS = [
+    ('crossCurricular', re.compile(r'cross-curricular|transversal', re.IGNORECASE)),
+    ('broadAreas', re.compile(r'broad areas|domaines g[ée]n[ée]raux', re.IGNORECASE)),
+    ('competencies', re.compile(r'competenc|comp[ée]tence', re.IGNORECASE)),
+    ('topics', re.compile(r'\b(?:content|contenus?|savoirs|knowledges?|progression)\b', re.IGNORECASE)),
+    ('themes', re.compile(r'theme|th[èe]me|social phenomen|r[ée]alit', re.IGNORECASE)),
+]
+# Tables of contents and introductions name the sections without holding them
+# ("Table of Contents", "Contenu du programme – Introduction")
+SKIPPED_TITLES = re.compile(r'table of contents|table des mati[èe]res|sommaire|introduction', re.IGNORECASE)
+
+def section_for_title(title: str) -> Optional[str]:
+    """Extractor section an outline title starts, or None"""
+    if SKIPPED_TITLES.search(title):
+        return None
+    return next((name for name, pattern in SECTION_PATTERNS if pattern.search(title)), None)
+
+# Targeting only applies when the outline locates both of the big extractors' sections
+REQUIRED_SECTIONS = ('competencies', 'topics')
+
+def _flatten_outline(reader, items, depth: int = 0) -> List[Dict]:
+    """Outline entries in document order as {title, page, depth}"""
+    entries = []
+    for item in items:
+        if isinstance(item, list):
+            entries.extend(_flatten_outline(reader, item, depth + 1))
+            continue
+        try:
+            page = reader.get_destination_page_number(item)
+        except Exception:
+            continue
+        if page is None or page < 0:
+            continue
+        entries.append({'title': str(item.title or '').strip(), 'page': page, 'depth': depth})
+    return entries
+
+def read_pdf_outline(pdf_path: Path) -> Dict:
+    """Metadata, page count and flattened bookmark outline of a PDF (no page text is rendered)"""
+    import pypdf
+    with open(pdf_path, 'rb') as file:
+        reader = pypdf.PdfReader(file)
+        metadata = {}
+        for key, value in (reader.metadata or {}).items():
+            if isinstance(value, str) and value.strip():
+                metadata[key.lstrip('/').lower()] = value.strip()
+        try:
+            outline = _flatten_outline(reader, reader.outline)
+        except Exception:
+            outline = []
+        return {'pageCount': len(reader.pages), 'metadata': metadata, 'outline': outline}
+
+def outline_sections(info: Dict) -> Dict[str, List[int]]:
+    """Page indices of each extractor's sections, from the outline
+
+    Each bookmark whose title matches a SECTION_PATTERNS entry (and is not a
+    table of contents or introduction) starts a section named by the first
+    matching pattern. The section runs from the
+    bookmark's page through the page of the next bookmark at the same or a
+    shallower depth, always including that page since the next heading may
+    start mid-page, or to the end of the document if there is none. Ranges
+    are clipped to the page count, and bookmarks with the same section name
+    are merged. Bookmarks that match no pattern add no pages, but they still
+    end the section before them.
+    """
+    outline = info['outline']
+    sections = {}
+    for i, entry in enumerate(outline):
+        key = section_for_title(entry['title'])
+        if key is None:
+            continue
+        end = info['pageCount']
+        for later in outline[i + 1:]:
+            if later['depth'] <= entry['depth']:
+                end = later['page'] + 1
+                break
+        end = max(end, entry['page'] + 1)
+        sections.setdefault(key, set()).update(range(entry['page'], min(end, info['pageCount'])))
+    return {key: sorted(pages) for key, pages in sections.items()}
+
+def plan_extraction(pdf_path: Path) -> Dict:
+    """Classify a PDF from its metadata and outline and choose the pages to extract
+
+    Returns {subject, grades, pages, sections, pageCount}. 'pages' is None
+    when the whole document has to be extracted; otherwise it lists the
+    0-based page indices needed and 'sections' maps each extractor to its
+    own pages (extractors without a section get all of 'pages').
+    """
+    from extract_pfeq_data import identify_subject_grade
+
+    info = read_pdf_outline(pdf_path)
+    descriptive = '\n'.join(list(info['metadata'].values()) + [e['title'] for e in info['outline']])
+    subject, grades = identify_subject_grade(Path(pdf_path).name, descriptive)
+
+    plan = {
+        'pageCount': info['pageCount'],
+        'subject': subject,
+        'grades': grades,
+        'pages': None,
+        'sections': {}
+    }
+    sections = outline_sections(info)
+    if not all(key in sections for key in REQUIRED_SECTIONS):
+        return plan
+
+    pages = set(range(min(FRONT_MATTER_PAGES, info['pageCount'])))
+    for section_pages in sections.values():
+        pages.update(section_pages)
+    if len(pages) < info['pageCount']:
+        plan['pages'] = sorted(pages)
+        plan['sections'] = sections
+    return plan
+
+if __name__ == '__main__':
+    for arg in sys.argv[1:]:
+        path = Path(arg)
+        info = read_pdf_outline(path)
+        plan = plan_extraction(path)
+        print(f"\n{path.name}: {info['pageCount']} pages, {len(info['outline'])} bookmarks")
+        print(f"  Metadata: {json.dumps(info['metadata'], ensure_ascii=False)}")
+        print(f"  Classified as: {plan['subject']} - {', '.join(plan['grades']) or '?'}")
+        if plan['pages'] is None:
+            print("  Pages: all (outline does not locate the competency and content sections)")
+        else:
+            print(f"  Pages: {len(plan['pages'])}/{plan['pageCount']}")
+            for key, pages in plan['sections'].items():
+                print(f"    {key}: {pages[0] + 1}-{pages[-1] + 1} ({len(pages)} pages)")
@@ -5,24 +5,37 @@ Extracts data from all PDFs in PFEQ folders and generates complete curriculum da
 """
 
 import sys
+import argparse
 from pathlib import Path
 
 # Import extraction functions
 sys.path.insert(0, str(Path(__file__).parent))
-from extract_pfeq_data import (
-    extract_pdf_text, parse_curriculum_data, generate_js_structure
+from extract_pfeq_data import PARALLEL_PAGE_THRESHOLD, merge_curriculum_data
+from curriculum_bundle import BUNDLE_FORMATS, build_bundle, write_bundle
+from text_corpus import TextCorpus
+from curriculum_snapshots import commit_snapshot
+from build_static_assets import refresh_static_build
+from extraction_watchdog import (
+    DOCUMENT_TIME_BUDGET, process_pdf_with_watchdog, write_quarantine_report
 )
 
-def process_all_folders():
+PFEQ_FOLDERS = [
+    Path(r'c:\Users\johnn\Downloads\PFEQ'),
+    Path(r'c:\Users\johnn\Downloads\PFEQ_Complete\preschool'),
+    Path(r'c:\Users\johnn\Downloads\PFEQ_Complete\elementary'),
+    Path(r'c:\Users\johnn\Downloads\PFEQ_Complete\secondary'),
+]
+OUTPUT_FILE = Path(__file__).parent / 'pfeq_curriculum_data.js'
+
+def process_all_folders(output_format: str = 'pretty', precompress: bool = False,
+                        budget: float = DOCUMENT_TIME_BUDGET,
+                        page_threshold: int = PARALLEL_PAGE_THRESHOLD):
     """Process all PDFs in all PFEQ folders"""
-    folders = [
-        Path(r'c:\Users\johnn\Downloads\PFEQ'),
-        Path(r'c:\Users\johnn\Downloads\PFEQ_Complete\preschool'),
-        Path(r'c:\Users\johnn\Downloads\PFEQ_Complete\elementary'),
-        Path(r'c:\Users\johnn\Downloads\PFEQ_Complete\secondary'),
-    ]
+    folders = PFEQ_FOLDERS
     
     all_parsed_data = []
+    quarantine = []
+    corpus = TextCorpus()
     total_pdfs = 0
     processed = 0
     
@@ -36,19 +49,16 @@ def process_all_folders():
         print(f"\nProcessing {folder.name}: {len(pdf_files)} PDFs")
         
         for pdf_file in pdf_files:
-            try:
-                text = extract_pdf_text(pdf_file)
-                if not text or not isinstance(text, str) or len(text.strip()) < 100:
-                    continue
-                
-                parsed_items = parse_curriculum_data(text, pdf_file.name)
-                if parsed_items:
-                    all_parsed_data.extend(parsed_items)
-                    processed += 1
-                    for item in parsed_items:
-                        print(f"  [OK] {item['subject']} - {item['grade']}")
-            except Exception as e:
-                print(f"  [ERROR] {pdf_file.name} - {e}")
+            parsed_items = process_pdf_with_watchdog(pdf_file, quarantine, budget=budget, corpus=corpus,
+                                                     page_threshold=page_threshold)
+            if parsed_items:
+                all_parsed_data.extend(parsed_items)
+                processed += 1
+                for item in parsed_items:
+                    print(f"  [OK] {item['subject']} - {item['grade']}")
+    
+    corpus.close()
+    write_quarantine_report(quarantine)
     
     print(f"\n{'='*60}")
     print(f"Processed {processed}/{total_pdfs} PDFs")
@@ -56,14 +66,19 @@ def process_all_folders():
     print(f"{'='*60}")
     
     if all_parsed_data:
-        js_code = generate_js_structure(all_parsed_data)
-        output_file = Path(__file__).parent / 'pfeq_curriculum_data.js'
+        output_file = OUTPUT_FILE
+        curriculum = merge_curriculum_data(all_parsed_data)
+        bundle = build_bundle(curriculum)
+        result = write_bundle(bundle, output_file, output_format=output_format, precompress=precompress)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(js_code)
-        
-        print(f"\n[SUCCESS] Generated: {output_file}")
-        print(f"  Size: {len(js_code):,} characters")
+        if result['changed']:
+            print(f"\n[SUCCESS] Generated: {output_file}")
+        else:
+            print(f"\n[UNCHANGED] {output_file}")
+        print(f"  Size: {len(result['code']):,} characters")
+        print(f"  Version: {result['version']}")
+        commit_snapshot(curriculum, label='process_all_curriculum')
+        refresh_static_build()
         
         # Count unique subjects and grades
         subjects = set(d['subject'] for d in all_parsed_data)
@@ -76,9 +91,28 @@ def process_all_folders():
     return len(all_parsed_data) > 0
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract all PFEQ PDFs and regenerate pfeq_curriculum_data.js')
+    parser.add_argument('--format', choices=BUNDLE_FORMATS, default='pretty',
+                        help='pretty (readable), min (compact, for deployment) or json (data file plus a loader script)')
+    parser.add_argument('--precompress', action='store_true',
+                        help='also write content-hashed .gz/.br copies')
+    parser.add_argument('--budget', type=float, default=DOCUMENT_TIME_BUDGET,
+                        help='seconds allowed per PDF before its worker is killed')
+    parser.add_argument('--split-pages', type=int, default=PARALLEL_PAGE_THRESHOLD,
+                        help='extract PDFs longer than this many pages in parallel page ranges (0 disables)')
+    parser.add_argument('--watch', action='store_true',
+                        help='keep running and rebuild as PDFs are added, changed or removed')
+    args = parser.parse_args()
+    
     print("Quebec Education Program - Complete Curriculum Processing")
     print("=" * 60)
-    success = process_all_folders()
+    if args.watch:
+        from curriculum_watch import watch_folders
+        watch_folders(PFEQ_FOLDERS, OUTPUT_FILE, output_format=args.format, precompress=args.precompress,
+                      budget=args.budget, page_threshold=args.split_pages)
+        sys.exit(0)
+    success = process_all_folders(output_format=args.format, precompress=args.precompress,
+                                  budget=args.budget, page_threshold=args.split_pages)
     if success:
         print("\n[SUCCESS] Curriculum data ready for rubric builder!")
     else:
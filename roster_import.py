@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Roster Import
+Stream-parses school roster CSVs (thousands of students, one row per student
+per class section is fine) into the calendar's students JSON. Rows are read
+one at a time and validated; students are merged by student ID, then by name
+(which attaches the row's ID to a student who had none), with their class
+sections unioned, so memory grows with the number of distinct students rather
+than the size of the file. A row whose name fits several students is rejected
+as ambiguous rather than merged into one of them.
+
+    python roster_import.py roster.csv -o students.json
+    python roster_import.py roster.csv --existing students.json -o students.json
+    python roster_import.py roster.csv --store builder_state.sqlite3 --rejects rejected.csv
+"""
+
+import re
+import csv
+import sys
+import json
+import time
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# Header spellings accepted for each column (compared casefolded, spaces/underscores ignored)
+COLUMN_ALIASES = {
+    'name': ('name', 'studentname', 'fullname', 'nom', 'nomcomplet', 'élève', 'eleve'),
+    'studentId': ('id', 'studentid', 'studentnumber', 'permanentcode', 'codepermanent', 'fiche', 'matricule'),
+    'classSections': ('classsections', 'classsection', 'sections', 'section', 'class', 'classes',
+                      'group', 'groupe', 'groupes'),
+}
+FIRST_NAME_ALIASES = ('firstname', 'givenname', 'prénom', 'prenom')
+LAST_NAME_ALIASES = ('lastname', 'surname', 'familyname', 'nomdefamille')
+
+SECTION_SEPARATOR = re.compile(r'\s*[;|]\s*')
+STUDENT_ID = re.compile(r'^[\w.-]{1,40}$')
+MAX_NAME_LENGTH = 120
+REJECT_EXAMPLES = 10        # rejected rows echoed in the report
+SNIFF_BYTES = 64 * 1024
+
+def _header_key(name: str) -> str:
+    return re.sub(r'[\s_-]+', '', name.strip().casefold())
+
+def map_columns(header: List[str]) -> Dict[str, int]:
+    """Column index of each field the header names (name may come from first/last name columns)"""
+    keys = [_header_key(h) for h in header]
+    columns = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for i, key in enumerate(keys):
+            if key in aliases:
+                columns[field] = i
+                break
+    if 'name' not in columns:
+        first = next((i for i, key in enumerate(keys) if key in FIRST_NAME_ALIASES), None)
+        last = next((i for i, key in enumerate(keys) if key in LAST_NAME_ALIASES), None)
+        if first is not None and last is not None:
+            columns['firstName'], columns['lastName'] = first, last
+    return columns
+
+def _name_key(name: str) -> str:
+    return ' '.join(name.casefold().split())
+
+class RosterImport:
+    """One pass over roster rows, merging students as they stream by"""
+
+    def __init__(self, existing: Optional[List[Dict]] = None, rejects_writer=None):
+        self.students: List[Dict] = []
+        # Several students can share a name (or, in hand-edited data, an ID): every one is kept
+        self.by_id: Dict[str, List[Dict]] = {}
+        self.by_name: Dict[str, List[Dict]] = {}
+        self.rows = 0
+        self.new = 0
+        self.merged = 0
+        self.rejected = 0
+        self.reject_counts: Dict[str, int] = {}
+        self.reject_examples: List[Tuple[str, int, str, List[str]]] = []
+        self.rejects_writer = rejects_writer
+        self.source = ''
+        self.columns: Dict[str, int] = {}
+        self.width = 0
+        self.id_prefix = f's-{int(time.time() * 1000)}-'
+        self.date_added = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        for student in existing or []:
+            self.students.append(student)
+            self._index(student)
+
+    def _index(self, student: Dict):
+        if student.get('studentId'):
+            self.by_id.setdefault(student['studentId'], []).append(student)
+        self.by_name.setdefault(_name_key(student.get('name', '')), []).append(student)
+
+    def reject(self, line: int, reason: str, row: List[str]):
+        """Count a rejected row; only the first few are kept, the rest go straight to the rejects file"""
+        self.rejected += 1
+        self.reject_counts[reason] = self.reject_counts.get(reason, 0) + 1
+        if len(self.reject_examples) < REJECT_EXAMPLES:
+            self.reject_examples.append((self.source, line, reason, row))
+        if self.rejects_writer:
+            self.rejects_writer.writerow([self.source, line, reason] + row)
+
+    def start_file(self, source: str, columns: Dict[str, int]):
+        self.source = source
+        self.columns = columns
+        self.width = max(columns.values()) + 1
+
+    def add_row(self, line: int, row: List[str]):
+        if not any(cell.strip() for cell in row):
+            return
+        self.rows += 1
+        columns = self.columns
+        if len(row) < self.width:
+            self.reject(line, 'missing columns', row)
+            return
+
+        if 'name' in columns:
+            name = ' '.join(row[columns['name']].split())
+        else:
+            name = ' '.join(f"{row[columns['firstName']]} {row[columns['lastName']]}".split())
+        student_id = row[columns['studentId']].strip() if 'studentId' in columns else ''
+        sections = []
+        if 'classSections' in columns:
+            sections = [s for s in SECTION_SEPARATOR.split(row[columns['classSections']].strip()) if s]
+
+        if not name:
+            self.reject(line, 'missing name', row)
+            return
+        if len(name) > MAX_NAME_LENGTH:
+            self.reject(line, 'name too long', row)
+            return
+        if student_id and not STUDENT_ID.match(student_id):
+            self.reject(line, 'invalid student ID', row)
+            return
+
+        # By student ID, then by name; a student with a different ID is someone else
+        candidates = self.by_id.get(student_id, []) if student_id else []
+        matched_by_id = bool(candidates)
+        if not candidates:
+            candidates = [s for s in self.by_name.get(_name_key(name), [])
+                          if not (student_id and s.get('studentId'))]
+        if len(candidates) > 1:
+            self.reject(line, 'ambiguous: matches several students', row)
+            return
+        if not candidates:
+            self.new += 1
+            student = {
+                'id': f's-{student_id}' if student_id else f'{self.id_prefix}{self.new}',
+                'name': name,
+                'studentId': student_id,
+                'classSections': sections,
+                'dateAdded': self.date_added
+            }
+            self.students.append(student)
+            self._index(student)
+            return
+        student = candidates[0]
+        if matched_by_id and _name_key(student.get('name', '')) != _name_key(name):
+            self.reject(line, 'student ID already used for another name', row)
+            return
+        if student_id and not matched_by_id:
+            student['studentId'] = student_id
+            self.by_id[student_id] = [student]
+        self.merged += 1
+        known = student.setdefault('classSections', [])
+        known.extend(s for s in sections if s not in known)
+
+def _open_rows(path: Path, encoding: str) -> Tuple[Iterator[List[str]], object]:
+    """csv reader over the file, delimiter sniffed from its start (',', ';' or tab)"""
+    handle = open(path, 'r', encoding=encoding, newline='')
+    sample = handle.read(SNIFF_BYTES)
+    handle.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+    except csv.Error:
+        dialect = csv.excel
+    return csv.reader(handle, dialect), handle
+
+def import_roster(paths: List[Path], existing: Optional[List[Dict]] = None,
+                  encoding: str = 'utf-8-sig', rejects_writer=None) -> RosterImport:
+    """Stream every roster file into one RosterImport"""
+    result = RosterImport(existing, rejects_writer)
+    for path in paths:
+        rows, handle = _open_rows(path, encoding)
+        with handle:
+            header = next(rows, None)
+            columns = map_columns(header or [])
+            if 'name' not in columns and 'firstName' not in columns:
+                print(f"  [ERROR] {path.name} - no name column in header {header}")
+                continue
+            result.start_file(path.name, columns)
+            for row in rows:
+                result.add_row(rows.line_num, row)
+    return result
+
+def write_students_json(students: List[Dict], output_file: Path):
+    """Write the students array one entry per line (no second copy of the whole document in memory)"""
+    tmp = output_file.with_suffix(output_file.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i, student in enumerate(students):
+            f.write(',\n' if i else '\n')
+            f.write(json.dumps(student, ensure_ascii=False))
+        f.write('\n]\n')
+    tmp.replace(output_file)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import roster CSVs into the calendar students list')
+    parser.add_argument('rosters', nargs='+', type=Path, help='roster CSV files')
+    parser.add_argument('-o', '--output', type=Path, help='students JSON file to write')
+    parser.add_argument('--existing', type=Path, help='students JSON (e.g. from exportStudents) to merge into')
+    parser.add_argument('--store', type=Path, help='builder state store to merge into (see curriculum_server.py)')
+    parser.add_argument('--rejects', type=Path, help='write rejected rows to this CSV')
+    parser.add_argument('--encoding', default='utf-8-sig', help='roster file encoding (e.g. cp1252 for older Excel)')
+    args = parser.parse_args()
+    if not args.output and not args.store:
+        parser.error('give --output and/or --store')
+
+    existing = []
+    if args.existing and args.existing.exists():
+        existing = json.loads(args.existing.read_text(encoding='utf-8'))
+    store = None
+    if args.store:
+        from builder_store import BuilderStore
+        store = BuilderStore(args.store)
+        existing += store.get_collection('students')
+
+    rejects_file = open(args.rejects, 'w', encoding='utf-8', newline='') if args.rejects else None
+    rejects_writer = None
+    if rejects_file:
+        rejects_writer = csv.writer(rejects_file)
+        rejects_writer.writerow(['file', 'line', 'reason', 'row'])
+
+    start = time.perf_counter()
+    try:
+        size = sum(path.stat().st_size for path in args.rosters)
+        result = import_roster(args.rosters, existing, args.encoding, rejects_writer)
+    except (OSError, UnicodeDecodeError, csv.Error) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    finally:
+        if rejects_file:
+            rejects_file.close()
+    students = result.students
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        write_students_json(students, args.output)
+    if store is not None:
+        store.replace_collection('students', students)
+        store.close()
+
+    print(f"[OK] {result.rows:,} rows -> {len(students):,} students "
+          f"({result.new:,} new, {result.merged:,} merged into existing entries)")
+    print(f"  Throughput: {result.rows / max(elapsed, 1e-9):,.0f} rows/s, "
+          f"{size / max(elapsed, 1e-9) / 1e6:.1f} MB/s ({elapsed:.2f}s)")
+    if result.rejected:
+        print(f"  [WARNING] Rejected {result.rejected:,} rows:")
+        for reason, count in sorted(result.reject_counts.items(), key=lambda item: -item[1]):
+            print(f"    {reason}: {count:,}")
+        for source, line, reason, row in result.reject_examples:
+            print(f"    {source} line {line}: {reason} - {','.join(row)}")
+        if args.rejects:
+            print(f"  Rejected rows written to {args.rejects}")
@@ -0,0 +1,70 @@
+// Saved rubric library codec (same format as rubric_codec.py). Each distinct value is
+// stored once in a shared table, most frequent first, and each object's keys once per
+// shape; a node is a table index, [0, ...items] for a list or [shape + 1, ...values].
+const RUBRIC_CODEC_FORMAT = 'rubric-dict-1';
+
+function encodeRubricLibrary(rubrics) {
+    // Keyed by type so 1, "1" and true stay distinct
+    const valueKey = value => (value === null ? 'null' : typeof value) + ':' + value;
+    const counts = new Map();
+    const firstSeen = new Map();
+    (function count(node) {
+        if (Array.isArray(node)) {
+            node.forEach(count);
+        } else if (node !== null && typeof node === 'object') {
+            Object.keys(node).forEach(key => { if (node[key] !== undefined) count(node[key]); });
+        } else {
+            const key = valueKey(node);
+            counts.set(key, (counts.get(key) || 0) + 1);
+            if (!firstSeen.has(key)) firstSeen.set(key, node);
+        }
+    })(rubrics);
+
+    const keys = Array.from(counts.keys()).sort((a, b) => counts.get(b) - counts.get(a));
+    const values = keys.map(key => firstSeen.get(key));
+    const valueIndex = new Map(keys.map((key, i) => [key, i]));
+    const shapes = [];
+    const shapeIndex = new Map();
+
+    function encode(node) {
+        if (Array.isArray(node)) return [0].concat(node.map(encode));
+        if (node !== null && typeof node === 'object') {
+            const shape = Object.keys(node).filter(key => node[key] !== undefined);
+            const id = JSON.stringify(shape);
+            if (!shapeIndex.has(id)) {
+                shapeIndex.set(id, shapes.length);
+                shapes.push(shape);
+            }
+            return [shapeIndex.get(id) + 1].concat(shape.map(key => encode(node[key])));
+        }
+        return valueIndex.get(valueKey(node));
+    }
+    return { format: RUBRIC_CODEC_FORMAT, values: values, shapes: shapes, items: rubrics.map(encode) };
+}
+
+function decodeRubricLibrary(library) {
+    const values = library.values;
+    const shapes = library.shapes;
+    function decode(node) {
+        if (typeof node === 'number') return values[node];
+        const result = node[0] === 0 ? [] : {};
+        const keys = node[0] === 0 ? null : shapes[node[0] - 1];
+        for (let i = 1; i < node.length; i++) {
+            if (keys) result[keys[i - 1]] = decode(node[i]);
+            else result.push(decode(node[i]));
+        }
+        return result;
+    }
+    return library.items.map(decode);
+}
+
+// localStorage's savedRubrics in either form (older pages stored the plain array)
+function parseRubricLibrary(text) {
+    const data = JSON.parse(text || '[]');
+    if (Array.isArray(data)) return data;
+    return data && data.format === RUBRIC_CODEC_FORMAT ? decodeRubricLibrary(data) : [];
+}
+
+function stringifyRubricLibrary(rubrics) {
+    return JSON.stringify(encodeRubricLibrary(rubrics));
+}
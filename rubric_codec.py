@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Rubric Library Codec
+Dictionary encoding for the saved rubric library. Rubrics repeat the same
+level names, competency names and descriptors, and every rubric repeats the
+same keys; the encoded library stores each distinct value once in a shared
+table (most frequent first, so common values get the shortest references)
+and each object's keys once per shape:
+
+    {"format": "rubric-dict-1", "values": [...], "shapes": [[key, ...], ...], "items": [...]}
+
+An encoded node is an index into values, [0, node...] for a list, or
+[shape + 1, node...] for an object with that shape's keys. rubric_codec.js
+reads and writes the same format in the pages.
+
+    python rubric_codec.py encode savedRubrics.json -o savedRubrics.packed.json
+    python rubric_codec.py decode savedRubrics.packed.json -o savedRubrics.json
+    python rubric_codec.py compact savedRubrics.packed.json
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+FORMAT = 'rubric-dict-1'
+
+def is_encoded(data) -> bool:
+    return isinstance(data, dict) and data.get('format') == FORMAT
+
+def _value_key(value) -> Tuple[str, object]:
+    # 1, 1.0 and True are equal in Python but must stay distinct JSON values
+    return type(value).__name__, value
+
+class _Encoder:
+    """Interns values and shapes, continuing from an existing table if given"""
+
+    def __init__(self, values: List = (), shapes: List[List[str]] = ()):
+        self.values = list(values)
+        self.value_index = {_value_key(v): i for i, v in enumerate(self.values)}
+        self.shapes = [list(shape) for shape in shapes]
+        self.shape_index = {tuple(shape): i for i, shape in enumerate(self.shapes)}
+
+    def value(self, value) -> int:
+        key = _value_key(value)
+        index = self.value_index.get(key)
+        if index is None:
+            index = self.value_index[key] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def shape(self, keys: Tuple[str, ...]) -> int:
+        index = self.shape_index.get(keys)
+        if index is None:
+            index = self.shape_index[keys] = len(self.shapes)
+            self.shapes.append(list(keys))
+        return index
+
+    def encode(self, node):
+        if isinstance(node, list):
+            return [0] + [self.encode(item) for item in node]
+        if isinstance(node, dict):
+            return [self.shape(tuple(node)) + 1] + [self.encode(item) for item in node.values()]
+        return self.value(node)
+
+def _count_values(node, counts: Dict, first: Dict):
+    if isinstance(node, list):
+        for item in node:
+            _count_values(item, counts, first)
+    elif isinstance(node, dict):
+        for item in node.values():
+            _count_values(item, counts, first)
+    else:
+        key = _value_key(node)
+        counts[key] = counts.get(key, 0) + 1
+        first.setdefault(key, node)
+
+def encode_library(rubrics: List[Dict]) -> Dict:
+    """Encode a savedRubrics array with a fresh, frequency-ordered table"""
+    counts, first = {}, {}
+    _count_values(rubrics, counts, first)
+    # Stable sort: ties keep first-appearance order (as rubric_codec.js does)
+    ordered = sorted(counts, key=lambda key: -counts[key])
+    encoder = _Encoder([first[key] for key in ordered])
+    return {'format': FORMAT, 'values': encoder.values, 'shapes': encoder.shapes,
+            'items': [encoder.encode(rubric) for rubric in rubrics]}
+
+def add_rubrics(library: Dict, rubrics: List[Dict]) -> Dict:
+    """Append rubrics to an encoded library without renumbering its table
+
+    New values go at the end of the table, and entries that are no longer
+    referenced (after removing or editing items) are left in place until
+    compact() rebuilds it.
+    """
+    encoder = _Encoder(library['values'], library['shapes'])
+    items = library['items'] + [encoder.encode(rubric) for rubric in rubrics]
+    return {'format': FORMAT, 'values': encoder.values, 'shapes': encoder.shapes, 'items': items}
+
+def compact(library: Dict) -> Dict:
+    """Drop unreferenced values and shapes and re-order the table by frequency"""
+    return encode_library(decode_library(library))
+
+def decode_library(library: Dict) -> List[Dict]:
+    if not is_encoded(library):
+        raise ValueError(f"not a {FORMAT} rubric library")
+    values, shapes = library['values'], library['shapes']
+
+    def decode(node):
+        if isinstance(node, int):
+            return values[node]
+        tag = node[0]
+        if tag == 0:
+            return [decode(item) for item in node[1:]]
+        return {key: decode(item) for key, item in zip(shapes[tag - 1], node[1:])}
+
+    return [decode(item) for item in library['items']]
+
+def as_rubric_list(data) -> List:
+    """A savedRubrics value in either form, as the plain array"""
+    return decode_library(data) if is_encoded(data) else data
+
+def library_stats(library: Dict) -> Dict[str, int]:
+    """Table sizes and how many table entries nothing references any more"""
+    used_values, used_shapes = set(), set()
+
+    def walk(node):
+        if isinstance(node, int):
+            used_values.add(node)
+            return
+        if node[0]:
+            used_shapes.add(node[0] - 1)
+        for item in node[1:]:
+            walk(item)
+
+    for item in library['items']:
+        walk(item)
+    return {
+        'rubrics': len(library['items']),
+        'values': len(library['values']),
+        'shapes': len(library['shapes']),
+        'unused values': len(library['values']) - len(used_values),
+        'unused shapes': len(library['shapes']) - len(used_shapes)
+    }
+
+def _dumps(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Encode, decode or compact a saved rubric library')
+    parser.add_argument('command', choices=['encode', 'decode', 'compact', 'stats'])
+    parser.add_argument('library', type=Path, help='savedRubrics JSON (plain array or encoded library)')
+    parser.add_argument('-o', '--output', type=Path, help='file to write (default: replace the input)')
+    args = parser.parse_args()
+
+    try:
+        data = json.loads(args.library.read_text(encoding='utf-8'))
+        if isinstance(data, dict) and 'savedRubrics' in data:
+            # localStorage dump
+            data = data['savedRubrics']
+            data = json.loads(data) if isinstance(data, str) else data
+        if args.command == 'stats':
+            library = data if is_encoded(data) else encode_library(data)
+            for name, count in library_stats(library).items():
+                print(f"  {name}: {count}")
+            sys.exit(0)
+        if args.command == 'decode':
+            result = as_rubric_list(data)
+        elif args.command == 'compact':
+            result = compact(data) if is_encoded(data) else encode_library(data)
+        else:
+            result = encode_library(as_rubric_list(data))
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+        print(f"[ERROR] {args.library}: {e}")
+        sys.exit(1)
+
+    output = args.output or args.library
+    before = args.library.stat().st_size
+    text = _dumps(result)
+    output.write_text(text, encoding='utf-8')
+    after = len(text.encode('utf-8'))
+    print(f"[OK] {args.command}: {before:,} -> {after:,} bytes ({after / max(before, 1):.0%}) in {output}")
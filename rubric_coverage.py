@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Batch Rubric Coverage Scorer
+Audits the PFEQ coverage of a whole library of saved rubrics offline.
+Every criterion of every rubric is scored against every competency and topic
+of every subject/grade in one sparse matrix product, instead of running the
+builder's per-rubric calculateGradeSpecificCoverage one rubric at a time.
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+sys.path.insert(0, str(Path(__file__).parent))
+from curriculum_index import KEYWORD_MIN_LENGTH
+from curriculum_bundle import load_curriculum_json
+from saved_rubrics import load_saved_rubrics, criterion_text
+
+WORD_PATTERN = re.compile(r'\w+')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase keywords of text, using the builder's length threshold"""
+    return [w for w in WORD_PATTERN.findall(text.lower()) if len(w) >= KEYWORD_MIN_LENGTH]
+
+def build_curriculum_elements(curriculum: Dict) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+    """Flatten the curriculum into scoreable elements, grouped contiguously by grade
+
+    Competencies are covered by a criterion sharing any keyword with the
+    competency name or its learning objectives. Topics need two shared
+    keywords from the name and concepts (one for single-keyword topics),
+    mirroring the builder's prefix and two-concept rules.
+    """
+    elements = []
+    grade_keys = []
+    for subject, grades in sorted(curriculum.items()):
+        for grade, data in sorted(grades.items()):
+            grade_index = len(grade_keys)
+            grade_keys.append((subject, grade))
+
+            for comp in data.get('competencies', []):
+                terms = set(tokenize(comp.get('name', '')))
+                for obj in comp.get('learningObjectives', []):
+                    terms.update(tokenize(obj))
+                elements.append({
+                    'grade': grade_index,
+                    'kind': 'competency',
+                    'label': f"{comp['id']} {comp['name']}" if comp.get('id') else comp['name'],
+                    'terms': terms,
+                    'threshold': 1
+                })
+
+            for topic in data.get('topics', []):
+                if isinstance(topic, str):
+                    topic = {'name': topic}
+                terms = set(tokenize(topic['name']))
+                for concept in topic.get('concepts', []):
+                    terms.update(tokenize(concept))
+                elements.append({
+                    'grade': grade_index,
+                    'kind': 'topic',
+                    'label': topic['name'],
+                    'terms': terms,
+                    'threshold': min(2, max(len(terms), 1))
+                })
+
+    return elements, grade_keys
+
+def _binary_matrix(rows: List, vocabulary: Dict[str, int]) -> sparse.csr_matrix:
+    """Build a rows x vocabulary binary CSR matrix from iterables of terms"""
+    indptr = [0]
+    indices = []
+    for terms in rows:
+        columns = {vocabulary[t] for t in terms if t in vocabulary}
+        indices.extend(sorted(columns))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int32)
+    return sparse.csr_matrix((data, np.array(indices, dtype=np.int32), np.array(indptr)),
+                             shape=(len(rows), len(vocabulary)))
+
+def score_rubrics(rubrics: List[Dict], curriculum: Dict) -> List[Dict]:
+    """Score every rubric against the curriculum and return one report per rubric"""
+    elements, grade_keys = build_curriculum_elements(curriculum)
+    if not elements:
+        return []
+
+    vocabulary = {}
+    for element in elements:
+        for term in element['terms']:
+            vocabulary.setdefault(term, len(vocabulary))
+
+    # Flatten criteria and remember which rubric each belongs to
+    criterion_terms = []
+    criterion_owner = []
+    for rubric_index, rubric in enumerate(rubrics):
+        for criterion in rubric.get('criteria', []):
+            criterion_terms.append(tokenize(criterion_text(criterion)))
+            criterion_owner.append(rubric_index)
+
+    element_matrix = _binary_matrix([e['terms'] for e in elements], vocabulary)
+    criterion_matrix = _binary_matrix(criterion_terms, vocabulary)
+
+    # criteria x elements shared-keyword counts, thresholded per element
+    shared = (criterion_matrix @ element_matrix.T).tocsr()
+    thresholds = np.array([e['threshold'] for e in elements], dtype=np.int32)
+    shared.data = (shared.data >= thresholds[shared.indices]).astype(np.int32)
+    shared.eliminate_zeros()
+
+    # rubrics x elements: covered if any of the rubric's criteria hits it
+    owner = sparse.csr_matrix(
+        (np.ones(len(criterion_owner), dtype=np.int32),
+         (np.array(criterion_owner, dtype=np.int32), np.arange(len(criterion_owner)))),
+        shape=(len(rubrics), len(criterion_owner)))
+    covered = (owner @ shared).tocsr()
+    covered.data = np.ones_like(covered.data)
+
+    # rubrics x grades: share of each grade's elements covered
+    element_grades = np.array([e['grade'] for e in elements], dtype=np.int32)
+    membership = sparse.csr_matrix(
+        (np.ones(len(elements), dtype=np.int32), (np.arange(len(elements)), element_grades)),
+        shape=(len(elements), len(grade_keys)))
+    grade_sizes = np.asarray(membership.sum(axis=0)).ravel()
+    grade_coverage = np.asarray((covered @ membership).todense()) / np.maximum(grade_sizes, 1)
+
+    grade_lookup = {key: i for i, key in enumerate(grade_keys)}
+    reports = []
+    for rubric_index, rubric in enumerate(rubrics):
+        selection = rubric.get('curriculum') or {}
+        selected = grade_lookup.get((selection.get('subject'), selection.get('grade')))
+        if selected is not None:
+            grade_index, matched_by = selected, 'selection'
+        else:
+            grade_index, matched_by = int(np.argmax(grade_coverage[rubric_index])), 'best-match'
+
+        row = covered.indices[covered.indptr[rubric_index]:covered.indptr[rubric_index + 1]]
+        covered_set = {i for i in row if element_grades[i] == grade_index}
+        grade_elements = np.flatnonzero(element_grades == grade_index)
+
+        report = {
+            'id': rubric.get('id'),
+            'title': rubric.get('title', ''),
+            'subject': grade_keys[grade_index][0],
+            'grade': grade_keys[grade_index][1],
+            'matchedBy': matched_by,
+            'criteria': len(rubric.get('criteria', [])),
+            'overall': int(round(grade_coverage[rubric_index, grade_index] * 100)),
+            'competencies': {'covered': [], 'missing': []},
+            'topics': {'covered': [], 'missing': []}
+        }
+        for i in grade_elements:
+            element = elements[i]
+            bucket = report['competencies' if element['kind'] == 'competency' else 'topics']
+            bucket['covered' if i in covered_set else 'missing'].append(element['label'])
+        reports.append(report)
+
+    return reports
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score saved rubrics against the PFEQ curriculum')
+    parser.add_argument('rubrics', nargs='+', type=Path,
+                        help='exported savedRubrics JSON files or folders of them')
+    parser.add_argument('--curriculum', type=Path,
+                        default=Path(__file__).parent / 'pfeq_curriculum_data.json',
+                        help='curriculum JSON written by the generators (falls back to curriculum_data.py)')
+    parser.add_argument('--output', type=Path, help='write the full JSON report here')
+    args = parser.parse_args()
+
+    if args.curriculum.exists():
+        curriculum = load_curriculum_json(args.curriculum)
+        print(f"Using curriculum: {args.curriculum}")
+    else:
+        from curriculum_data import CURRICULUM_DATA as curriculum
+
+    rubrics = load_saved_rubrics(args.rubrics)
+    print(f"Loaded {len(rubrics)} rubric(s)")
+
+    start = time.perf_counter()
+    reports = score_rubrics(rubrics, curriculum)
+    elapsed = time.perf_counter() - start
+
+    for report in reports:
+        print(f"  {report['overall']:3d}%  {report['title'] or report['id']} "
+              f"({report['subject']} - {report['grade']}, {report['matchedBy']})")
+    print(f"\nScored {len(reports)} rubric(s) in {elapsed:.2f}s")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+        print(f"Report saved to: {args.output}")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Saved Rubric Loader
+Reads rubrics exported from the rubric builder (the savedRubrics array it keeps
+in localStorage) so offline tools can work on whole rubric libraries
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from rubric_codec import is_encoded, decode_library
+
+def _rubrics_from_json(data) -> List[Dict]:
+    """Accept a savedRubrics array (plain or encoded), a localStorage dump or a single rubric"""
+    if is_encoded(data):
+        return _rubrics_from_json(decode_library(data))
+    if isinstance(data, list):
+        return [r for r in data if isinstance(r, dict)]
+    if isinstance(data, dict):
+        if 'savedRubrics' in data:
+            saved = data['savedRubrics']
+            # localStorage dumps keep the array as a JSON string
+            if isinstance(saved, str):
+                saved = json.loads(saved)
+            return _rubrics_from_json(saved)
+        if 'criteria' in data:
+            return [data]
+    return []
+
+def load_saved_rubrics(paths: Iterable[Path]) -> List[Dict]:
+    """Load rubrics from exported JSON files and/or folders of them"""
+    rubrics = []
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.glob('*.json')) if path.is_dir() else [path]
+        for json_file in files:
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"  [ERROR] {json_file.name} - {e}")
+                continue
+            for rubric in _rubrics_from_json(data):
+                rubric.setdefault('id', f"{json_file.stem}-{len(rubrics)}")
+                rubrics.append(rubric)
+    return rubrics
+
+def criterion_text(criterion: Dict) -> str:
+    """Lowercased criterion name + descriptors, as the builder matches on"""
+    descriptors = [d for d in criterion.get('descriptors', []) if d]
+    return (criterion.get('name', '') + ' ' + ' '.join(descriptors)).lower()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+School Calendar Table
+Reads the school board's calendar (CSV or ICS) once and precomputes the cycle
+day of every date in the school year. The result is a small JSON artifact the
+calendar page loads through its calendar upload: one character per date, so
+finding the cycle day of a date is an index into a string instead of a walk
+from the first day of school.
+
+    python school_calendar.py board-calendar.ics --start 2025-08-27 --end 2026-06-23 -o school_calendar.json
+    python school_calendar.py holidays.csv --start 2025-08-27 --end 2026-06-23 --cycle-length 10
+    python school_calendar.py --table school_calendar.json --lookup 2025-10-14
+"""
+
+import re
+import csv
+import sys
+import itertools
+import json
+import argparse
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+TABLE_FILE = 'school_calendar.json'
+
+# One character per date: weekend, weekday with no school, then cycle days 1..35
+WEEKEND = '.'
+CLOSED = '-'
+DAY_CHARS = '123456789abcdefghijklmnopqrstuvwxyz'
+WEEKEND_DAYS = (5, 6)       # date.weekday() of Saturday and Sunday
+
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%Y%m%d')
+START_COLUMNS = ('date', 'start', 'startdate', 'from', 'début', 'debut', 'datedébut', 'datedebut')
+END_COLUMNS = ('end', 'enddate', 'to', 'until', 'fin', 'datefin')
+LABEL_COLUMNS = ('description', 'label', 'summary', 'event', 'name', 'title', 'type', 'événement', 'evenement')
+
+def parse_date(text: str) -> Optional[date]:
+    text = text.strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+def _date_range(first: date, last: date) -> Iterator[date]:
+    for n in range((last - first).days + 1):
+        yield first + timedelta(days=n)
+
+def read_csv_calendar(path: Path) -> Dict[date, str]:
+    """Closed dates from a CSV: a date (or start/end range) per row, optional description
+
+    The calendar page's own CSV format (date in the first column after a
+    header) is the simplest case.
+    """
+    closed = {}
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        rows = csv.reader(f)
+        header = next(rows, None) or []
+        keys = [re.sub(r'[\s_-]+', '', cell.strip().casefold()) for cell in header]
+        start_col = next((i for i, key in enumerate(keys) if key in START_COLUMNS), 0)
+        end_col = next((i for i, key in enumerate(keys) if key in END_COLUMNS), None)
+        label_col = next((i for i, key in enumerate(keys) if key in LABEL_COLUMNS), None)
+        pending = []
+        if header and parse_date(header[0]):
+            # No header row: date, then an optional description
+            start_col, end_col, label_col = 0, None, 1
+            pending = [header]
+        for row in itertools.chain(pending, rows):
+            if len(row) <= start_col:
+                continue
+            start = parse_date(row[start_col])
+            if start is None:
+                if row[start_col].strip():
+                    print(f"  [WARNING] {path.name} line {rows.line_num} - not a date: {row[start_col]}")
+                continue
+            end = parse_date(row[end_col]) if end_col is not None and len(row) > end_col else None
+            label = row[label_col].strip() if label_col is not None and len(row) > label_col else ''
+            for day in _date_range(start, max(end or start, start)):
+                closed.setdefault(day, label)
+    return closed
+
+def _ics_lines(text: str) -> Iterator[str]:
+    """Unfold RFC 5545 continuation lines"""
+    line = None
+    for raw in text.splitlines():
+        if raw[:1] in (' ', '\t') and line is not None:
+            line += raw[1:]
+            continue
+        if line is not None:
+            yield line
+        line = raw
+    if line is not None:
+        yield line
+
+def _ics_text(value: str) -> str:
+    return re.sub(r'\\([\\,;nN])', lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+def read_ics_calendar(path: Path, match: Optional[str] = None) -> Dict[date, str]:
+    """Closed dates from the all-day events of an ICS file (DTEND is exclusive)
+
+    Timed events (meetings, parent evenings) do not close the school and are
+    skipped; match keeps only events whose summary matches the pattern.
+    """
+    pattern = re.compile(match, re.IGNORECASE) if match else None
+    closed = {}
+    skipped = {'timed': 0, 'unmatched': 0, 'recurring': 0}
+    event = None
+    for line in _ics_lines(path.read_text(encoding='utf-8-sig')):
+        if line == 'BEGIN:VEVENT':
+            event = {}
+        elif line == 'END:VEVENT' and event is not None:
+            start = event.get('DTSTART', '')
+            summary = _ics_text(event.get('SUMMARY', ''))
+            if event.get('RRULE'):
+                skipped['recurring'] += 1
+            if len(start) != 8 or parse_date(start) is None:
+                skipped['timed'] += 1
+            elif pattern and not pattern.search(summary):
+                skipped['unmatched'] += 1
+            else:
+                first = parse_date(start)
+                end = parse_date(event.get('DTEND', '')[:8]) if len(event.get('DTEND', '')) == 8 else None
+                last = end - timedelta(days=1) if end and end > first else first
+                for day in _date_range(first, last):
+                    closed.setdefault(day, summary)
+            event = None
+        elif event is not None and ':' in line:
+            name, value = line.split(':', 1)
+            event[name.split(';', 1)[0].upper()] = value.strip()
+    if skipped['timed'] or skipped['unmatched']:
+        print(f"  Skipped {skipped['timed']} timed and {skipped['unmatched']} unmatched event(s) in {path.name}")
+    if skipped['recurring']:
+        print(f"  [WARNING] {skipped['recurring']} recurring event(s) in {path.name}: only the first occurrence is used")
+    return closed
+
+def read_calendar(path: Path, match: Optional[str] = None) -> Dict[date, str]:
+    if path.suffix.lower() in ('.ics', '.ical'):
+        return read_ics_calendar(path, match)
+    return read_csv_calendar(path)
+
+def build_cycle_table(start: date, end: date, cycle_length: int, closed: Dict[date, str]) -> Dict:
+    """Table of every date from start to end: weekend, closed, or its cycle day
+
+    The first school day on or after start is day 1, and each later school
+    day advances the cycle, as the calendar page's getCycleDay counts.
+    """
+    if not 1 <= cycle_length <= len(DAY_CHARS):
+        raise ValueError(f'cycle length must be between 1 and {len(DAY_CHARS)}')
+    if end < start:
+        raise ValueError('the school year ends before it starts')
+    days = []
+    school_days = 0
+    for day in _date_range(start, end):
+        if day.weekday() in WEEKEND_DAYS:
+            days.append(WEEKEND)
+        elif day in closed:
+            days.append(CLOSED)
+        else:
+            days.append(DAY_CHARS[school_days % cycle_length])
+            school_days += 1
+    labels = {day.isoformat(): label for day, label in sorted(closed.items())
+              if label and start <= day <= end and day.weekday() not in WEEKEND_DAYS}
+    return {
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'cycleLength': cycle_length,
+        'schoolDays': school_days,
+        'days': ''.join(days),
+        'labels': labels
+    }
+
+class CycleCalendar:
+    """Constant-time lookups over a cycle table"""
+
+    def __init__(self, table: Dict):
+        self.table = table
+        self.start = date.fromisoformat(table['start'])
+        self.days = table['days']
+        self.labels = table.get('labels', {})
+
+    @classmethod
+    def load(cls, path: Path) -> 'CycleCalendar':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _char(self, day: date) -> Optional[str]:
+        index = (day - self.start).days
+        return self.days[index] if 0 <= index < len(self.days) else None
+
+    def cycle_day(self, day: date) -> Optional[int]:
+        """Cycle day (1-based) of a school day; None for weekends, closed days and dates outside the year"""
+        char = self._char(day)
+        return DAY_CHARS.index(char) + 1 if char and char in DAY_CHARS else None
+
+    def is_school_day(self, day: date) -> bool:
+        return self.cycle_day(day) is not None
+
+    def label(self, day: date) -> str:
+        return self.labels.get(day.isoformat(), '')
+
+    def dates(self, cycle_day: int) -> List[date]:
+        """Every date that is the given cycle day (e.g. all the days a Day 3 class meets)"""
+        char = DAY_CHARS[cycle_day - 1]
+        return [self.start + timedelta(days=i) for i, c in enumerate(self.days) if c == char]
+
+def _describe(calendar: CycleCalendar, day: date) -> str:
+    cycle_day = calendar.cycle_day(day)
+    if cycle_day:
+        return f"Day {cycle_day}"
+    char = calendar._char(day)
+    if char is None:
+        return 'outside the school year'
+    if char == WEEKEND:
+        return 'weekend'
+    return f"no school{': ' + calendar.label(day) if calendar.label(day) else ''}"
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Precompute the cycle day of every date in the school year')
+    parser.add_argument('calendars', nargs='*', type=Path, help='board calendar files (.csv or .ics)')
+    parser.add_argument('--start', type=parse_date, help='first day of school (YYYY-MM-DD)')
+    parser.add_argument('--end', type=parse_date, help='last day of school (YYYY-MM-DD)')
+    parser.add_argument('--cycle-length', type=int, default=9, help='days in the schedule cycle (default: 9)')
+    parser.add_argument('--match', help='only ICS events whose summary matches this pattern close the school')
+    parser.add_argument('-o', '--output', type=Path, default=Path(TABLE_FILE), help='table file to write')
+    parser.add_argument('--table', type=Path, help='existing table to query instead of building one')
+    parser.add_argument('--lookup', nargs='+', type=parse_date, metavar='DATE', help='print the cycle day of dates')
+    args = parser.parse_args()
+
+    if args.table:
+        calendar = CycleCalendar.load(args.table)
+    else:
+        if not args.start or not args.end:
+            parser.error('--start and --end are required to build a table')
+        closed = {}
+        for path in args.calendars:
+            try:
+                found = read_calendar(path, args.match)
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                print(f"[ERROR] {path}: {e}")
+                sys.exit(1)
+            print(f"  {path.name}: {len(found)} closed date(s)")
+            for day, label in found.items():
+                closed.setdefault(day, label)
+        try:
+            table = build_cycle_table(args.start, args.end, args.cycle_length, closed)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(1)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+        calendar = CycleCalendar(table)
+        closed_days = table['days'].count(CLOSED)
+        print(f"[OK] {table['start']} to {table['end']}: {table['schoolDays']} school days "
+              f"({table['schoolDays'] / args.cycle_length:.1f} cycles of {args.cycle_length}), "
+              f"{closed_days} weekday(s) without school")
+        print(f"  Table saved to: {args.output} ({args.output.stat().st_size:,} bytes) - "
+              f"load it with the calendar upload on the Schedule tab")
+
+    for day in args.lookup or []:
+        if day is None:
+            print("  [ERROR] not a date")
+            continue
+        print(f"  {day.isoformat()}: {_describe(calendar, day)}")
@@ -6,10 +6,8 @@ Downloads all curriculum documents from the official QEP website
 
 import os
 import re
-import requests
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 import time
 
 # Base URL for Quebec Education Program
@@ -27,6 +25,7 @@ def create_output_dirs():
 
 def get_page_content(url):
     """Fetch page content with retries"""
+    import requests
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
@@ -40,6 +39,7 @@ def get_page_content(url):
 
 def find_pdf_links(html_content, base_url):
     """Find all PDF links on a page"""
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html_content, 'html.parser')
     pdf_links = set()
     
@@ -73,6 +73,7 @@ def find_pdf_links(html_content, base_url):
 
 def download_pdf(url, output_path):
     """Download a PDF file"""
+    import requests
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
     }
@@ -117,6 +118,7 @@ def scrape_section(section_url, section_name):
     print(f"Found {len(pdf_links)} PDF links on main page")
     
     # Also parse the page to find sub-pages
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html, 'html.parser')
     sub_pages = []
     
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Extracted Text Corpus
+Keeps the page texts pulled out of every PFEQ PDF in one append-only UTF-8
+file plus an offset index of (document, page) -> (start, length), so that
+re-analysing the corpus does not mean re-running pdfplumber. Pages are read
+by slicing a memory map of the corpus file, never by loading all of it.
+
+    python text_corpus.py                      # list documents
+    python text_corpus.py --page DOC 3         # print one page
+    python text_corpus.py --grep "HCE-\\d-\\d"   # search every page
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import argparse
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+CORPUS_DIR = Path(__file__).parent / 'pfeq_corpus'
+CORPUS_FILE = 'corpus.txt'
+INDEX_FILE = 'index.jsonl'
+
+def pages_to_text(pages: List[str]) -> str:
+    """Join page texts the way extract_pdf_text does (empty pages are skipped)"""
+    return ''.join(page + '\n' for page in pages if page)
+
+class TextCorpus:
+    """Append-only page text store read through mmap
+
+    index.jsonl holds one record per page ({"doc", "page", "start", "length"},
+    byte offsets into corpus.txt) followed by one {"doc", "pages", "extracted",
+    "mtime", "size"} record once a document is complete. "extracted" lists
+    the 0-based pages actually extracted when only part of the document was
+    (null means all). Re-adding a document appends new records that
+    supersede the old ones.
+    """
+
+    def __init__(self, directory: Path = CORPUS_DIR):
+        self.directory = Path(directory)
+        self.corpus_path = self.directory / CORPUS_FILE
+        self.index_path = self.directory / INDEX_FILE
+        self._pages: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self._documents: Dict[str, Dict] = {}
+        self._file = None
+        self._map = None
+        self._load_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _load_index(self):
+        if not self.index_path.exists():
+            return
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if 'page' in record:
+                    self._pages[(record['doc'], record['page'])] = (record['start'], record['length'])
+                else:
+                    self._documents[record['doc']] = record
+
+    def _view(self) -> Optional[mmap.mmap]:
+        """Memory map of the corpus file, remapped if it grew since the last read"""
+        if not self.corpus_path.exists():
+            return None
+        size = self.corpus_path.stat().st_size
+        if size == 0:
+            return None
+        if self._map is None or len(self._map) < size:
+            self.close()
+            self._file = open(self.corpus_path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def document_key(pdf_path: Path) -> str:
+        return str(Path(pdf_path))
+
+    def is_current(self, pdf_path: Path, needed: Optional[List[int]] = None) -> bool:
+        """True if the corpus holds the needed pages (default: all) of this PDF and the PDF has not changed since"""
+        record = self._documents.get(self.document_key(pdf_path))
+        if not record:
+            return False
+        extracted = record.get('extracted')
+        if extracted is not None and (needed is None or not set(needed) <= set(extracted)):
+            return False
+        try:
+            stat = Path(pdf_path).stat()
+        except OSError:
+            return False
+        return record.get('mtime') == stat.st_mtime_ns and record.get('size') == stat.st_size
+
+    def add_document(self, pdf_path: Path, pages: List[str], extracted: Optional[List[int]] = None):
+        """Append a document's page texts and index them (extracted: the pages actually extracted, if not all)"""
+        doc = self.document_key(pdf_path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        try:
+            stat = Path(pdf_path).stat()
+            mtime, size = stat.st_mtime_ns, stat.st_size
+        except OSError:
+            mtime = size = None
+
+        records = []
+        with open(self.corpus_path, 'ab') as corpus:
+            start = corpus.tell()
+            for page_number, page_text in enumerate(pages, 1):
+                data = (page_text or '').encode('utf-8')
+                corpus.write(data)
+                records.append({'doc': doc, 'page': page_number, 'start': start, 'length': len(data)})
+                start += len(data)
+        records.append({'doc': doc, 'pages': len(pages), 'extracted': extracted, 'mtime': mtime, 'size': size})
+
+        # Index records are written after the text, so a crash never indexes missing bytes
+        with open(self.index_path, 'a', encoding='utf-8') as index:
+            for record in records:
+                index.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+        for record in records[:-1]:
+            self._pages[(doc, record['page'])] = (record['start'], record['length'])
+        self._documents[doc] = records[-1]
+
+    def documents(self) -> List[str]:
+        return sorted(self._documents)
+
+    def page_count(self, doc: str) -> int:
+        return self._documents.get(doc, {}).get('pages', 0)
+
+    def page(self, doc: str, page_number: int) -> str:
+        """Text of one page (1-based), sliced straight out of the memory map"""
+        start, length = self._pages[(doc, page_number)]
+        if length == 0:
+            return ''
+        return self._view()[start:start + length].decode('utf-8')
+
+    def pages(self, doc: str) -> List[str]:
+        return [self.page(doc, n) for n in range(1, self.page_count(doc) + 1)]
+
+    def text(self, doc: str) -> str:
+        """Whole-document text in the same shape extract_pdf_text returns"""
+        return pages_to_text(self.pages(doc))
+
+    def search(self, pattern: str, flags: int = 0) -> Iterator[Tuple[str, int, str]]:
+        """Yield (document, page, line) for every line matching pattern
+
+        Pages are stored back to back, so the pattern runs over one current
+        page at a time (sliced from the mmap in file order): ^ and $ see each
+        page's own first and last line, and a match never spans two pages or
+        reaches into a superseded copy. Each page is decoded before matching,
+        so IGNORECASE folds accented letters (É/é) and \\w and \\b treat them
+        as word characters.
+        """
+        view = self._view()
+        if view is None:
+            return
+        # Only the current version of each page counts; older appended copies are skipped
+        spans = sorted((start, length, doc, page) for (doc, page), (start, length) in self._pages.items()
+                       if length and page <= self.page_count(doc))
+        regex = re.compile(pattern, flags | re.MULTILINE)
+        for start, length, doc, page in spans:
+            text = view[start:start + length].decode('utf-8', errors='replace')
+            for match in regex.finditer(text):
+                line_start = text.rfind('\n', 0, match.start()) + 1
+                line_end = text.find('\n', match.end())
+                if line_end == -1:
+                    line_end = len(text)
+                yield doc, page, text[line_start:line_end]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect the extracted PFEQ text corpus')
+    parser.add_argument('--dir', type=Path, default=CORPUS_DIR, help='corpus directory')
+    parser.add_argument('--page', nargs=2, metavar=('DOC', 'PAGE'), help='print one page')
+    parser.add_argument('--grep', metavar='PATTERN', help='regex to search for in every page')
+    parser.add_argument('-i', '--ignore-case', action='store_true')
+    args = parser.parse_args()
+
+    with TextCorpus(args.dir) as corpus:
+        if args.page:
+            print(corpus.page(args.page[0], int(args.page[1])))
+        elif args.grep:
+            flags = re.IGNORECASE if args.ignore_case else 0
+            hits = 0
+            for doc, page, line in corpus.search(args.grep, flags):
+                hits += 1
+                print(f"{os.path.basename(doc)}:{page}: {line.strip()}")
+            print(f"\n{hits} match(es)", file=sys.stderr)
+        else:
+            size = corpus.corpus_path.stat().st_size if corpus.corpus_path.exists() else 0
+            for doc in corpus.documents():
+                print(f"  {corpus.page_count(doc):4d} pages  {doc}")
+            print(f"\n{len(corpus.documents())} document(s), {size:,} bytes in {corpus.corpus_path}")
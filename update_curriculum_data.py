@@ -10,6 +10,7 @@ Complete Curriculum Data Update Script
 
 import os
 import sys
+import argparse
 from pathlib import Path
 
 # Add current directory to path to import our modules
@@ -18,12 +19,21 @@ sys.path.insert(0, str(Path(__file__).parent))
 # Import our scraping and extraction modules
 try:
     from scrape_quebec_education import main as scrape_main
-    from extract_pfeq_data import generate_js_structure, extract_pdf_text, parse_curriculum_data
+    from extract_pfeq_data import PARALLEL_PAGE_THRESHOLD, merge_curriculum_data
+    from curriculum_bundle import BUNDLE_FORMATS, build_bundle, write_bundle
+    from text_corpus import TextCorpus
+    from curriculum_snapshots import commit_snapshot
+    from build_static_assets import refresh_static_build
+    from extraction_watchdog import (
+        DOCUMENT_TIME_BUDGET, process_pdf_with_watchdog, write_quarantine_report
+    )
 except ImportError:
     print("Error: Could not import required modules")
     sys.exit(1)
 
-def main():
+def main(output_format: str = 'pretty', precompress: bool = False,
+         budget: float = DOCUMENT_TIME_BUDGET,
+         page_threshold: int = PARALLEL_PAGE_THRESHOLD):
     """Main update process"""
     print("=" * 60)
     print("Quebec Education Program - Complete Curriculum Data Update")
@@ -50,6 +60,8 @@ def main():
     ]
     
     all_parsed_data = []
+    quarantine = []
+    corpus = TextCorpus()
     
     for folder in pfeq_folders:
         if folder.exists():
@@ -61,30 +73,31 @@ def main():
                 if i % 10 == 0:
                     print(f"  Progress: {i}/{len(pdf_files)}")
                 
-                try:
-                    text = extract_pdf_text(pdf_file)
-                    if not text or not isinstance(text, str) or len(text.strip()) < 100:
-                        continue
-                    
-                    parsed_items = parse_curriculum_data(text, pdf_file.name)
-                    if parsed_items:
-                        all_parsed_data.extend(parsed_items)
-                except Exception as e:
-                    continue
+                parsed_items = process_pdf_with_watchdog(pdf_file, quarantine, budget=budget, corpus=corpus,
+                                                         page_threshold=page_threshold)
+                if parsed_items:
+                    all_parsed_data.extend(parsed_items)
     
+    corpus.close()
+    write_quarantine_report(quarantine)
     print(f"\nTotal curriculum entries extracted: {len(all_parsed_data)}")
     
     # Step 3: Generate JavaScript file
     print("\n[Step 3/3] Generating JavaScript curriculum data file...")
     if all_parsed_data:
-        js_code = generate_js_structure(all_parsed_data)
-        
         output_file = Path(__file__).parent / 'pfeq_curriculum_data.js'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(js_code)
+        curriculum = merge_curriculum_data(all_parsed_data)
+        bundle = build_bundle(curriculum)
+        result = write_bundle(bundle, output_file, output_format=output_format, precompress=precompress)
         
-        print(f"✓ Curriculum data file generated: {output_file}")
-        print(f"  Size: {len(js_code):,} characters")
+        if result['changed']:
+            print(f"✓ Curriculum data file generated: {output_file}")
+        else:
+            print(f"✓ Curriculum data unchanged: {output_file}")
+        print(f"  Size: {len(result['code']):,} characters")
+        print(f"  Version: {result['version']}")
+        commit_snapshot(curriculum, label='update_curriculum_data')
+        refresh_static_build()
         print(f"  Subjects: {len(set(d['subject'] for d in all_parsed_data))}")
         print(f"  Total grade/subject combinations: {len(all_parsed_data)}")
     else:
@@ -95,4 +108,15 @@ def main():
     print("=" * 60)
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description='Scrape, extract and regenerate pfeq_curriculum_data.js')
+    parser.add_argument('--format', choices=BUNDLE_FORMATS, default='pretty',
+                        help='pretty (readable), min (compact, for deployment) or json (data file plus a loader script)')
+    parser.add_argument('--precompress', action='store_true',
+                        help='also write content-hashed .gz/.br copies')
+    parser.add_argument('--budget', type=float, default=DOCUMENT_TIME_BUDGET,
+                        help='seconds allowed per PDF before its worker is killed')
+    parser.add_argument('--split-pages', type=int, default=PARALLEL_PAGE_THRESHOLD,
+                        help='extract PDFs longer than this many pages in parallel page ranges (0 disables)')
+    args = parser.parse_args()
+    main(output_format=args.format, precompress=args.precompress, budget=args.budget,
+         page_threshold=args.split_pages)